@@ -3,29 +3,93 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--timeout SECONDS]
+    python pack.py <input_directory> <office_file> --deterministic
+    python pack.py <input_directory> <office_file> --source <original_file>
+
+Validation converts the packed file to HTML with LibreOffice. When LibreOffice's
+Python UNO bridge is importable, conversions are sent to a small pool of
+long-lived soffice listeners instead of cold-starting soffice for every file.
 """
 
 import argparse
+import atexit
+import contextlib
+import io
+import mmap
+import os
+import queue
 import shutil
 import subprocess
 import sys
 import tempfile
+import struct
+import threading
+import time
+import uuid
+import zlib
 import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
+# Timestamp written to every member in deterministic mode (earliest zip date)
+DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Members that readers expect at the start of the archive, in this order
+LEADING_MEMBERS = ("[Content_Types].xml", "_rels/.rels")
+
+# Zip local file header: signature, versions, flags, method, time, date, CRC,
+# sizes, then the lengths of the file name and extra field that follow it
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_FLAG_ENCRYPTED = 0x01
+_FLAG_DATA_DESCRIPTOR = 0x08
+
+# Python versions whose zipfile internals copy_raw_member() has been checked
+# against; other versions recompress the member through the public API
+RAW_COPY_VERSIONS = ((3, 8), (3, 13))
+# ZipFile state that the raw copy reads and updates
+_ZIPFILE_STATE = (
+    "fp",
+    "filelist",
+    "NameToInfo",
+    "start_dir",
+    "_lock",
+    "_writing",
+    "_seekable",
+    "_didModify",
+)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=10,
+        help="Seconds allowed for the validation conversion (default: 10)",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Produce byte-identical output for identical input",
+    )
+    parser.add_argument(
+        "--source",
+        help="Original Office file; unchanged media are copied without recompressing",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            timeout=args.timeout,
+            deterministic=args.deterministic,
+            source=args.source,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +106,27 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    timeout=10,
+    deterministic=False,
+    source=None,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        timeout: Seconds allowed for the validation conversion (default: 10)
+        deterministic: If True, writes members in canonical order with fixed
+            timestamps, permissions and compression level so identical content
+            always produces a byte-identical file (default: False)
+        source: Optional Office file the directory was unpacked from. Binary
+            parts that are byte-identical to a member of the source are copied
+            as compressed bytes instead of being recompressed.
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,45 +139,276 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # XML parts are condensed while being written into the archive and binary
+    # parts are read in place, so the input directory is never modified or copied
+    # Sidecar line indexes written by unpack.py are not part of the package
+    files = [
+        f for f in input_dir.rglob("*") if f.is_file() and f.suffix != ".idx"
+    ]
+    if deterministic:
+        members = _canonical_members(files, input_dir)
+    else:
+        members = [(f.relative_to(input_dir).as_posix(), f) for f in files]
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        source_zip = source_file = None
+        if source:
+            source_zip = stack.enter_context(zipfile.ZipFile(source))
+            source_file = stack.enter_context(open(source, "rb"))
+
+        zf = stack.enter_context(
+            zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED)
+        )
+        for name, f in members:
+            if f.suffix in (".xml", ".rels"):
+                # The size is an upper bound, only used to pick the header layout
+                if deterministic:
+                    info = _deterministic_info(name, f.stat().st_size)
+                else:
+                    info = zipfile.ZipInfo.from_file(f, name)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                with zf.open(info, "w") as dst:
+                    write_condensed_xml(f, dst)
+                continue
+
+            unchanged = source_zip and unchanged_member(source_zip, name, f)
+            if unchanged:  # Compressed bytes from the source, no recompression
+                copy_raw_member(
+                    source_file,
+                    unchanged,
+                    zf,
+                    deterministic=deterministic,
+                    source_zip=source_zip,
+                )
+            elif deterministic:
+                info = _deterministic_info(name, f.stat().st_size)
+                with open(f, "rb") as src, zf.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            else:
+                zf.write(f, name)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, timeout=timeout):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
-    # Determine the correct filter based on file extension
-    match doc_path.suffix.lower():
-        case ".docx":
-            filter_name = "html:HTML"
-        case ".pptx":
-            filter_name = "html:impress_html_Export"
-        case ".xlsx":
-            filter_name = "html:HTML (StarCalc)"
+def _canonical_members(files, root):
+    """Return (archive name, path) pairs in canonical member order.
+
+    [Content_Types].xml and the package relationships come first, followed by
+    every other member sorted by its archive name.
+    """
+    members = {f.relative_to(root).as_posix(): f for f in files}
+    leading = [name for name in LEADING_MEMBERS if name in members]
+    rest = sorted(name for name in members if name not in LEADING_MEMBERS)
+    return [(name, members[name]) for name in leading + rest]
+
+
+def _deterministic_info(name, file_size):
+    """Build a ZipInfo whose metadata does not depend on the packing machine.
+
+    Members are deflated at zlib's default level; the size is set up front so
+    zipfile picks the same (zip64 or not) header layout on every run.
+    """
+    info = zipfile.ZipInfo(name, date_time=DETERMINISTIC_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.file_size = file_size
+    info.create_system = 3  # Unix
+    info.external_attr = 0o100644 << 16  # Regular file, rw-r--r--
+    return info
+
+
+def unchanged_member(source_zip, name, path):
+    """Return the source member that a file is byte-identical to, if any.
+
+    Sizes are compared first; the CRC-32 of the file is only computed (over a
+    memory map, without reading it into Python buffers) when they match.
+
+    Args:
+        source_zip: Open zipfile.ZipFile of the source archive
+        name: Archive name the file would be written under
+        path: Path to the file on disk
+
+    Returns:
+        ZipInfo of the matching member, or None
+    """
+    info = source_zip.NameToInfo.get(name)
+    if info is None or info.flag_bits & _FLAG_ENCRYPTED:
+        return None
+    size = os.path.getsize(path)
+    if size != info.file_size:
+        return None
+    if size == 0:
+        return info
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return info if zlib.crc32(m) == info.CRC else None
+
+
+def copy_raw_member(
+    source_file, info, target_zip, deterministic=False, source_zip=None
+):
+    """Copy a member between archives without decompressing it.
+
+    The compressed bytes are located through the member's local header and
+    moved with os.sendfile() where the platform supports it, so large media
+    never pass through Python buffers. A memory map is used otherwise.
+
+    zipfile has no public API for pre-compressed data, so the raw copy updates
+    the target's internal state. It is only used on the Python versions in
+    RAW_COPY_VERSIONS; elsewhere the member is decompressed and written with
+    ZipFile.open(), which produces the same content.
+
+    Args:
+        source_file: Source archive opened in binary mode
+        info: ZipInfo of the member, from zipfile.ZipFile(source).getinfo()
+        target_zip: zipfile.ZipFile opened for writing
+        deterministic: If True, the member gets the fixed timestamp and
+            permissions used by deterministic packing (default: False)
+        source_zip: Optional zipfile.ZipFile of the source archive, used when
+            the member has to be recompressed (default: opened on source_file)
+
+    Raises:
+        ValueError: If the member is encrypted or its local header is corrupt
+    """
+    if info.flag_bits & _FLAG_ENCRYPTED:
+        raise ValueError(f"Cannot copy encrypted member {info.filename}")
+
+    if deterministic:
+        copy = zipfile.ZipInfo(info.filename, date_time=DETERMINISTIC_DATE_TIME)
+        copy.create_system = 3  # Unix
+        copy.external_attr = 0o100644 << 16  # Regular file, rw-r--r--
+    else:
+        copy = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        copy.create_system = info.create_system
+        copy.external_attr = info.external_attr
+    copy.compress_type = info.compress_type
+    copy.file_size = info.file_size
+
+    if not raw_copy_supported(target_zip):
+        _recompress_member(source_file, source_zip, info, copy, target_zip)
+        return
+
+    source_file.seek(info.header_offset)
+    header = source_file.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size or not header.startswith(b"PK\003\004"):
+        raise ValueError(f"Bad local header for member {info.filename}")
+    name_length, extra_length = _LOCAL_HEADER.unpack(header)[-2:]
+    data_offset = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+    # Keep the compression option and UTF-8 name bits; sizes are known up
+    # front, so no data descriptor follows the data
+    copy.flag_bits = info.flag_bits & ~_FLAG_DATA_DESCRIPTOR
+    copy.CRC = info.CRC
+    copy.compress_size = info.compress_size
+
+    # This mirrors what ZipFile.write() does for a member whose bytes are
+    # already final
+    with target_zip._lock:
+        if target_zip._writing:
+            raise ValueError("Cannot copy a member while another is being written")
+        fp = target_zip.fp
+        if target_zip._seekable:
+            fp.seek(target_zip.start_dir)
+        copy.header_offset = fp.tell()
+        fp.write(copy.FileHeader())
+        _copy_range(source_file, data_offset, copy.compress_size, fp)
+        target_zip.start_dir = fp.tell()
+        target_zip.filelist.append(copy)
+        target_zip.NameToInfo[copy.filename] = copy
+        target_zip._didModify = True
+
+
+def raw_copy_supported(target_zip):
+    """Return True if copy_raw_member() can write raw bytes into target_zip.
+
+    The running Python must be in RAW_COPY_VERSIONS and the archive must have
+    the zipfile internals the copy relies on.
+    """
+    low, high = RAW_COPY_VERSIONS
+    if not low <= sys.version_info[:2] <= high:
+        return False
+    return all(hasattr(target_zip, name) for name in _ZIPFILE_STATE)
+
+
+def _recompress_member(source_file, source_zip, info, copy, target_zip):
+    """Copy a member through zipfile's public API, decompressing it."""
+    with contextlib.ExitStack() as stack:
+        if source_zip is None:
+            source_file.seek(0)
+            source_zip = stack.enter_context(zipfile.ZipFile(source_file))
+        src = stack.enter_context(source_zip.open(info))
+        dst = stack.enter_context(target_zip.open(copy, "w"))
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _copy_range(source_file, offset, count, target):
+    """Copy count bytes at offset in source_file to target's current position."""
+    if count == 0:
+        return
+    target.flush()
+    position = target.tell()
+    copied = 0
+
+    if hasattr(os, "sendfile"):
+        try:
+            in_fd, out_fd = source_file.fileno(), target.fileno()
+            while copied < count:
+                sent = os.sendfile(out_fd, in_fd, offset + copied, count - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except (OSError, AttributeError, io.UnsupportedOperation):
+            pass  # e.g. macOS only sends to sockets; fall through
+        target.seek(position + copied)
+        if copied == count:
+            return
+
+    start, end = offset + copied, offset + count
+    try:
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as view:
+                target.write(view[start:end])
+    except (OSError, ValueError, AttributeError, io.UnsupportedOperation):
+        source_file.seek(start)
+        remaining = end - start
+        while remaining:
+            chunk = source_file.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise ValueError("Source archive ended inside a member")
+            target.write(chunk)
+            remaining -= len(chunk)
+
+
+def validate_document(doc_path, timeout=10, pool=None):
+    """Validate document by converting to HTML with soffice.
+
+    Uses the given SofficePool, or the shared pool when the UNO bridge is
+    available, and falls back to a one-off soffice process otherwise.
+
+    Args:
+        doc_path: Path to the Office file to validate
+        timeout: Seconds allowed for the conversion (default: 10)
+        pool: Optional SofficePool to convert with
+
+    Returns:
+        bool: True if the document converted successfully
+    """
+    doc_path = Path(doc_path)
+    filter_name = _html_filter(doc_path)
+    pool = pool or get_soffice_pool()
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
+            if pool:
+                pool.convert(doc_path, filter_name, temp_dir, timeout=timeout)
+                return True
+
             result = subprocess.run(
                 [
                     "soffice",
@@ -111,7 +420,7 @@ def validate_document(doc_path):
                     str(doc_path),
                 ],
                 capture_output=True,
-                timeout=10,
+                timeout=timeout,
                 text=True,
             )
             if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
@@ -130,29 +439,344 @@ def validate_document(doc_path):
             return False
 
 
+def _html_filter(doc_path):
+    """Return the soffice "extension:filter" HTML export target for a file."""
+    match doc_path.suffix.lower():
+        case ".docx":
+            return "html:HTML"
+        case ".pptx":
+            return "html:impress_html_Export"
+        case ".xlsx":
+            return "html:HTML (StarCalc)"
+    raise ValueError(f"{doc_path} must be a .docx, .pptx, or .xlsx file")
+
+
+class SofficePool:
+    """Pool of long-lived headless soffice listeners for document conversion.
+
+    Each listener is an soffice process with its own user profile, accepting UNO
+    connections on a named pipe. Listeners are started on first use, checked for
+    health before every conversion and restarted if they died or timed out.
+    Callers beyond the pool size wait in a queue for a free listener.
+
+    Requires LibreOffice's Python UNO bridge (the `uno` module).
+
+    Example:
+        pool = SofficePool(size=2)
+        pool.convert("report.docx", "html:HTML", "out/")
+        pool.close()
+    """
+
+    def __init__(self, size=2, startup_timeout=60):
+        """
+        Args:
+            size: Number of soffice listeners (default: 2)
+            startup_timeout: Seconds to wait for a listener to accept connections
+
+        Raises:
+            ImportError: If the `uno` module is not available
+        """
+        import uno  # noqa: F401
+
+        self.startup_timeout = startup_timeout
+        self._listeners = [_SofficeListener() for _ in range(size)]
+        self._idle = queue.Queue()
+        for listener in self._listeners:
+            self._idle.put(listener)
+
+    def convert(self, doc_path, filter_name, outdir, timeout=10, wait=None):
+        """Convert a document with the next free listener.
+
+        Args:
+            doc_path: Path to the document to convert
+            filter_name: soffice target in "extension:filter" form (e.g. "html:HTML")
+            outdir: Directory to write the converted file to
+            timeout: Seconds allowed for the conversion itself
+            wait: Seconds to wait for a free listener (default: wait forever)
+
+        Returns:
+            Path: The converted file
+
+        Raises:
+            FileNotFoundError: If soffice is not installed
+            subprocess.TimeoutExpired: If the conversion exceeds the timeout
+            queue.Empty: If no listener became free within `wait` seconds
+        """
+        listener = self._idle.get(timeout=wait)
+        try:
+            if not listener.is_healthy():
+                listener.restart(self.startup_timeout)
+            return listener.convert(doc_path, filter_name, outdir, timeout)
+        except Exception:
+            listener.stop()
+            raise
+        finally:
+            self._idle.put(listener)
+
+    def close(self):
+        """Stop all listeners and remove their profiles."""
+        for listener in self._listeners:
+            listener.stop(remove_profile=True)
+
+
+class _SofficeListener:
+    """A single soffice process accepting UNO connections on a named pipe."""
+
+    def __init__(self):
+        self.pipe_name = f"ooxml_pack_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="soffice_profile_"))
+        self.process = None
+        self.desktop = None
+
+    def is_healthy(self):
+        """Check that the process is alive and answers a UNO round-trip."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            self.desktop.getFrames()  # type: ignore
+            return True
+        except Exception:
+            return False
+
+    def restart(self, startup_timeout):
+        """(Re)start soffice and connect to it.
+
+        Raises:
+            FileNotFoundError: If soffice is not installed
+            RuntimeError: If soffice does not accept connections in time
+        """
+        self.stop()
+        self.process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--norestore",
+                "--nodefault",
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                self.desktop = self._connect()
+                return
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError("soffice listener failed to start")
+                time.sleep(0.25)
+
+    def convert(self, doc_path, filter_name, outdir, timeout):
+        """Load a document hidden, export it with the given filter and close it."""
+        import uno
+
+        extension, export_filter = filter_name.split(":", 1)
+        doc_path = Path(doc_path).resolve()
+        output = Path(outdir) / f"{doc_path.stem}.{extension}"
+
+        # A hung conversion cannot be interrupted over UNO; kill the process instead
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            self.stop()
+
+        watchdog = threading.Timer(timeout, on_timeout)
+        watchdog.start()
+        try:
+            component = self.desktop.loadComponentFromURL(  # type: ignore
+                uno.systemPathToFileUrl(str(doc_path)),
+                "_blank",
+                0,
+                (_property("Hidden", True), _property("ReadOnly", True)),
+            )
+            if component is None:
+                raise ValueError(f"soffice could not load {doc_path.name}")
+            try:
+                component.storeToURL(
+                    uno.systemPathToFileUrl(str(output.resolve())),
+                    (_property("FilterName", export_filter),),
+                )
+            finally:
+                component.close(True)
+        except Exception:
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired("soffice", timeout)
+            raise
+        finally:
+            watchdog.cancel()
+
+        if not output.exists():
+            raise ValueError("Document validation failed")
+        return output
+
+    def stop(self, remove_profile=False):
+        """Terminate the soffice process if it is running."""
+        self.desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        if remove_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _connect(self):
+        """Resolve the listener's component context and return its Desktop."""
+        import uno
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        context = resolver.resolve(
+            f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+        )
+        return context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+
+def _property(name, value):
+    """Build a com.sun.star.beans.PropertyValue."""
+    from com.sun.star.beans import PropertyValue  # type: ignore
+
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+_soffice_pool = None
+
+
+def get_soffice_pool():
+    """Return the shared SofficePool, or None if the UNO bridge is unavailable.
+
+    The pool size is read from the SOFFICE_POOL_SIZE environment variable
+    (default: 2); set it to 0 to always cold-start soffice.
+    """
+    global _soffice_pool
+    if _soffice_pool is None:
+        size = int(os.environ.get("SOFFICE_POOL_SIZE", "2"))
+        try:
+            _soffice_pool = SofficePool(size=size) if size > 0 else False
+        except ImportError:
+            _soffice_pool = False
+        if _soffice_pool:
+            atexit.register(_soffice_pool.close)
+    return _soffice_pool or None
+
+
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    content = condensed_xml_bytes(xml_file)
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+    # Write back the condensed XML
+    with open(xml_file, "wb") as f:
+        f.write(content)
+
+
+def condensed_xml_bytes(xml_file):
+    """Return the condensed serialization of an XML file without modifying it."""
+    buffer = io.BytesIO()
+    write_condensed_xml(xml_file, buffer)
+    return buffer.getvalue()
+
+
+def write_condensed_xml(xml_file, f):
+    """Write the condensed serialization of an XML file to a binary file object."""
+    with open(xml_file, "r", encoding="utf-8") as src:
+        dom = defusedxml.minidom.parse(src)
+    write_xml(dom, f, encoding="UTF-8", condense=True)
+
+
+def write_xml(dom, f, encoding="UTF-8", condense=False):
+    """Serialize a DOM to a binary file object as it is walked.
+
+    Unlike dom.toxml(), the document is never held in memory as a whole, and
+    no attribute maps are created on elements that have none. The output is
+    the same as dom.toxml(encoding=encoding), except that tabs and line breaks
+    in attribute values are written as character references so that they
+    survive reparsing. With condense=True, whitespace-only text and comments
+    are left out except inside w:t-like (":t") elements, as condense_xml()
+    does, without modifying the DOM.
+
+    Args:
+        dom: defusedxml.minidom.Document to serialize
+        f: Binary file object to write to, e.g. open(path, "wb") or a zip member
+        encoding: Encoding named in the XML declaration and used for output
+        condense: If True, strip formatting whitespace and comments
+    """
+    writer = io.TextIOWrapper(
+        f, encoding=encoding, errors="xmlcharrefreplace", newline="\n"
+    )
+    try:
+        writer.write(f'<?xml version="1.0" encoding="{encoding}"?>')
+        for node in dom.childNodes:
+            _write_node(node, writer, condense)
+        writer.flush()
+    finally:
+        # Leave f open for the caller
+        writer.detach()
+
+
+def _write_node(root, writer, condense):
+    """Write a node and its descendants without recursion."""
+    write = writer.write
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):  # Pending end tag
+            write(node)
+            continue
+        if node.nodeType != node.ELEMENT_NODE or (
+            condense and node.tagName.endswith(":t")
+        ):
+            node.writexml(writer)
             continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
+        children = node.childNodes
+        if condense:
+            children = [
+                child
+                for child in children
+                if not (
+                    child.nodeType == child.COMMENT_NODE
+                    or (
+                        child.nodeType == child.TEXT_NODE
+                        and child.data
+                        and not child.data.strip()
+                    )
+                )
+            ]
+        write("<" + node.tagName)
+        if node.hasAttributes():
+            for name, value in node.attributes.items():
+                write(f' {name}="{_escape_attribute(value)}"')
+        if children:
+            write(">")
+            stack.append(f"</{node.tagName}>")
+            stack.extend(reversed(children))
+        else:
+            write("/>")
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+
+def _escape_attribute(value):
+    """Escape an attribute value for double-quoted output."""
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Apply the same edits to many Word documents in parallel.
+
+Each .docx is opened in a worker process with its own temporary workspace,
+edited, validated and packed into the output directory. Compiled validation
+schemas are kept by each worker, so only the first document a worker handles
+pays for them. The outcome, validator output and timings of every document
+are written to batch_report.json in the output directory.
+
+The edit is either a Python function that takes a Document, or a JSON file
+of declarative operations:
+
+    [
+      {"op": "replace", "find": "within 30 days", "replace": "within 45 days"},
+      {"op": "comment", "contains": "Governing Law", "text": "Confirm venue"},
+      {"op": "delete", "contains": "This clause is void."}
+    ]
+
+- replace: tracked replacement of the text in each paragraph containing it;
+  only the words that differ are marked (see DocxXMLEditor.suggest_text())
+- comment: comment on each element (tag, default "w:p") containing the text
+- delete: tracked deletion of each element (tag, default "w:p") containing
+  the text; elements that already contain tracked changes are skipped
+
+Example usage:
+    python -m scripts.batch edits.json out/ contracts/*.docx --workers 8
+    python -m scripts.batch my_edits.py:update_clause out/ contracts/*.docx
+
+    from scripts.batch import run_batch
+    results = run_batch(files, "edits.json", "out/", author="Legal Review")
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import html
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from .document import Document, _generate_rsid
+
+# Written to the output directory after every run
+REPORT_NAME = "batch_report.json"
+
+# Declarative operations and their required keys
+OPERATIONS = {
+    "replace": ("find", "replace"),
+    "comment": ("contains", "text"),
+    "delete": ("contains",),
+}
+
+# Set in each worker process by _init_worker()
+_edit = None
+_options = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply the same edits to many .docx files in parallel"
+    )
+    parser.add_argument(
+        "edit", help="JSON operations file, or script.py[:function] (default: edit)"
+    )
+    parser.add_argument("output_dir", help="Directory for edited documents")
+    parser.add_argument("files", nargs="+", help=".docx files to edit")
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument("--author", default="Claude", help="Author of the changes")
+    parser.add_argument("--initials", default="C", help="Author initials")
+    parser.add_argument("--rsid", help="RSID for all documents (default: random)")
+    parser.add_argument(
+        "--no-validate", action="store_true", help="Skip validation before saving"
+    )
+    args = parser.parse_args()
+
+    try:
+        results = run_batch(
+            args.files,
+            args.edit,
+            args.output_dir,
+            workers=args.workers,
+            validate=not args.no_validate,
+            author=args.author,
+            initials=args.initials,
+            rsid=args.rsid,
+            verbose=True,
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    failed = sum(not result["ok"] for result in results)
+    print(f"{len(results) - failed} succeeded, {failed} failed")
+    print(f"Report: {Path(args.output_dir) / REPORT_NAME}")
+    if failed:
+        sys.exit(1)
+
+
+def run_batch(
+    files,
+    edit,
+    output_dir,
+    workers=None,
+    validate=True,
+    author="Claude",
+    initials="C",
+    rsid=None,
+    verbose=False,
+):
+    """
+    Edit, validate and save many .docx files with a pool of worker processes.
+
+    A document whose edit, validation or save fails is reported and skipped;
+    the others are unaffected. All documents share one RSID, as in a single
+    editing session.
+
+    Args:
+        files: Paths to the .docx files to edit
+        edit: A function taking a Document (defined at module level so worker
+            processes can import it), a path to a JSON operations file, a list
+            of operations, or "script.py[:function]" (function default: edit)
+        output_dir: Directory for the edited documents and the report
+        workers: Number of worker processes (default: CPU count). With 1, the
+            documents are edited in this process.
+        validate: If True, documents that fail validation are not saved
+        author: Author of tracked changes and comments
+        initials: Author initials for comments
+        rsid: RSID for all documents (default: a random one)
+        verbose: If True, print a line for each finished document
+
+    Returns:
+        list[dict]: One result per file, in input order, with keys "source",
+        "output", "ok", "error", "changes" (what the edit returned), "log"
+        (captured output, e.g. validator messages) and "seconds" (open, edit,
+        validate, save and total)
+
+    Raises:
+        ValueError: If a file is not a .docx or the edit cannot be loaded
+    """
+    files = [Path(f) for f in files]
+    for f in files:
+        if f.suffix.lower() != ".docx" or not f.is_file():
+            raise ValueError(f"Not a .docx file: {f}")
+    load_edit(edit)  # Fail before starting workers
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = _output_paths(files, output_dir)
+    options = {
+        "validate": validate,
+        "author": author,
+        "initials": initials,
+        "rsid": rsid or _generate_rsid(),
+    }
+
+    start = time.perf_counter()
+    results = [None] * len(files)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(edit, options)
+        for i, (source, output) in enumerate(zip(files, outputs)):
+            results[i] = _process(source, output)
+            if verbose:
+                _print_result(results[i])
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(files) or 1),
+            initializer=_init_worker,
+            initargs=(edit, options),
+        ) as pool:
+            futures = {
+                pool.submit(_process, source, output): i
+                for i, (source, output) in enumerate(zip(files, outputs))
+            }
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+                if verbose:
+                    _print_result(future.result())
+
+    report = {
+        "rsid": options["rsid"],
+        "documents": len(results),
+        "succeeded": sum(result["ok"] for result in results),
+        "failed": sum(not result["ok"] for result in results),
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+    (output_dir / REPORT_NAME).write_text(json.dumps(report, indent=2) + "\n")
+    return results
+
+
+def load_edit(edit):
+    """
+    Turn an edit specification into a function taking a Document.
+
+    Args:
+        edit: A callable, a list of operations, a path to a JSON operations
+            file, or "script.py[:function]" (function default: edit)
+
+    Returns:
+        callable: The edit function
+
+    Raises:
+        ValueError: If the file, function or operations are invalid
+    """
+    if callable(edit):
+        return edit
+    if isinstance(edit, list):
+        check_operations(edit)
+        return lambda doc: apply_operations(doc, edit)
+
+    spec = str(edit)
+    if spec.endswith(".json"):
+        try:
+            operations = json.loads(Path(spec).read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot read operations from {spec}: {e}")
+        return load_edit(operations)
+
+    path, name = spec, "edit"
+    if not spec.endswith(".py") and ":" in spec:
+        path, name = spec.rsplit(":", 1)
+    if not Path(path).is_file():
+        raise ValueError(f"Edit script not found: {path}")
+    module_spec = importlib.util.spec_from_file_location("_batch_edit", path)
+    module = importlib.util.module_from_spec(module_spec)  # type: ignore
+    module_spec.loader.exec_module(module)  # type: ignore
+    function = getattr(module, name, None)
+    if not callable(function):
+        raise ValueError(f"{path} has no function named {name}")
+    return function
+
+
+def check_operations(operations):
+    """
+    Check declarative operations before any document is opened.
+
+    Raises:
+        ValueError: If an operation is unknown or lacks a required key
+    """
+    if not isinstance(operations, list):
+        raise ValueError("Operations must be a JSON list")
+    for i, operation in enumerate(operations):
+        kind = operation.get("op") if isinstance(operation, dict) else None
+        if kind not in OPERATIONS:
+            raise ValueError(
+                f"Operation {i}: unknown op {kind!r} (expected one of {list(OPERATIONS)})"
+            )
+        for key in OPERATIONS[kind]:
+            if not isinstance(operation.get(key), str) or not operation[key]:
+                raise ValueError(f"Operation {i} ({kind}) needs a {key!r} string")
+
+
+def apply_operations(doc, operations):
+    """
+    Apply declarative operations to a Document.
+
+    Args:
+        doc: Document to edit
+        operations: List of operation dicts (see the module docstring)
+
+    Returns:
+        dict: Number of elements changed per operation, plus "skipped" for
+        elements that could not be redlined (tracked changes, fields or
+        drawings in them)
+    """
+    editor = doc["word/document.xml"]
+    counts = {"skipped": 0}
+    for i, operation in enumerate(operations):
+        kind = operation["op"]
+        tag = operation.get("tag", "w:p")
+        if kind == "replace":
+            changed, skipped = _replace_text(
+                editor, operation["find"], operation["replace"]
+            )
+            counts["skipped"] += skipped
+        elif kind == "comment":
+            nodes = editor.find_text(tag, [operation["contains"]])
+            nodes = nodes[operation["contains"]]
+            doc.add_comments(
+                [{"start": n, "end": n, "text": operation["text"]} for n in nodes]
+            )
+            changed = len(nodes)
+        else:
+            nodes = editor.find_text(tag, [operation["contains"]])
+            nodes = nodes[operation["contains"]]
+            changed = 0
+            for node in nodes:
+                try:
+                    editor.suggest_deletion(node)
+                except ValueError:
+                    # Already contains tracked changes
+                    counts["skipped"] += 1
+                    continue
+                changed += 1
+        counts[f"{i}:{kind}"] = changed
+    return counts
+
+
+def _replace_text(editor, find, replace):
+    """Redline find to replace in every paragraph that contains it.
+
+    Returns:
+        tuple[int, int]: Paragraphs changed and paragraphs skipped
+    """
+    old = html.unescape(find)
+    new = html.unescape(replace)
+    changes = {}
+    skipped = 0
+    for paragraph in editor.find_text("w:p", [find])[find]:
+        try:
+            text = editor.paragraph_text(paragraph)
+        except ValueError:
+            skipped += 1
+            continue
+        if old in text:
+            changes[paragraph] = text.replace(old, new)
+        else:
+            skipped += 1
+    editor.suggest_text_changes(changes)
+    return len(changes), skipped
+
+
+def _output_paths(files, output_dir):
+    """Give every input an output path, numbering names that repeat."""
+    outputs = []
+    seen = set()
+    for f in files:
+        output = output_dir / f.name
+        n = 1
+        while output.name in seen:
+            n += 1
+            output = output_dir / f"{f.stem}-{n}{f.suffix}"
+        seen.add(output.name)
+        outputs.append(output)
+    return outputs
+
+
+def _init_worker(edit, options):
+    """Load the edit once per worker process."""
+    global _edit, _options
+    _edit = load_edit(edit)
+    _options = options
+
+
+def _process(source, output):
+    """Edit, validate and save one document, recording timings and output."""
+    result = {
+        "source": str(source),
+        "output": None,
+        "ok": False,
+        "error": None,
+        "changes": None,
+        "log": "",
+        "seconds": {},
+    }
+    seconds = result["seconds"]
+    start = last = time.perf_counter()
+
+    def lap(name):
+        nonlocal last
+        now = time.perf_counter()
+        seconds[name] = round(now - last, 3)
+        last = now
+
+    log = io.StringIO()
+    doc = None
+    try:
+        with contextlib.redirect_stdout(log):
+            doc = Document(
+                source,
+                rsid=_options["rsid"],  # type: ignore
+                author=_options["author"],  # type: ignore
+                initials=_options["initials"],  # type: ignore
+            )
+            lap("open")
+            changes = _edit(doc)  # type: ignore
+            result["changes"] = changes if isinstance(changes, dict) else None
+            lap("edit")
+            if _options["validate"]:  # type: ignore
+                # save() validates after its setup; time that step separately
+                doc.validate = _timed(doc.validate, seconds, "validate")
+            doc.save(output, validate=_options["validate"])  # type: ignore
+            lap("save")
+            seconds["save"] = round(seconds["save"] - seconds.get("validate", 0), 3)
+        result["ok"] = True
+        result["output"] = str(output)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if doc is not None:
+            doc.close()
+        seconds["total"] = round(time.perf_counter() - start, 3)
+        result["log"] = log.getvalue()
+    return result
+
+
+def _timed(function, seconds, name):
+    """Wrap a function so its run time is recorded in seconds[name]."""
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds[name] = round(time.perf_counter() - start, 3)
+
+    return wrapper
+
+
+def _print_result(result):
+    status = "ok" if result["ok"] else "FAILED"
+    line = f"{status:6} {result['seconds']['total']:7.2f}s  {result['source']}"
+    if result["error"]:
+        line += f"  ({result['error']})"
+    print(line)
+
+
+if __name__ == "__main__":
+    main()
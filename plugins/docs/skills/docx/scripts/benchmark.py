@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Document library on synthetic documents of increasing size.
+
+For each size (number of paragraphs) and tracked-change density, a .docx is
+generated and the common operations are timed on it: opening the document
+and parsing document.xml, get_node by line number, attributes and text,
+add_comment, reply_to_comment, suggest_deletion, revert_insertion, and
+save(validate=True). Each lookup and edit is repeated on nodes spread across
+the document, once per CALL_FRACTION of its paragraphs, so the work grows
+with the document the way an edit pass over all of it would. The first call
+pays for any index it builds.
+
+The report gives the total time of every operation at each size, and the
+scaling exponent k of time ~ size^k fitted over the sizes. k near 1 is
+linear: constant time per call. An operation that costs O(n) per call fits
+k near 2 and is flagged once k exceeds QUADRATIC_WARNING.
+
+The default sizes run in about a minute; the "full" preset goes up to 100,000
+paragraphs and takes much longer.
+
+Example usage:
+    python -m scripts.benchmark
+    python -m scripts.benchmark --preset full --densities 0 0.2
+    python -m scripts.benchmark --sizes 1000 10000 --json results.json --no-validate
+
+    from scripts.benchmark import run_benchmark, format_report
+    results = run_benchmark([1000, 10000], [0.1])
+    print(format_report(results))
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from .document import Document
+
+# Paragraph counts of each preset
+PRESETS = {
+    "quick": (1000, 3000, 10000),
+    "full": (1000, 3000, 10000, 30000, 100000),
+}
+DEFAULT_SIZES = PRESETS["quick"]
+DEFAULT_DENSITIES = (0.0, 0.1)
+
+# Lookups and edits per paragraph (at least one call per operation)
+CALL_FRACTION = 0.02
+
+# Operations whose fitted exponent exceeds this are flagged as superlinear
+QUADRATIC_WARNING = 1.5
+
+OPERATIONS = (
+    "open",
+    "get_node_line",
+    "get_node_attrs",
+    "get_node_contains",
+    "add_comment",
+    "reply_to_comment",
+    "suggest_deletion",
+    "revert_insertion",
+    "save",
+)
+
+_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml" '
+    'mc:Ignorable="w14"'
+)
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/settings.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+    "</Types>"
+)
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/settings" Target="settings.xml"/>'
+    "</Relationships>"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time Document operations on synthetic documents of growing size"
+    )
+    sizes = parser.add_mutually_exclusive_group()
+    sizes.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help=f"Paragraph counts (default: {' '.join(map(str, DEFAULT_SIZES))})",
+    )
+    sizes.add_argument(
+        "--preset",
+        choices=PRESETS,
+        help="Named paragraph counts: "
+        + "; ".join(f"{name}: {' '.join(map(str, v))}" for name, v in PRESETS.items()),
+    )
+    parser.add_argument(
+        "--densities",
+        type=float,
+        nargs="+",
+        default=DEFAULT_DENSITIES,
+        help="Fractions of paragraphs with tracked changes (default: 0 0.1)",
+    )
+    parser.add_argument(
+        "--call-fraction",
+        type=float,
+        default=CALL_FRACTION,
+        help=f"Lookups and edits per paragraph (default: {CALL_FRACTION})",
+    )
+    parser.add_argument(
+        "--no-validate", action="store_true", help="Save without validation"
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(
+            args.sizes or PRESETS[args.preset or "quick"],
+            args.densities,
+            call_fraction=args.call_fraction,
+            validate=not args.no_validate,
+            verbose=True,
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    print()
+    print(format_report(results))
+    if args.json:
+        report = {"results": results, "scaling": scaling(results)}
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    densities=DEFAULT_DENSITIES,
+    call_fraction=CALL_FRACTION,
+    validate=True,
+    seed=0,
+    verbose=False,
+):
+    """
+    Time the operations for every combination of size and change density.
+
+    Args:
+        sizes: Numbers of paragraphs
+        densities: Fractions (0 to 1) of paragraphs holding a tracked
+            insertion and deletion
+        call_fraction: Calls per lookup or edit operation, per paragraph
+            (rounded up to at least one)
+        validate: If True, save() validates the document
+        seed: Seed for choosing the nodes that are looked up and edited
+        verbose: If True, print a line per finished document
+
+    Returns:
+        list[dict]: One result per document, with keys "paragraphs",
+        "density", "changes", "calls" and "seconds" (operation -> seconds for
+        all its calls; revert_insertion is missing when there are no changes)
+
+    Raises:
+        ValueError: If a size, density or call fraction is out of range
+    """
+    if not sizes or min(sizes) < 1:
+        raise ValueError("Sizes must be positive paragraph counts")
+    if not all(0 <= density <= 1 for density in densities):
+        raise ValueError("Densities must be between 0 and 1")
+    if not 0 < call_fraction <= 1:
+        raise ValueError("The call fraction must be above 0 and at most 1")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="docx_benchmark_") as tmp:
+        for density in densities:
+            for size in sorted(sizes):
+                source = Path(tmp) / f"bench_{size}_{density}.docx"
+                changes = build_document(source, size, density)
+                calls = max(1, math.ceil(size * call_fraction))
+                # Keep the library's progress messages out of the report
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds = _time_operations(
+                        source, size, calls, validate, random.Random(seed)
+                    )
+                results.append(
+                    {
+                        "paragraphs": size,
+                        "density": density,
+                        "changes": changes,
+                        "calls": calls,
+                        "seconds": seconds,
+                    }
+                )
+                if verbose:
+                    total = sum(seconds.values())
+                    print(
+                        f"{size:>8} paragraphs, density {density:<5} "
+                        f"{total:8.2f}s"
+                    )
+    return results
+
+
+def build_document(path, paragraphs, change_density=0.0):
+    """
+    Write a synthetic .docx with numbered paragraphs.
+
+    Paragraph i has the text "Clause i: ..." and w14:paraId i (in hex), so it
+    can be found by text or attribute. A change_density fraction of the
+    paragraphs, spread evenly, also hold a tracked insertion and deletion.
+
+    Args:
+        path: .docx file to write
+        paragraphs: Number of paragraphs
+        change_density: Fraction (0 to 1) of paragraphs with tracked changes
+
+    Returns:
+        int: Number of paragraphs with tracked changes
+    """
+    body = []
+    changed = 0
+    for i in range(paragraphs):
+        runs = (
+            f'<w:r><w:t xml:space="preserve">Clause {i}: the parties agree </w:t></w:r>'
+            f"<w:r><w:rPr><w:b/></w:rPr><w:t>to the terms of section {i % 97}.</w:t></w:r>"
+        )
+        if int((i + 1) * change_density) > int(i * change_density):
+            changed += 1
+            runs += (
+                f'<w:ins w:id="{2 * i}" w:author="Reviewer" '
+                f'w:date="2024-01-01T00:00:00Z"><w:r><w:t xml:space="preserve"> '
+                f"Inserted {i}.</w:t></w:r></w:ins>"
+                f'<w:del w:id="{2 * i + 1}" w:author="Reviewer" '
+                f'w:date="2024-01-01T00:00:00Z"><w:r><w:delText xml:space="preserve"> '
+                f"Deleted {i}.</w:delText></w:r></w:del>"
+            )
+        style = "Heading1" if i % 50 == 0 else "Normal"
+        body.append(
+            f'<w:p w14:paraId="{i + 1:08X}"><w:pPr><w:pStyle w:val="{style}"/></w:pPr>'
+            f"{runs}</w:p>"
+        )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<w:document {_NAMESPACES}><w:body>\n" + "\n".join(body) + "\n<w:sectPr/>"
+        "</w:body></w:document>"
+    )
+    settings = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f"<w:settings {_NAMESPACES}><w:defaultTabStop w:val=\"720\"/></w:settings>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _PACKAGE_RELS)
+        archive.writestr("word/document.xml", document)
+        archive.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+        archive.writestr("word/settings.xml", settings)
+    return changed
+
+
+def scaling(results):
+    """
+    Fit time ~ size^k for every operation and change density.
+
+    Args:
+        results: Results of run_benchmark()
+
+    Returns:
+        dict: Density -> operation -> exponent k (None with fewer than two
+        sizes or zero times)
+    """
+    fitted = {}
+    for density in dict.fromkeys(result["density"] for result in results):
+        rows = [result for result in results if result["density"] == density]
+        fitted[density] = {}
+        for operation in OPERATIONS:
+            points = [
+                (math.log(row["paragraphs"]), math.log(row["seconds"][operation]))
+                for row in rows
+                if row["seconds"].get(operation, 0) > 0
+            ]
+            fitted[density][operation] = _slope(points)
+    return fitted
+
+
+def format_report(results):
+    """
+    Format results as one table per change density.
+
+    Returns:
+        str: Seconds per operation at each size, the fitted exponent, and a
+        warning mark on operations scaling worse than QUADRATIC_WARNING
+    """
+    fitted = scaling(results)
+    lines = []
+    for density, exponents in fitted.items():
+        rows = [result for result in results if result["density"] == density]
+        header = f"{'operation':<20}" + "".join(
+            f"{row['paragraphs']:>10}" for row in rows
+        )
+        lines.append(f"Change density {density}: seconds per operation")
+        lines.append(header + f"{'exponent':>10}")
+        calls = "".join(f"{row['calls']:>10}" for row in rows)
+        lines.append(f"{'(lookup/edit calls)':<20}{calls}")
+        for operation in OPERATIONS:
+            cells = "".join(
+                f"{row['seconds'][operation]:>10.4f}"
+                if operation in row["seconds"]
+                else f"{'-':>10}"
+                for row in rows
+            )
+            exponent = exponents[operation]
+            mark = ""
+            if exponent is None:
+                fit = f"{'-':>10}"
+            else:
+                fit = f"{exponent:>10.2f}"
+                if exponent > QUADRATIC_WARNING:
+                    mark = "  <- superlinear"
+            lines.append(f"{operation:<20}{cells}{fit}{mark}")
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def _time_operations(source, size, calls, validate, rng):
+    """Run every operation on one document, returning seconds per operation."""
+    seconds = {}
+
+    def timed(name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds[name] = round(time.perf_counter() - start, 6)
+        return result
+
+    def open_document():
+        doc = Document(source, author="Benchmark", initials="B")
+        return doc, doc["word/document.xml"]
+
+    doc, editor = timed("open", open_document)
+    try:
+        targets = rng.sample(range(size), min(calls, size))
+        with editor.read_only() as dom:
+            paragraphs = dom.getElementsByTagName("w:p")
+            lines = [paragraphs[i].parse_position[0] for i in targets]
+
+        timed(
+            "get_node_line",
+            lambda: [editor.get_node(tag="w:p", line_number=n) for n in lines],
+        )
+        timed(
+            "get_node_attrs",
+            lambda: [
+                editor.get_node(tag="w:p", attrs={"w14:paraId": f"{i + 1:08X}"})
+                for i in targets
+            ],
+        )
+        found = timed(
+            "get_node_contains",
+            lambda: [
+                editor.get_node(tag="w:p", contains=f"Clause {i}:") for i in targets
+            ],
+        )
+
+        comment_ids = timed(
+            "add_comment",
+            lambda: [
+                doc.add_comment(start=p, end=p, text=f"Comment on clause {i}")
+                for p, i in zip(found, targets)
+            ],
+        )
+        timed(
+            "reply_to_comment",
+            lambda: [
+                doc.reply_to_comment(parent_comment_id=comment_id, text="Reply")
+                for comment_id in comment_ids
+            ],
+        )
+
+        runs = [p.getElementsByTagName("w:r")[0] for p in found]
+        timed("suggest_deletion", lambda: [editor.suggest_deletion(r) for r in runs])
+
+        with editor.read_only() as dom:
+            insertions = [
+                ins
+                for ins in dom.getElementsByTagName("w:ins")
+                if ins.getAttribute("w:author") == "Reviewer"
+            ]
+        if insertions:
+            sample = rng.sample(insertions, min(calls, len(insertions)))
+            timed(
+                "revert_insertion",
+                lambda: [editor.revert_insertion(ins) for ins in sample],
+            )
+
+        output = source.with_name(f"out_{source.name}")
+        timed("save", lambda: doc.save(output, validate=validate))
+    finally:
+        doc.close()
+    return seconds
+
+
+def _slope(points):
+    """Least-squares slope of (x, y) points, or None if it is undefined."""
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('contract.docx')  # Edit in place without unpacking
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -26,23 +27,72 @@ Usage:
     doc.save()
 """
 
+import bisect
+import contextlib
+import difflib
+import gc
 import html
+import itertools
+import os
 import random
+import re
 import shutil
 import tempfile
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.unpack import XML_SUFFIXES
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from . import profiling
+from .utilities import XMLEditor, _edit_method
+from .workspace import PackageWorkspace
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Comment markup fragments. Empty attributes are filled in after insertion by
+# Document._insert_template(); w:rsidR on the reference runs is added by
+# DocxXMLEditor.
+_COMMENT_RANGE_START = '<w:commentRangeStart w:id=""/>'
+_COMMENT_RANGE_END = '<w:commentRangeEnd w:id=""/>'
+_COMMENT_REF_RUN = """<w:r>
+  <w:rPr><w:rStyle w:val="CommentReference"/></w:rPr>
+  <w:commentReference w:id=""/>
+</w:r>"""
+_COMMENT_RANGE_END_WITH_REF = f"{_COMMENT_RANGE_END}\n{_COMMENT_REF_RUN}"
+_COMMENT_EX = '<w15:commentEx w15:paraId="" w15:done="0"/>'
+_COMMENT_EX_REPLY = (
+    '<w15:commentEx w15:paraId="" w15:paraIdParent="" w15:done="0"/>'
+)
+_COMMENT_ID = '<w16cid:commentId w16cid:paraId="" w16cid:durableId=""/>'
+_COMMENT_EXTENSIBLE = '<w16cex:commentExtensible w16cex:durableId=""/>'
+
+# Run children that suggest_text() reads as plain text (None: the text of a w:t)
+_RUN_TEXT = {"w:t": None, "w:tab": "\t", "w:br": "\n", "w:cr": "\n"}
+# Run children without text that suggest_text() may drop from rewritten runs
+_RUN_IGNORED = {"w:rPr", "w:lastRenderedPageBreak"}
+# Elements that may contain the runs of a paragraph rewritten by suggest_text()
+_RUN_PARENTS = {"w:p", "w:hyperlink"}
+# Deleted text elements and what they become when a deletion is rejected
+_RESTORED_TEXT = {"w:delText": "w:t", "w:delInstrText": "w:instrText"}
+# Tokens compared by suggest_text(): words, whitespace, and single other characters
+_TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+# Attributes holding 8-digit hex IDs that must be unique across a package
+_HEX_ID_PATTERN = re.compile(rb'(?:paraId|textId|durableId)="([0-9A-Fa-f]{8})"')
+# Parts whose hex IDs are indexed when a Document first needs a new one
+_HEX_ID_PARTS = (
+    "word/document.xml",
+    "word/comments.xml",
+    "word/commentsExtended.xml",
+    "word/commentsIds.xml",
+    "word/commentsExtensible.xml",
+)
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -54,10 +104,17 @@ class DocxXMLEditor(XMLEditor):
 
     Attributes:
         dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+        hex_ids: Registry handing out unused w14:paraId and w14:textId values
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        engine: Optional[str] = None,
+        hex_ids: Optional["_HexIdRegistry"] = None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,52 +123,67 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            engine: Position-tracking engine, "scan" or "sax" (default: the
+                OOXML_XML_ENGINE environment variable, else "scan")
+            hex_ids: ID registry shared with the other parts of the package
+                (default: one that knows the IDs in this file)
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, engine=engine)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self.hex_ids = hex_ids or _HexIdRegistry(
+            lambda: _hex_ids_in(self.xml_path.read_bytes())
+        )
+        self._change_ids = None
+        self._checkpoint_change_id = None
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Allocate the next tracked change ID.
+
+        The first call reads the existing w:ins and w:del elements from the
+        tag index (shared with get_node); later calls are O(1).
+        """
+        if self._change_ids is None:
+            if not self._editing:
+                self._sync_indexes()
+            self._change_ids = _IdAllocator(
+                [*self._tag_lookup("w:ins"), *self._tag_lookup("w:del")]
+            )
+        return self._change_ids.allocate()
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16du"):  # type: ignore
+            self._record(root)
             root.setAttribute(  # type: ignore
                 "xmlns:w16du",
                 "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
             )
+            self._mark_attributes_changed([root])
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
+            self._record(root)
             root.setAttribute(  # type: ignore
                 "xmlns:w16cex",
                 "http://schemas.microsoft.com/office/word/2018/wordml/cex",
             )
+            self._mark_attributes_changed([root])
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w14"):  # type: ignore
+            self._record(root)
             root.setAttribute(  # type: ignore
                 "xmlns:w14",
                 "http://schemas.microsoft.com/office/word/2010/wordml",
             )
+            self._mark_attributes_changed([root])
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -124,6 +196,10 @@ class DocxXMLEditor(XMLEditor):
         - w:comment: gets w:author, w:date, w:initials
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
+        Each node's elements are visited in one depth-first pass that tracks
+        whether it is inside a w:del, so the cost is linear in the inserted
+        size.
+
         Args:
             nodes: List of DOM nodes to process
         """
@@ -150,14 +226,16 @@ class DocxXMLEditor(XMLEditor):
             # Add w14:paraId and w14:textId if not present
             if not elem.hasAttribute("w14:paraId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
+                elem.setAttribute("w14:paraId", self.hex_ids.allocate())
+            else:
+                self.hex_ids.observe(elem.getAttribute("w14:paraId"))
             if not elem.hasAttribute("w14:textId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+                elem.setAttribute("w14:textId", self.hex_ids.allocate())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, in_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if in_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -168,6 +246,9 @@ class DocxXMLEditor(XMLEditor):
             # Auto-assign w:id if not present
             if not elem.hasAttribute("w:id"):
                 elem.setAttribute("w:id", str(self._get_next_change_id()))
+            elif self._change_ids is not None:
+                # Keep explicit IDs from being handed out again
+                self._change_ids.observe(elem.getAttribute("w:id"))
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
@@ -204,63 +285,108 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:t": add_xml_space_to_t,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
             # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
+            in_deletion = is_inside_deletion(node)
+            if node.tagName == "w:r":
+                add_rsid_to_r(node, in_deletion)
             elif node.tagName in ("w:ins", "w:del"):
                 add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
+            elif node.tagName in handlers:
+                handlers[node.tagName](node)
+
+            # Process descendants. Tracked changes are numbered after the
+            # traversal, insertions before deletions, as they always have been
+            insertions = []
+            deletions = []
+            in_deletion = in_deletion or node.tagName == "w:del"
+            stack = [(child, in_deletion) for child in reversed(node.childNodes)]
+            while stack:
+                elem, in_deletion = stack.pop()
+                if elem.nodeType != elem.ELEMENT_NODE:
+                    continue
+                tag = elem.tagName
+                if tag == "w:r":
+                    add_rsid_to_r(elem, in_deletion)
+                elif tag == "w:ins":
+                    insertions.append(elem)
+                elif tag == "w:del":
+                    deletions.append(elem)
+                    in_deletion = True
+                elif tag in handlers:
+                    handlers[tag](elem)
+                stack.extend(
+                    (child, in_deletion) for child in reversed(elem.childNodes)
+                )
+            for elem in insertions + deletions:
+                add_tracked_change_attrs(elem)
 
+    @_edit_method
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
         nodes = super().replace_node(elem, new_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_edit_method
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
         nodes = super().insert_after(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_edit_method
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
         nodes = super().insert_before(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_edit_method
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
         nodes = super().append_to(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_edit_method
+    def _commit_batch(self, edits):
+        """Apply a batch, then inject attributes into all new nodes at once."""
+        nodes = super()._commit_batch(edits)
+        self._inject_attributes_to_nodes(nodes)
+        return nodes
+
+    def checkpoint(self):
+        """Mark the current state as the one rollback() returns to.
+
+        Tracked change IDs handed out after the checkpoint are reused after a
+        rollback. See XMLEditor.checkpoint().
+        """
+        super().checkpoint()
+        self._checkpoint_change_id = (
+            None if self._change_ids is None else self._change_ids.next_id
+        )
+
+    @_edit_method
+    def rollback(self):
+        """Undo the edits made since the last checkpoint(). See XMLEditor.rollback()."""
+        super().rollback()
+        if self._checkpoint_change_id is None:
+            self._change_ids = None
+        else:
+            self._change_ids.next_id = self._checkpoint_change_id  # type: ignore
+
+    @_edit_method
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -299,6 +425,8 @@ class DocxXMLEditor(XMLEditor):
                 f"The provided element <{elem.tagName}> contains no insertions. "
             )
 
+        self._record(elem, deep=True)
+
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
             runs = list(ins_elem.getElementsByTagName("w:r"))
@@ -306,7 +434,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
 
             # Process each run
             for run in runs:
@@ -318,7 +446,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
                 for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
+                    del_text = self._dom.createElement("w:delText")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while t_elem.firstChild:
                         del_text.appendChild(t_elem.firstChild)
@@ -333,12 +461,14 @@ class DocxXMLEditor(XMLEditor):
 
             # Add del wrapper back to ins
             ins_elem.appendChild(del_wrapper)
+            self._mark_changed([del_wrapper])
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
         return [elem]
 
+    @_edit_method
     def revert_deletion(self, elem):
         """Reject a deletion by re-inserting the deleted content.
 
@@ -391,7 +521,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._dom.createElement("w:ins")
 
             for run in runs:
                 # Clone the run
@@ -399,7 +529,7 @@ class DocxXMLEditor(XMLEditor):
 
                 # Convert w:delText → w:t
                 for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
+                    t_elem = self._dom.createElement("w:t")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while del_text.firstChild:
                         t_elem.appendChild(del_text.firstChild)
@@ -417,8 +547,10 @@ class DocxXMLEditor(XMLEditor):
 
                 ins_elem.appendChild(new_run)
 
-            # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            # Insert the new insertion after the deletion (now, even in a batch,
+            # since the new node is returned)
+            with self._unbatched():
+                nodes = self.insert_after(del_elem, ins_elem.toxml())
 
             # If processing a single w:del, track the created insertion
             if is_single_del and nodes:
@@ -430,6 +562,257 @@ class DocxXMLEditor(XMLEditor):
         else:
             return [elem]
 
+    @_edit_method
+    def accept_changes(self, author=None, since=None, until=None):
+        """Accept tracked insertions and deletions in bulk, removing their markup.
+
+        Matching insertions are unwrapped and matching deletions removed, in
+        one pass over the changes: each element that loses or gains children
+        is rewritten once, however many changes it holds. A deleted paragraph
+        mark merges the paragraph's content into the following paragraph,
+        and a deleted table row is removed. Accepting is not itself tracked.
+
+        Args:
+            author: Only accept changes by this author (default: any author)
+            since: Only accept changes dated at or after this (ISO 8601 string
+                   or datetime; changes without a date are then skipped)
+            until: Only accept changes dated at or before this
+
+        Returns:
+            dict: Numbers of "insertions" and "deletions" accepted
+
+        Raises:
+            ValueError: If since or until is not a valid date
+
+        Example:
+            editor.accept_changes(author="Jane Smith")
+            editor.accept_changes(since="2024-03-01", until="2024-03-31T23:59:59Z")
+        """
+        changes = self._select_changes(author, since, until)
+        with _gc_paused():
+            return self._resolve_changes(changes, accept=True)
+
+    @_edit_method
+    def reject_changes(self, author=None, since=None, until=None, tracked=True):
+        """Reject tracked insertions and deletions in bulk.
+
+        With tracked=True (the default), every matching change is rejected the
+        way revert_insertion() and revert_deletion() do it, as tracked changes
+        by this editor's author: inserted runs are wrapped in w:del and deleted
+        runs are re-inserted after their w:del. With tracked=False, the changes
+        are resolved instead: insertions are removed and deleted text is
+        restored, as Word's Reject does.
+
+        Either way the changes are rewritten in one pass: each element that
+        gains or loses children is rewritten once, and each change's subtree
+        is walked once.
+
+        Args:
+            author: Only reject changes by this author (default: any author)
+            since: Only reject changes dated at or after this (ISO 8601 string
+                   or datetime; changes without a date are then skipped)
+            until: Only reject changes dated at or before this
+            tracked: If True, record the rejection as tracked changes
+
+        Returns:
+            dict: Numbers of "insertions" and "deletions" rejected
+
+        Raises:
+            ValueError: If since or until is not a valid date
+
+        Example:
+            # Reject everything Jane Smith changed, as tracked changes
+            editor.reject_changes(author="Jane Smith")
+        """
+        changes = self._select_changes(author, since, until)
+        with _gc_paused():
+            if not tracked:
+                return self._resolve_changes(changes, accept=False)
+            return self._reject_tracked(changes)
+
+    def _reject_tracked(self, changes):
+        """Reject changes as tracked changes by this editor's author."""
+        counts = {"insertions": 0, "deletions": 0}
+        created = []  # New w:del and w:ins elements
+        insertions = {}  # Parent -> {w:del: w:ins that follows it}
+        for elem in changes:
+            if elem.tagName == "w:ins":
+                found = _descendants_by_tag(elem, ("w:r", "w:t"))
+                if not found["w:r"]:
+                    continue  # Property markers, as in revert_insertion/deletion
+                counts["insertions"] += 1
+                self._record(elem, deep=True)
+                for t_elem in found["w:t"]:
+                    _retag(self._dom, t_elem, "w:delText")
+                for run in found["w:r"]:
+                    _rename_attribute(run, "w:rsidR", "w:rsidDel", self.rsid)
+                del_wrapper = self._dom.createElement("w:del")
+                _replace_children(del_wrapper, list(elem.childNodes))
+                _replace_children(elem, [del_wrapper])
+                created.append(del_wrapper)
+            else:
+                runs = _descendants_by_tag(elem, ("w:r",))["w:r"]
+                if not runs:
+                    continue
+                counts["deletions"] += 1
+                ins_elem = self._dom.createElement("w:ins")
+                for run in runs:
+                    new_run = run.cloneNode(True)
+                    for del_text in _descendants_by_tag(new_run, ("w:delText",))[
+                        "w:delText"
+                    ]:
+                        _preserve_space(_retag(self._dom, del_text, "w:t"))
+                    _rename_attribute(new_run, "w:rsidDel", "w:rsidR", self.rsid)
+                    ins_elem.appendChild(new_run)
+                insertions.setdefault(elem.parentNode, {})[elem] = ins_elem
+                created.append(ins_elem)
+
+        for parent, following in insertions.items():
+            self._record(parent)
+            children = []
+            for child in parent.childNodes:
+                children.append(child)
+                if child in following:
+                    children.append(following[child])
+            _replace_children(parent, children)
+
+        if created:
+            # The new changes' runs and text are complete, so only the
+            # wrappers need attributes (as _inject_attributes_to_nodes adds)
+            self._ensure_w16du_namespace()
+            timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            for wrapper in created:
+                wrapper.setAttributeNS(None, "w:id", str(self._get_next_change_id()))
+                wrapper.setAttributeNS(None, "w:author", self.author)
+                wrapper.setAttributeNS(None, "w:date", timestamp)
+                wrapper.setAttributeNS(None, "w16du:dateUtc", timestamp)
+            self._mark_changed(created)
+        return counts
+
+    def _select_changes(self, author, since, until):
+        """Find the w:ins and w:del elements matching an author and date range."""
+        since = _change_date(since, "since") if since is not None else None
+        until = _change_date(until, "until") if until is not None else None
+        selected = []
+        for tag in ("w:ins", "w:del"):
+            for elem in self.find_all(f"//{tag}"):
+                if author is not None and elem.getAttribute("w:author") != author:
+                    continue
+                if since is not None or until is not None:
+                    try:
+                        date = _change_date(elem.getAttribute("w:date"), "w:date")
+                    except ValueError:
+                        continue
+                    if (since is not None and date < since) or (
+                        until is not None and date > until
+                    ):
+                        continue
+                selected.append(elem)
+        return selected
+
+    def _resolve_changes(self, changes, accept):
+        """Accept or reject changes without tracking, rewriting each parent once."""
+        counts = {"insertions": 0, "deletions": 0}
+        plan = {}  # Element -> "unwrap" (keep its content) or "remove"
+        merged = []  # Paragraphs whose paragraph mark goes away
+        for elem in changes:
+            inserted = elem.tagName == "w:ins"
+            counts["insertions" if inserted else "deletions"] += 1
+            keep = inserted == accept
+            parent = elem.parentNode
+            if parent.tagName == "w:trPr" and not keep:
+                plan[parent.parentNode] = "remove"  # The table row
+            elif parent.tagName == "w:rPr" or parent.tagName == "w:trPr":
+                # Marker on a paragraph mark, run or row
+                plan[elem] = "remove"
+                holder = parent.parentNode
+                if not keep and holder.tagName == "w:pPr":
+                    merged.append(holder.parentNode)
+            else:
+                plan[elem] = "unwrap" if keep else "remove"
+        if not plan:
+            return counts
+
+        # Deleted text that stays becomes normal text again
+        created = []
+        restored_runs = []
+        for elem, action in plan.items():
+            if action != "unwrap" or elem.tagName != "w:del":
+                continue
+            for run in elem.getElementsByTagName("w:r"):
+                restored_runs.append(run)
+                self._record(run, deep=True)
+                for tag, restored in _RESTORED_TEXT.items():
+                    for text_elem in list(run.getElementsByTagName(tag)):
+                        created.append(_retag(self._dom, text_elem, restored))
+                if run.hasAttribute("w:rsidDel"):
+                    if not run.hasAttribute("w:rsidR"):
+                        run.setAttribute("w:rsidR", run.getAttribute("w:rsidDel"))
+                    run.removeAttribute("w:rsidDel")
+
+        def expand(node):
+            children = []
+            for child in node.childNodes:
+                action = plan.get(child)
+                if action is None:
+                    children.append(child)
+                elif action == "unwrap":
+                    children.extend(expand(child))
+            return children
+
+        parents = {elem.parentNode: None for elem in plan if elem.parentNode not in plan}
+        for elem in plan:
+            self._record(elem)
+        for parent in parents:
+            self._record(parent)
+            _replace_children(parent, expand(parent))
+        for elem, action in plan.items():
+            if action == "unwrap":
+                elem.childNodes[:] = []  # Its children have moved up
+
+        self._merge_paragraphs(merged)
+        self._mark_changed(created)
+        self._mark_attributes_changed(restored_runs)
+        return counts
+
+    def _merge_paragraphs(self, paragraphs):
+        """Move each paragraph's content into the next paragraph and drop it.
+
+        This is what removing a paragraph mark does. The merged paragraph keeps
+        the properties of the following one. A paragraph not followed by
+        another (e.g. the last one before a table) is left in place.
+        """
+        merging = set()
+        for paragraph in paragraphs:
+            following = paragraph.nextSibling
+            while following is not None and following.nodeType != following.ELEMENT_NODE:
+                following = following.nextSibling
+            if following is not None and following.tagName == "w:p":
+                merging.add(paragraph)
+
+        for parent in {paragraph.parentNode: None for paragraph in merging}:
+            self._record(parent)
+            children = []
+            carried = []
+            for child in parent.childNodes:
+                if child in merging:
+                    self._record(child)
+                    content = [c for c in child.childNodes if c.nodeName != "w:pPr"]
+                    carried.extend(content)
+                    _replace_children(
+                        child, [c for c in child.childNodes if c.nodeName == "w:pPr"]
+                    )
+                    continue
+                if carried and child.nodeName == "w:p":
+                    self._record(child)
+                    content = list(child.childNodes)
+                    properties = [c for c in content if c.nodeName == "w:pPr"]
+                    rest = [c for c in content if c.nodeName != "w:pPr"]
+                    _replace_children(child, properties + carried + rest)
+                    carried = []
+                children.append(child)
+            _replace_children(parent, children)
+
     @staticmethod
     def suggest_paragraph(xml_content: str) -> str:
         """Transform paragraph XML to add tracked change wrapping for insertion.
@@ -479,6 +862,7 @@ class DocxXMLEditor(XMLEditor):
 
         return para.toxml()
 
+    @_edit_method
     def suggest_deletion(self, elem):
         """Mark a w:r or w:p element as deleted with tracked changes (in-place DOM manipulation).
 
@@ -499,10 +883,12 @@ class DocxXMLEditor(XMLEditor):
             # Check for existing w:delText
             if elem.getElementsByTagName("w:delText"):
                 raise ValueError("w:r element already contains w:delText")
+            self._record(elem.parentNode)
+            self._record(elem, deep=True)
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -520,11 +906,12 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             parent = elem.parentNode
             parent.insertBefore(del_wrapper, elem)
             parent.removeChild(elem)
             del_wrapper.appendChild(elem)
+            self._mark_changed([del_wrapper])
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
@@ -535,6 +922,7 @@ class DocxXMLEditor(XMLEditor):
             # Check for existing tracked changes
             if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
                 raise ValueError("w:p element already contains tracked changes")
+            self._record(elem, deep=True)
 
             # Check if it's a numbered list item
             pPr_list = elem.getElementsByTagName("w:pPr")
@@ -546,23 +934,24 @@ class DocxXMLEditor(XMLEditor):
                 rPr_list = pPr.getElementsByTagName("w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
+                    rPr = self._dom.createElement("w:rPr")
                     pPr.appendChild(rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
+                del_marker = self._dom.createElement("w:del")
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
+                self._mark_changed([rPr])
 
                 # Inject attributes into the marker
                 self._inject_attributes_to_nodes([del_marker])
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -581,11 +970,12 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
                 elem.removeChild(child)
                 del_wrapper.appendChild(child)
             elem.appendChild(del_wrapper)
+            self._mark_changed([del_wrapper])
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
@@ -595,6 +985,429 @@ class DocxXMLEditor(XMLEditor):
         else:
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
+    def paragraph_text(self, paragraph):
+        """Return the plain text of a paragraph, as suggest_text() compares it.
+
+        Tabs are returned as "\t" and line breaks as "\n". Unlike get_node()
+        matching, whitespace-only text in w:t is kept.
+
+        Args:
+            paragraph: A w:p element
+
+        Returns:
+            str: The paragraph's text
+
+        Raises:
+            ValueError: If the paragraph contains content suggest_text() cannot
+                rewrite (see suggest_text_changes())
+        """
+        return "".join(text for _, text in self._text_runs(paragraph))
+
+    def suggest_text(self, paragraph, new_text):
+        """Redline a paragraph so that its text becomes new_text.
+
+        See suggest_text_changes(), which does the same for many paragraphs.
+
+        Args:
+            paragraph: A w:p element without tracked changes
+            new_text: The paragraph's new plain text
+
+        Returns:
+            Element: The paragraph
+
+        Example:
+            para = doc["word/document.xml"].get_node(tag="w:p", contains="30 days")
+            doc["word/document.xml"].suggest_text(para, "Payment is due within 45 days.")
+        """
+        return self.suggest_text_changes([(paragraph, new_text)])[0]
+
+    def suggest_text_changes(self, changes):
+        """Redline many paragraphs to new plain text in one pass.
+
+        The words, whitespace and punctuation of each paragraph's text are
+        diffed against its new text, and only the tokens that differ become
+        tracked changes: removed text is wrapped in w:del, and new text in
+        w:ins with the run properties of the text before it. Runs without
+        changes are left untouched. All paragraphs are checked before
+        anything is changed, and the rewritten runs are applied in a single
+        batch(), so the cost is linear in the size of the changed paragraphs.
+
+        Paragraphs may contain text runs (directly or in w:hyperlink) with
+        w:t, w:tab ("\t" in plain text) and w:br or w:cr ("\n"), as well as
+        markers such as bookmarks and comment ranges, which are kept.
+
+        Args:
+            changes: Iterable of (paragraph, new_text) pairs, or a dict mapping
+                w:p elements to their new text
+
+        Returns:
+            List of the paragraphs, in order
+
+        Raises:
+            ValueError: If an element is not a w:p of this document or is given
+                twice, or a paragraph contains tracked changes or other content
+                (fields, drawings, page breaks, ...)
+
+        Example:
+            editor = doc["word/document.xml"]
+            changes = {}
+            for para in editor.find_text("w:p", ["30 days"])["30 days"]:
+                text = editor.paragraph_text(para)
+                changes[para] = text.replace("30 days", "45 days")
+            editor.suggest_text_changes(changes)
+        """
+        if isinstance(changes, dict):
+            changes = changes.items()
+        changes = list(changes)
+        seen = set()
+        plans = []
+        for i, (paragraph, new_text) in enumerate(changes):
+            if paragraph in seen:
+                raise ValueError(f"Change {i}: the paragraph is given twice")
+            seen.add(paragraph)
+            if not isinstance(new_text, str):
+                raise ValueError(f"Change {i}: new text must be a string")
+            try:
+                plans.append((paragraph, self._text_runs(paragraph), new_text))
+            except ValueError as e:
+                raise ValueError(f"Change {i}: {e}") from None
+
+        with self.batch():
+            for paragraph, runs, new_text in plans:
+                for run, xml in _redline_runs(runs, new_text):
+                    if run is None:
+                        self.append_to(paragraph, xml)
+                    else:
+                        self.replace_node(run, xml)
+        return [paragraph for paragraph, _ in changes]
+
+    def _text_runs(self, paragraph):
+        """The runs of a paragraph, in order, with the plain text of each.
+
+        Raises:
+            ValueError: If suggest_text() cannot rewrite the paragraph
+        """
+        if getattr(paragraph, "tagName", None) != "w:p" or not self._is_attached(
+            paragraph
+        ):
+            raise ValueError("Not a w:p element of this document")
+        if paragraph.getElementsByTagName("w:ins") or paragraph.getElementsByTagName(
+            "w:del"
+        ):
+            raise ValueError("w:p element already contains tracked changes")
+
+        runs = []
+        for run in paragraph.getElementsByTagName("w:r"):
+            if run.parentNode.tagName not in _RUN_PARENTS:
+                raise ValueError(f"Cannot rewrite runs inside <{run.parentNode.tagName}>")
+            parts = []
+            for child in run.childNodes:
+                if child.nodeType != child.ELEMENT_NODE or child.tagName in _RUN_IGNORED:
+                    continue
+                if child.tagName not in _RUN_TEXT or child.getAttribute("w:type") not in (
+                    "",
+                    "textWrapping",
+                ):
+                    raise ValueError(f"Cannot rewrite a run containing <{child.tagName}>")
+                if child.tagName == "w:t":
+                    parts.extend(
+                        node.data
+                        for node in child.childNodes
+                        if node.nodeType == node.TEXT_NODE
+                    )
+                else:
+                    parts.append(_RUN_TEXT[child.tagName])
+            runs.append((run, "".join(parts)))
+        return runs
+
+
+def _redline_runs(runs, new_text):
+    """
+    Work out the runs to rewrite so that their text becomes new_text.
+
+    Args:
+        runs: List of (run, text) pairs, as returned by _text_runs()
+        new_text: The new plain text
+
+    Returns:
+        List of (run, xml) pairs: each run is replaced by the xml, in which kept
+        text stays in copies of the run, deleted text is in w:del and inserted
+        text in w:ins. A run of None means the xml is appended to the paragraph,
+        which has no runs.
+    """
+    old_text = "".join(text for _, text in runs)
+    if old_text == new_text:
+        return []
+    if not runs:
+        return [(None, _run_xml("ins", "", "", new_text))]
+
+    old_tokens = _TOKEN_PATTERN.findall(old_text)
+    new_tokens = _TOKEN_PATTERN.findall(new_text)
+    old_offsets = list(itertools.accumulate(map(len, old_tokens), initial=0))
+    new_offsets = list(itertools.accumulate(map(len, new_tokens), initial=0))
+
+    # Deleted character ranges of the old text, and text inserted at old offsets
+    cuts = {0, len(old_text)}
+    deleted = bytearray(len(old_text))
+    inserted = {}
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        start, end = old_offsets[i1], old_offsets[i2]
+        deleted[start:end] = b"\x01" * (end - start)
+        if j2 > j1:
+            inserted[end] = new_text[new_offsets[j1] : new_offsets[j2]]
+        cuts.update((start, end))
+    cuts = sorted(cuts)
+
+    edits = []
+    start = 0
+    for index, (run, text) in enumerate(runs):
+        end = start + len(text)
+        pieces = []
+        if index == 0 and 0 in inserted:
+            pieces.append(("ins", inserted[0]))
+        # Segments between cuts are either kept or deleted as a whole
+        i = bisect.bisect_right(cuts, start)
+        bounds = [start] + [cut for cut in cuts[i:] if cut < end] + [end]
+        for a, b in zip(bounds, bounds[1:]):
+            if a == b:
+                continue
+            kind = "del" if deleted[a] else "keep"
+            if pieces and pieces[-1][0] == kind:
+                pieces[-1] = (kind, pieces[-1][1] + old_text[a:b])
+            else:
+                pieces.append((kind, old_text[a:b]))
+            # Insertions go after the text that precedes them
+            if b in inserted and b > 0:
+                pieces.append(("ins", inserted[b]))
+        start = end
+
+        if all(kind == "keep" for kind, _ in pieces):
+            continue
+        rpr = run.getElementsByTagName("w:rPr")
+        rpr = rpr[0].toxml() if rpr and rpr[0].parentNode is run else ""
+        attrs = "".join(
+            f' {name}="{html.escape(value)}"' for name, value in run.attributes.items()
+        )
+        edits.append(
+            (run, "".join(_run_xml(kind, attrs, rpr, text) for kind, text in pieces))
+        )
+    return edits
+
+
+def _run_xml(kind, attrs, rpr, text):
+    """Build a kept ("keep"), deleted ("del") or inserted ("ins") run holding text.
+
+    Kept runs keep the original run's attributes; DocxXMLEditor adds RSIDs and
+    xml:space on w:t to the others.
+    """
+    tag = "w:delText" if kind == "del" else "w:t"
+    content = []
+    for part in re.split(r"(\t|\n)", text):
+        if part == "\t":
+            content.append("<w:tab/>")
+        elif part == "\n":
+            content.append("<w:br/>")
+        elif part:
+            space = ' xml:space="preserve"' if part != part.strip() else ""
+            content.append(f"<{tag}{space}>{html.escape(part, quote=False)}</{tag}>")
+    if kind == "keep":
+        return f"<w:r{attrs}>{rpr}{''.join(content)}</w:r>"
+    return f"<w:{kind}><w:r>{rpr}{''.join(content)}</w:r></w:{kind}>"
+
+
+def _replace_children(parent, children):
+    """Give a node a new list of children, relinking them in one pass.
+
+    Repeated insertBefore()/removeChild() calls search the sibling list every
+    time; this costs one pass over the old and new children. Children taken
+    from another node must not stay in that node's childNodes (callers clear
+    or replace that list).
+    """
+    for child in parent.childNodes:
+        if child.parentNode is parent:
+            child.parentNode = child.previousSibling = child.nextSibling = None
+    for previous, child in zip([None, *children], children):
+        child.parentNode = parent
+        child.previousSibling = previous
+        if previous is not None:
+            previous.nextSibling = child
+    if children:
+        children[-1].nextSibling = None
+    parent.childNodes[:] = children
+
+
+def _fill_template_copies(nodes, values):
+    """Set the empty attributes of inserted template copies (one dict per copy)."""
+    # Templates begin and end with a tag, so copies do not merge text nodes
+    per_copy = len(nodes) // len(values)
+    for i, copy_values in enumerate(values):
+        for node in nodes[i * per_copy : (i + 1) * per_copy]:
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for elem in [node, *node.getElementsByTagName("*")]:
+                for name, value in copy_values.items():
+                    if elem.hasAttribute(name) and not elem.getAttribute(name):
+                        elem.setAttribute(name, str(value))
+
+
+def _retag(dom, elem, tag):
+    """Replace an element by one with another tag, the same attributes and children."""
+    new_elem = dom.createElement(tag)
+    for attr in elem.attributes.values():
+        # Much cheaper than setAttribute(), which looks the local name up again
+        new_elem.setAttributeNS(attr.namespaceURI, attr.name, attr.value)
+    _replace_children(new_elem, list(elem.childNodes))
+    elem.childNodes[:] = []
+    elem.parentNode.replaceChild(new_elem, elem)
+    return new_elem
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while a bulk edit allocates many nodes.
+
+    Every node links to its parent, so each full collection walks the whole
+    DOM; pausing avoids repeated collections that would free nothing.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _descendants_by_tag(node, tags):
+    """Collect a node's descendant elements with the given tags, in one walk.
+
+    Returns:
+        dict: Tag -> elements in document order
+    """
+    found = {tag: [] for tag in tags}
+    stack = list(reversed(node.childNodes))
+    while stack:
+        child = stack.pop()
+        if child.nodeType == child.ELEMENT_NODE:
+            if child.tagName in found:
+                found[child.tagName].append(child)
+            stack.extend(reversed(child.childNodes))
+    return found
+
+
+def _rename_attribute(elem, old, new, default):
+    """Move an attribute's value to another name, or set the new one to default."""
+    if elem.hasAttribute(old):
+        elem.setAttributeNS(None, new, elem.getAttribute(old))
+        elem.removeAttribute(old)
+    elif not elem.hasAttribute(new):
+        elem.setAttributeNS(None, new, default)
+
+
+def _preserve_space(t_elem):
+    """Add xml:space="preserve" to a w:t whose text starts or ends with whitespace."""
+    text = t_elem.firstChild
+    if (
+        text is not None
+        and text.nodeType == text.TEXT_NODE
+        and text.data
+        and (text.data[0].isspace() or text.data[-1].isspace())
+        and not t_elem.hasAttribute("xml:space")
+    ):
+        t_elem.setAttribute("xml:space", "preserve")
+
+
+def _change_date(value, name):
+    """Parse an ISO 8601 date or datetime for comparing change dates (UTC if naive)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"Invalid {name} date: {value!r}")
+    if not isinstance(value, datetime):
+        raise ValueError(f"Invalid {name} date: {value!r}")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class _IdAllocator:
+    """Monotonic allocator for numeric w:id values.
+
+    Seeded from the IDs already in use; IDs that are assigned explicitly later
+    should be passed to observe() so they are never handed out again.
+    """
+
+    def __init__(self, elements=(), attr="w:id"):
+        self.next_id = 0
+        for elem in elements:
+            self.observe(elem.getAttribute(attr))
+
+    def observe(self, value):
+        """Account for an ID that is in use."""
+        try:
+            self.next_id = max(self.next_id, int(value) + 1)
+        except (TypeError, ValueError):
+            pass
+
+    def allocate(self) -> int:
+        """Return an unused ID."""
+        value = self.next_id
+        self.next_id += 1
+        return value
+
+
+class _HexIdRegistry:
+    """Allocator for random 8-digit hex IDs (paraId, textId, durableId).
+
+    The IDs already in use are collected by the seed function the first time
+    the registry is used; after that, allocating an ID that is guaranteed
+    unused and recording one assigned elsewhere are both O(1).
+    """
+
+    def __init__(self, seed=None):
+        self._seed = seed
+        self._used = None
+
+    def _ids(self):
+        if self._used is None:
+            self._used = set(self._seed()) if self._seed else set()
+        return self._used
+
+    def observe(self, value):
+        """Account for an ID that is in use."""
+        self._ids().add(value.upper())
+
+    def allocate(self) -> str:
+        """Return a random ID that is not in use."""
+        used = self._ids()
+        value = _generate_hex_id()
+        while value in used:
+            value = _generate_hex_id()
+        used.add(value)
+        return value
+
+
+def _hex_ids_in(content):
+    """Return the paraId, textId and durableId values in an XML part's bytes."""
+    return [value.decode().upper() for value in _HEX_ID_PATTERN.findall(content)]
+
+
+def _pack_xml_parts(input_dir, output_file):
+    """Store the XML parts of an unpacked directory, as-is, in a .docx.
+
+    Meant for validation baselines only: validators parse these parts and
+    compare error messages, which do not depend on formatting.
+    """
+    input_dir = Path(input_dir)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_STORED) as zf:
+        for path in sorted(input_dir.rglob("*")):
+            if path.is_file() and path.name.endswith(XML_SUFFIXES):
+                zf.write(path, path.relative_to(input_dir).as_posix())
+
 
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
@@ -625,31 +1438,45 @@ class Document:
     ):
         """
         Initialize with path to unpacked Word document directory.
-        Automatically sets up comment infrastructure (people.xml, RSIDs).
+        Comment infrastructure (people.xml, RSIDs) is set up when saving.
+
+        The document is opened through a copy-on-write PackageWorkspace: parts
+        are copied (or, for a .docx file, extracted) only when first opened, and
+        editors are created on first use, so opening is cheap regardless of
+        the document's size. A .docx file or PackageWorkspace can be given
+        instead of a directory; media then stays inside the archive and save()
+        packs straight back to a .docx.
 
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory),
+                or a .docx file / PackageWorkspace to edit without unpacking
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
         """
-        self.original_path = Path(unpacked_dir)
-
-        if not self.original_path.exists() or not self.original_path.is_dir():
-            raise ValueError(f"Directory not found: {unpacked_dir}")
-
-        # Create temporary directory with subdirectories for unpacked content and baseline
-        self.temp_dir = tempfile.mkdtemp(prefix="docx_")
-        self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
-
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        self.workspace = None
+        self._owns_workspace = False
 
+        if isinstance(unpacked_dir, PackageWorkspace):
+            self.workspace = unpacked_dir
+        else:
+            if Path(unpacked_dir).suffix.lower() == ".docx":
+                if not Path(unpacked_dir).is_file():
+                    raise ValueError(f"File not found: {unpacked_dir}")
+            elif not Path(unpacked_dir).is_dir():
+                raise ValueError(f"Directory not found: {unpacked_dir}")
+            self.workspace = PackageWorkspace(unpacked_dir)
+            self._owns_workspace = True
+
+        # Edits land in the workspace root; the original is only read
+        self.original_path = self.workspace.source
+        self.unpacked_path = self.workspace.root
         self.word_path = self.unpacked_path / "word"
 
+        # Validation baseline, packed on first use for directory sources
+        self._original_docx = None
+
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
         print(f"Using RSID: {self.rsid}")
@@ -657,6 +1484,7 @@ class Document:
         # Set default author and initials
         self.author = author
         self.initials = initials
+        self.track_revisions = track_revisions
 
         # Cache for lazy-loaded editors
         self._editors = {}
@@ -667,18 +1495,56 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
-        self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
+        # Existing comments and the comment ID allocator, loaded on first use
+        self._existing_comments = None
+        self._comment_id_allocator = None
+
+        # paraId/textId/durableId values of all editors, indexed on first use
+        self._hex_ids = _HexIdRegistry(self._scan_hex_ids)
+
+        # Whether _setup_tracking() and _add_author_to_people() have run
+        self._setup_done = False
+
+        # State to return to on rollback(), or None without a checkpoint
+        self._checkpoint = None
 
-        # Convenient access to document.xml editor (semi-private)
-        self._document = self["word/document.xml"]
+    @property
+    def existing_comments(self) -> dict:
+        """Comments already in the document by ID, loaded on first access."""
+        if self._existing_comments is None:
+            self._existing_comments = self._load_existing_comments()
+        return self._existing_comments
 
-        # Setup tracked changes infrastructure
-        self._setup_tracking(track_revisions=track_revisions)
+    @property
+    def _comment_ids(self) -> "_IdAllocator":
+        """Comment ID allocator, seeded from comments.xml on first use."""
+        if self._comment_id_allocator is None:
+            self._comment_id_allocator = self._create_comment_id_allocator()
+        return self._comment_id_allocator
 
-        # Add author to people.xml
-        self._add_author_to_people(author)
+    @property
+    def _document(self) -> DocxXMLEditor:
+        """Convenient access to the document.xml editor (semi-private)."""
+        return self["word/document.xml"]
+
+    @property
+    def original_docx(self) -> Path:
+        """
+        The unmodified document as a .docx, used as the validation baseline.
+
+        This is the source file when the document was opened from a .docx, or
+        a link to (or copy of) it once save() has replaced it. For a directory,
+        its XML parts are packed on first access (validators read nothing else
+        from the baseline).
+        """
+        if self._original_docx is None:
+            if self.original_path.is_dir():
+                self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+                self._original_docx = Path(self.temp_dir) / "original.docx"
+                _pack_xml_parts(self.original_path, self._original_docx)
+            else:
+                self._original_docx = self.original_path
+        return self._original_docx
 
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
@@ -704,13 +1570,20 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if not self.workspace.exists(xml_path):  # type: ignore
                 raise ValueError(f"XML file not found: {xml_path}")
+            file_path = self.workspace / xml_path  # type: ignore
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                hex_ids=self._hex_ids,
             )
+            if self._checkpoint is not None:
+                # Unchanged since the checkpoint, as it was not open yet
+                self._editors[xml_path].checkpoint()
         return self._editors[xml_path]
 
     def add_comment(self, start, end, text: str) -> int:
@@ -730,40 +1603,68 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self.add_comments([{"start": start, "end": end, "text": text}])[0]
 
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+    def add_comments(self, comments) -> List[int]:
+        """
+        Add several comments at once.
 
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+        All anchors are checked before anything is changed. IDs are allocated
+        in order, and each comments part receives its new entries as a single
+        fragment, which makes this much faster than repeated add_comment()
+        calls for hundreds of comments.
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Args:
+            comments: Iterable of dicts with "start", "end" and "text" keys, as
+                taken by add_comment()
 
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
+        Returns:
+            List of the comment IDs that were created, in order
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        Raises:
+            ValueError: If an entry lacks a key or an anchor is not an element
+                of word/document.xml
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        Example:
+            ids = doc.add_comments([
+                {"start": node1, "end": node1, "text": "Unclear wording"},
+                {"start": node2, "end": node3, "text": "Needs a citation"},
+            ])
+        """
+        comments = list(comments)
+        for i, comment in enumerate(comments):
+            if not isinstance(comment.get("text"), str):
+                raise ValueError(f"Comment {i} has no text")
+            for key in ("start", "end"):
+                node = comment.get(key)
+                if node is None or not self._document._is_attached(node):
+                    raise ValueError(
+                        f"Comment {i}: {key} is not an element of word/document.xml"
+                    )
+
+        entries = [self._new_comment_entry(c["text"]) for c in comments]
+
+        # Add comment ranges to document.xml
+        for comment, entry in zip(comments, entries):
+            start, end = comment["start"], comment["end"]
+            ids = [{"w:id": entry["id"]}]
+            self._insert_template(
+                self._document.insert_before, start, _COMMENT_RANGE_START, ids
+            )
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+            # If end node is a paragraph, append comment markup inside it
+            # Otherwise insert after it (for run-level anchors)
+            if end.tagName == "w:p":
+                self._insert_template(
+                    self._document.append_to, end, _COMMENT_RANGE_END_WITH_REF, ids
+                )
+            else:
+                self._insert_template(
+                    self._document.insert_after, end, _COMMENT_RANGE_END_WITH_REF, ids
+                )
 
-        self.next_comment_id += 1
-        return comment_id
+        self._add_comment_entries(entries)
+        return [entry["id"] for entry in entries]
 
     def reply_to_comment(
         self,
@@ -783,55 +1684,71 @@ class Document:
         Example:
             cm.reply_to_comment(parent_comment_id=0, text="I agree with this change")
         """
-        if parent_comment_id not in self.existing_comments:
-            raise ValueError(f"Parent comment with id={parent_comment_id} not found")
+        reply = {"parent_comment_id": parent_comment_id, "text": text}
+        return self.reply_to_comments([reply])[0]
 
-        parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
-        )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
-        )
-
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
-        )
-        parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
-        )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
-        )
+    def reply_to_comments(self, replies) -> List[int]:
+        """
+        Add several replies at once.
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Parents are checked before anything is changed; a reply may also
+        answer one created earlier in the same call. Like add_comments(), each
+        comments part receives its new entries as a single fragment.
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        Args:
+            replies: Iterable of dicts with "parent_comment_id" and "text" keys,
+                as taken by reply_to_comment()
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        Returns:
+            List of the comment IDs that were created for the replies, in order
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        Raises:
+            ValueError: If an entry lacks a key or a parent comment is not found
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        Example:
+            ids = doc.reply_to_comments([
+                {"parent_comment_id": 0, "text": "Agreed"},
+                {"parent_comment_id": 3, "text": "Fixed in the next draft"},
+            ])
+        """
+        replies = list(replies)
+        first_id = self._comment_ids.next_id
+        anchors = {}
+        for i, reply in enumerate(replies):
+            if not isinstance(reply.get("text"), str):
+                raise ValueError(f"Reply {i} has no text")
+            parent_id = reply.get("parent_comment_id")
+            if parent_id in self.existing_comments:
+                if parent_id not in anchors:
+                    anchors[parent_id] = self._comment_anchors(parent_id)
+            elif not (
+                isinstance(parent_id, int) and first_id <= parent_id < first_id + i
+            ):
+                raise ValueError(f"Parent comment with id={parent_id} not found")
+
+        entries = []
+        for reply in replies:
+            parent_id = reply["parent_comment_id"]
+            parent_info = self.existing_comments[parent_id]
+            entry = self._new_comment_entry(reply["text"], parent_info["para_id"])
+            entries.append(entry)
+            # Register now so that later replies in this call can answer it
+            self.existing_comments[entry["id"]] = {"para_id": entry["para_id"]}
+
+            # Add comment ranges to document.xml, next to the parent's
+            if parent_id not in anchors:
+                anchors[parent_id] = self._comment_anchors(parent_id)
+            parent_start_elem, parent_ref_run = anchors[parent_id]
+            ids = [{"w:id": entry["id"]}]
+            insert_after = self._document.insert_after
+            self._insert_template(
+                insert_after, parent_start_elem, _COMMENT_RANGE_START, ids
+            )
+            self._insert_template(insert_after, parent_ref_run, _COMMENT_RANGE_END, ids)
+            self._insert_template(insert_after, parent_ref_run, _COMMENT_REF_RUN, ids)
 
-        self.next_comment_id += 1
-        return comment_id
+        self._add_comment_entries(entries)
+        return [entry["id"] for entry in entries]
 
     def suggest_paragraph(self, xml_content: str) -> str:
         """Transform paragraph XML to add tracked change wrapping for insertion.
@@ -846,10 +1763,90 @@ class Document:
         """
         return DocxXMLEditor.suggest_paragraph(xml_content)
 
+    @property
+    def next_comment_id(self) -> int:
+        """The ID the next add_comment() or reply_to_comment() call will use."""
+        return self._comment_ids.next_id
+
+    @next_comment_id.setter
+    def next_comment_id(self, value: int):
+        self._comment_ids.next_id = value
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
+        self.close()
+
+    def close(self) -> None:
+        """Remove temporary files; unsaved changes are discarded."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
+        if getattr(self, "_owns_workspace", False):
+            self.workspace.cleanup()  # type: ignore
+
+    def checkpoint(self) -> None:
+        """
+        Mark the current state as the one rollback() returns to.
+
+        Editors record what each edit changes from here on (see
+        XMLEditor.checkpoint()), so a checkpoint is cheap and rolling back
+        takes time proportional to the edits made since, without re-reading
+        any part. Calling checkpoint() again moves the checkpoint.
+
+        Example:
+            doc.checkpoint()
+            for attempt in attempts:
+                attempt(doc)
+                try:
+                    doc.save()
+                    break
+                except ValueError:  # Validation failed
+                    doc.rollback()
+        """
+        for editor in self._editors.values():
+            editor.checkpoint()
+        self._checkpoint = {
+            "parts": set(self.workspace.names()),  # type: ignore
+            "next_comment_id": (
+                None
+                if self._comment_id_allocator is None
+                else self._comment_id_allocator.next_id
+            ),
+            "setup_done": self._setup_done,
+        }
+
+    def rollback(self) -> None:
+        """
+        Undo all edits made since the last checkpoint().
+
+        Every editor is restored, parts created since (such as comments.xml)
+        are removed, and comment IDs are handed out again from where they were.
+        The checkpoint stays active. Files already written to a save()
+        destination are not changed until the next save().
+
+        Raises:
+            ValueError: If checkpoint() was never called
+        """
+        state = self._checkpoint
+        if state is None:
+            raise ValueError("rollback() requires a previous checkpoint()")
+
+        for name in set(self.workspace.names()) - state["parts"]:  # type: ignore
+            self._editors.pop(name, None)
+            self.workspace.remove(name)  # type: ignore
+        for editor in self._editors.values():
+            editor.rollback()
+
+        next_id = state["next_comment_id"]
+        if next_id is None:
+            # Reloaded from the restored comments.xml on next use
+            self._comment_id_allocator = None
+            self._existing_comments = None
+        else:
+            if self._existing_comments is not None:
+                for comment_id in range(next_id, self._comment_ids.next_id):
+                    self._existing_comments.pop(comment_id, None)
+            self._comment_ids.next_id = next_id
+        self._setup_done = state["setup_done"]
 
     def validate(self) -> None:
         """
@@ -858,6 +1855,9 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
+        # Validators walk the directory tree, so lay out every part first
+        self.workspace.ensure_tree()  # type: ignore
+
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
             self.unpacked_path, self.original_docx, verbose=False
@@ -877,19 +1877,34 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only editors flagged as modified (edited, or whose DOM or nodes were
+        handed out for direct changes) are serialized, and only files that
+        differ from the destination's copy are written to it. A destination
+        ending in .docx is packed directly.
+
+        When the document was opened from a .docx file or PackageWorkspace, the
+        result is packed into a .docx (the source file by default), or written
+        out fully unpacked if destination is a directory.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
+        # Set up people.xml, RSIDs and revision tracking on the first save
+        if not self._setup_done:
+            self._setup_tracking(track_revisions=self.track_revisions)
+            self._add_author_to_people(self.author)
+            self._setup_done = True
+
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._part_exists(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
         # Save all modified XML files in temp directory
         for editor in self._editors.values():
-            editor.save()
+            if editor.modified:
+                editor.save()
 
         # Validate by default
         if validate:
@@ -897,35 +1912,72 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if target_path.resolve() == self.original_path.resolve():
+            self._keep_original()
+        self._save_workspace(target_path)
+
+    def _keep_original(self):
+        """Keep the validation baseline before the source is overwritten."""
+        if self.original_path.is_dir():
+            # Pack the baseline before the original directory is overwritten
+            self.original_docx  # noqa: B018
+            return
+        if self._original_docx not in (None, self.original_path):
+            return
+        self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+        baseline = Path(self.temp_dir) / "original.docx"
+        try:
+            # save() replaces the source with a new file, so a link keeps the old one
+            os.link(self.original_path, baseline)
+        except OSError:
+            shutil.copy2(self.original_path, baseline)
+        self._original_docx = baseline
+
+    def _save_workspace(self, target_path):
+        """Pack or export the workspace to a .docx file or directory."""
+        if target_path.suffix.lower() != ".docx":
+            self.workspace.export(target_path)  # type: ignore
+            return
 
-    # ==================== Private: Initialization ====================
+        # Pack beside the target first: the target may be the archive being read
+        partial = target_path.with_name(f".{target_path.stem}.partial.docx")
+        self.workspace.pack(partial)  # type: ignore
+        os.replace(partial, target_path)
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _part_exists(self, path):
+        """Check whether a part exists, including parts not yet copied or extracted."""
+        relative = Path(path).relative_to(self.unpacked_path)
+        return self.workspace.exists(relative)  # type: ignore
 
+    def _create_part(self, path, template):
+        """Create a part in the workspace from a file in TEMPLATE_DIR."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(TEMPLATE_DIR / template, path)
+
+    # ==================== Private: Initialization ====================
+
+    def _create_comment_id_allocator(self):
+        """Create the comment ID allocator, seeded from comments.xml."""
+        if not self._part_exists(self.comments_path):
+            return _IdAllocator()
         editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        return _IdAllocator(editor._dom.getElementsByTagName("w:comment"))
+
+    def _scan_hex_ids(self):
+        """Collect the hex IDs in use in the document, comment and open parts."""
+        for part in set(_HEX_ID_PARTS) | set(self._editors):
+            if self.workspace.exists(part):  # type: ignore
+                yield from _hex_ids_in(self.workspace.read_bytes(part))  # type: ignore
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._part_exists(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -969,9 +2021,9 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._part_exists(path):
             # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+            self._create_part(path, "people.xml")
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -981,7 +2033,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -992,7 +2044,7 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
@@ -1020,7 +2072,7 @@ class Document:
         if track_revisions:
             track_revisions_exists = any(
                 elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1028,7 +2080,7 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1041,7 +2093,7 @@ class Document:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor._dom.getElementsByTagName(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1052,13 +2104,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor._dom.getElementsByTagName(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
+                clr_elements = editor._dom.getElementsByTagName(
                     f"{prefix}:clrSchemeMapping"
                 )
                 if clr_elements:
@@ -1081,125 +2133,172 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _new_comment_entry(self, text, parent_para_id=None):
+        """Allocate the ID, paragraph ID and durable ID of a new comment."""
+        return {
+            "id": self._comment_ids.allocate(),
+            "para_id": self._hex_ids.allocate(),
+            "durable_id": self._hex_ids.allocate(),
+            "parent_para_id": parent_para_id,
+            "text": text,
+        }
+
+    def _comment_anchors(self, comment_id):
+        """Find a comment's range start and reference run in document.xml."""
+        start_elem = self._document.get_node(
+            tag="w:commentRangeStart", attrs={"w:id": str(comment_id)}
+        )
+        ref_elem = self._document.get_node(
+            tag="w:commentReference", attrs={"w:id": str(comment_id)}
+        )
+        return start_elem, ref_elem.parentNode
+
+    def _add_comment_entries(self, entries):
+        """Add new comments to the comments parts and to existing_comments."""
+        if not entries:
+            return
+        self._add_to_comments_xml(entries)
+        self._add_to_comments_extended_xml(entries)
+        self._add_to_comments_ids_xml(entries)
+        self._add_to_comments_extensible_xml(entries)
+
+        # Update existing_comments so replies work
+        for entry in entries:
+            self.existing_comments[entry["id"]] = {"para_id": entry["para_id"]}
+
+    def _add_to_comments_xml(self, entries):
+        """Add comments to comments.xml in a single fragment."""
+        if not self._part_exists(self.comments_path):
+            self._create_part(self.comments_path, "comments.xml")
 
         editor = self["word/comments.xml"]
         root = editor.get_node(tag="w:comments")
 
-        escaped_text = (
-            text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        )
         # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
         # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
-  <w:p w14:paraId="{para_id}" w14:textId="77777777">
+        comments_xml = []
+        for entry in entries:
+            escaped_text = (
+                entry["text"]
+                .replace("&", "&amp;")
+                .replace("<", "&lt;")
+                .replace(">", "&gt;")
+            )
+            comments_xml.append(f'''<w:comment w:id="{entry["id"]}">
+  <w:p w14:paraId="{entry["para_id"]}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
-</w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
+</w:comment>''')
+        editor.append_to(root, "".join(comments_xml))
+
+    def _add_to_comments_extended_xml(self, entries):
+        """Add comments to commentsExtended.xml, one fragment per template."""
+        if not self._part_exists(self.comments_extended_path):
+            self._create_part(self.comments_extended_path, "commentsExtended.xml")
 
         editor = self["word/commentsExtended.xml"]
         root = editor.get_node(tag="w15:commentsEx")
 
-        if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
+        # Replies use a different template; runs of either keep their order
+        for is_reply, group in itertools.groupby(
+            entries, key=lambda entry: bool(entry["parent_para_id"])
+        ):
+            if is_reply:
+                template = _COMMENT_EX_REPLY
+                values = [
+                    {
+                        "w15:paraId": entry["para_id"],
+                        "w15:paraIdParent": entry["parent_para_id"],
+                    }
+                    for entry in group
+                ]
+            else:
+                template = _COMMENT_EX
+                values = [{"w15:paraId": entry["para_id"]} for entry in group]
+            self._insert_template(editor.append_to, root, template, values)
 
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
+    def _add_to_comments_ids_xml(self, entries):
+        """Add comments to commentsIds.xml in a single fragment."""
+        if not self._part_exists(self.comments_ids_path):
+            self._create_part(self.comments_ids_path, "commentsIds.xml")
 
         editor = self["word/commentsIds.xml"]
         root = editor.get_node(tag="w16cid:commentsIds")
 
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+        values = [
+            {"w16cid:paraId": entry["para_id"], "w16cid:durableId": entry["durable_id"]}
+            for entry in entries
+        ]
+        self._insert_template(editor.append_to, root, _COMMENT_ID, values)
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
+    def _add_to_comments_extensible_xml(self, entries):
+        """Add comments to commentsExtensible.xml in a single fragment."""
+        if not self._part_exists(self.comments_extensible_path):
+            self._create_part(self.comments_extensible_path, "commentsExtensible.xml")
 
         editor = self["word/commentsExtensible.xml"]
         root = editor.get_node(tag="w16cex:commentsExtensible")
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+        values = [{"w16cex:durableId": entry["durable_id"]} for entry in entries]
+        self._insert_template(editor.append_to, root, _COMMENT_EXTENSIBLE, values)
 
     # ==================== Private: XML Fragments ====================
 
-    def _comment_range_start_xml(self, comment_id):
-        """Generate XML for comment range start."""
-        return f'<w:commentRangeStart w:id="{comment_id}"/>'
+    def _insert_template(self, insert, target, template, values):
+        """Insert copies of a fragment template, then fill in their empty attributes.
 
-    def _comment_range_end_xml(self, comment_id):
-        """Generate XML for comment range end with reference run.
+        Templates are constant strings, so the editor parses each one (or each
+        repetition of one) once and clones it afterwards. The insertion is
+        applied immediately even inside a batch() so that the inserted nodes
+        are available to fill in.
 
-        Note: w:rsidR is automatically added by DocxXMLEditor.
-        """
-        return f'''<w:commentRangeEnd w:id="{comment_id}"/>
-<w:r>
-  <w:rPr><w:rStyle w:val="CommentReference"/></w:rPr>
-  <w:commentReference w:id="{comment_id}"/>
-</w:r>'''
-
-    def _comment_ref_run_xml(self, comment_id):
-        """Generate XML for comment reference run.
+        Args:
+            insert: Bound editor method (insert_before, insert_after, append_to)
+            target: Node to insert relative to
+            template: One of the _COMMENT_* fragment templates
+            values: List with one dictionary per copy, mapping attribute names
+                to their values
 
-        Note: w:rsidR is automatically added by DocxXMLEditor.
+        Returns:
+            List[defusedxml.minidom.Node]: The inserted nodes
         """
-        return f'''<w:r>
-  <w:rPr><w:rStyle w:val="CommentReference"/></w:rPr>
-  <w:commentReference w:id="{comment_id}"/>
-</w:r>'''
+        editor = insert.__self__
+        # The new nodes are indexed on the next lookup, with the filled values
+        with editor._edit(), editor._unbatched():
+            nodes = insert(target, template * len(values))
+            _fill_template_copies(nodes, values)
+        return nodes
 
     # ==================== Private: Metadata Updates ====================
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
+        for rel_elem in editor._dom.getElementsByTagName("Relationship"):
             if rel_elem.getAttribute("Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
+        for override_elem in editor._dom.getElementsByTagName("Override"):
             if override_elem.getAttribute("PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
+        for person_elem in editor._dom.getElementsByTagName("w15:person"):
             if person_elem.getAttribute("w15:author") == author:
                 return True
         return False
 
     def _add_author_to_people(self, author):
-        """Add author to people.xml (called during initialization)."""
+        """Add author to people.xml (called on the first save)."""
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._part_exists(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
@@ -1223,7 +2322,7 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
@@ -1263,7 +2362,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
 
         # Add Override elements
         overrides = [
@@ -1290,3 +2389,7 @@ class Document:
                 f'<Override PartName="{part_name}" ContentType="{content_type}"/>'
             )
             editor.append_to(root, override_xml)
+
+
+# Opt-in instrumentation, e.g. OOXML_PROFILE=1 (see profiling.py)
+profiling.enable_from_environment()
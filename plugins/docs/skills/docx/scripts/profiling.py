@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing of the Document library's public methods and internal phases.
+
+When enabled, every public method of XMLEditor, DocxXMLEditor, Document and
+PackageWorkspace, and the internal phases that usually dominate a run
+(parsing, node lookups, fragment parsing, attribute injection, tracking
+setup, packing, schema loading and validation) record their number of calls,
+total time and own time (total minus the instrumented calls they made).
+Disabled, the methods are the original functions and cost nothing extra.
+
+Enable it for a whole process with the OOXML_PROFILE environment variable;
+the summary is written when the process exits:
+
+    OOXML_PROFILE=1 python edit.py                   # Table on stderr
+    OOXML_PROFILE=profile.json python edit.py        # JSON file
+    OOXML_PROFILE=profile-{pid}.json python edit.py  # One file per process
+
+Or around a block of code:
+
+    from scripts.profiling import profile
+
+    with profile() as stats:
+        doc = Document("contract.docx")
+        ...
+        doc.save()
+    print(stats.report())
+    stats.summary()  # {"Document.save": {"calls": 1, "seconds": ..., ...}, ...}
+
+Only the calling thread's nesting is tracked for own time, and worker
+processes (e.g. batch.py with several workers) are not included. Generators
+and context managers such as XMLEditor.batch() are not timed, as a call only
+creates them; their work shows up in the phases they run (_commit_batch).
+"""
+
+import atexit
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = "OOXML_PROFILE"
+
+# Classes whose public methods are timed, with the internal phases to time too
+# (module names starting with "." are relative to this package)
+_CLASSES = {
+    ".utilities": {
+        "XMLEditor": [
+            "__init__",
+            "_candidates",
+            "_tag_lookup",
+            "_text_lookup",
+            "_parse_fragments",
+            "_commit_batch",
+        ],
+    },
+    ".document": {
+        "DocxXMLEditor": ["__init__", "_inject_attributes_to_nodes", "_text_runs"],
+        "Document": [
+            "__init__",
+            "__getitem__",
+            "_setup_tracking",
+            "_load_existing_comments",
+            "_add_comment_entries",
+            "_ensure_comment_relationships",
+            "_save_workspace",
+        ],
+    },
+    ".workspace": {"PackageWorkspace": ["__init__"]},
+    "ooxml.scripts.validation.docx": {"DOCXSchemaValidator": []},
+    "ooxml.scripts.validation.redlining": {"RedliningValidator": []},
+}
+
+# Module-level functions that are timed
+_FUNCTIONS = {
+    ".utilities": ["_build_text_index"],
+    "ooxml.scripts.validation.base": ["load_schema"],
+}
+
+# The Profile collecting now, or None
+_active = None
+# (owner, attribute) -> original value, while instrumented
+_originals = {}
+
+
+class Profile:
+    """
+    Call counts and times of the instrumented methods.
+
+    Attributes:
+        stats: Name -> [calls, total seconds, own seconds]
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._local = threading.local()
+
+    def call(self, name, function, args, kwargs):
+        """Run function, adding its time to the statistics under name."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # Time spent in instrumented callees
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            callees = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - callees
+
+    def summary(self):
+        """
+        Get the statistics, most expensive (by own time) first.
+
+        Returns:
+            dict: Name -> {"calls", "seconds", "own_seconds"}
+        """
+        ordered = sorted(self.stats.items(), key=lambda item: -item[1][2])
+        return {
+            name: {
+                "calls": calls,
+                "seconds": round(total, 6),
+                "own_seconds": round(own, 6),
+            }
+            for name, (calls, total, own) in ordered
+        }
+
+    def report(self, limit=None):
+        """
+        Format the statistics as a table, most expensive (by own time) first.
+
+        Args:
+            limit: Maximum number of rows (default: all)
+
+        Returns:
+            str: The table
+        """
+        rows = list(self.summary().items())[:limit]
+        lines = [f"{'calls':>8} {'total s':>10} {'own s':>10}  name"]
+        for name, entry in rows:
+            lines.append(
+                f"{entry['calls']:>8} {entry['seconds']:>10.4f} "
+                f"{entry['own_seconds']:>10.4f}  {name}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """Discard the statistics collected so far."""
+        self.stats.clear()
+
+
+def enable(collector=None):
+    """
+    Start timing the instrumented methods.
+
+    Args:
+        collector: Profile to add the statistics to (default: a new one)
+
+    Returns:
+        Profile: The collecting profile
+    """
+    global _active
+    if not _originals:
+        _install()
+    _active = collector or Profile()
+    return _active
+
+
+def disable():
+    """Stop timing and restore the original methods."""
+    global _active
+    _active = None
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Time the instrumented methods inside a with block.
+
+    Yields:
+        Profile: The statistics, complete once the block exits
+
+    Example:
+        with profile() as stats:
+            doc.save()
+        print(stats.report())
+    """
+    previous = _active
+    collector = enable()
+    try:
+        yield collector
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+            for name, (calls, total, own) in collector.stats.items():
+                entry = previous.stats.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += calls
+                entry[1] += total
+                entry[2] += own
+
+
+def enable_from_environment():
+    """
+    Enable profiling if OOXML_PROFILE is set, and write the summary at exit.
+
+    A value ending in .json (which may contain {pid}) is a file for the JSON
+    summary; any other value prints the table to stderr.
+    """
+    target = os.environ.get(PROFILE_ENV)
+    if not target or _active is not None:
+        return
+    atexit.register(_write_summary, enable(), target)
+
+
+def _write_summary(collector, target):
+    if target.lower().endswith(".json"):
+        path = target.replace("{pid}", str(os.getpid()))
+        with open(path, "w") as f:
+            json.dump(collector.summary(), f, indent=2)
+    else:
+        print(collector.report(), file=sys.stderr)
+
+
+def _install():
+    """Replace the instrumented methods and functions with timing wrappers."""
+    for module_name, classes in _CLASSES.items():
+        module = importlib.import_module(module_name, __package__)
+        for class_name, phases in classes.items():
+            cls = getattr(module, class_name)
+            for attribute, value in list(vars(cls).items()):
+                public = not attribute.startswith("_")
+                if not (public or attribute in phases):
+                    continue
+                name = f"{class_name}.{attribute}"
+                if isinstance(value, property) and value.fget is not None:
+                    wrapped = property(
+                        _timed(value.fget, name), value.fset, value.fdel, value.__doc__
+                    )
+                elif (
+                    callable(value)
+                    and not isinstance(value, (type, staticmethod, classmethod))
+                    and not _is_generator(value)
+                ):
+                    wrapped = _timed(value, name)
+                else:
+                    continue
+                _originals[(cls, attribute)] = value
+                setattr(cls, attribute, wrapped)
+
+    for module_name, functions in _FUNCTIONS.items():
+        module = importlib.import_module(module_name, __package__)
+        for attribute in functions:
+            function = getattr(module, attribute)
+            _originals[(module, attribute)] = function
+            setattr(module, attribute, _timed(function, attribute))
+
+
+def _is_generator(function):
+    """Check whether a function is a generator or @contextmanager function."""
+    return inspect.isgeneratorfunction(inspect.unwrap(function))
+
+
+def _timed(function, name):
+    """Wrap a function so calls are recorded by the active Profile."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        collector = _active
+        if collector is None:
+            return function(*args, **kwargs)
+        return collector.call(name, function, args, kwargs)
+
+    return wrapper
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+XPath-like queries for XMLEditor.find_all() and find_one().
+
+A query is a path of element steps, each optionally filtered by predicates:
+
+    //w:p                                   every paragraph
+    /w:document/w:body/w:p                  top-level paragraphs only
+    //w:tbl//w:p                            paragraphs anywhere inside tables
+    //w:p[w:pPr/w:pStyle/@w:val="Heading1"] paragraphs with a style
+    //w:p[contains(., "Governing Law")]     paragraphs containing text
+    //w:ins[@w:author="Jane" and not(w:r/w:t)]
+    //w:r[w:rPr/w:b][starts-with(., "Note")]
+
+Supported in predicates:
+    @attr                   attribute value (tests existence on its own)
+    path, path/@attr        child elements (// for descendants), existence
+                            on its own, or the values of their attributes
+    .                       the element's text (as get_node(contains=...) sees it)
+    =, !=                   comparison with a "string" or 'string'
+    contains(x, "s"), starts-with(x, "s")
+    and, or, not(...), (...)
+
+As in XPath, a comparison or function of a path is true if any of the
+selected values satisfies it. A query without a leading / or // matches
+anywhere, so "w:p" is the same as "//w:p". Entity notation (&#8220;) is
+supported in strings.
+
+Compiled queries are cached, so repeating a query only costs its evaluation.
+
+Example usage:
+    query = compile_query('//w:p[contains(., "Term")]')
+    query.tag        # "w:p": the element type the editor looks up
+    query.hint       # ("text", "Term"): the index that narrows the search
+    query.matches(elem, text_of)
+"""
+
+import functools
+import html
+import re
+
+# Most recently used compiled queries that are kept
+QUERY_CACHE_SIZE = 512
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>//|/|\[|\]|\(|\)|!=|=|@|,|\*|\.)
+      | (?P<name>[A-Za-z_][\w.-]*(?::[A-Za-z_][\w.-]*)?)
+    )""",
+    re.VERBOSE,
+)
+
+# Functions taking a value and a string
+_FUNCTIONS = {
+    "contains": lambda value, s: s in value,
+    "starts-with": lambda value, s: value.startswith(s),
+}
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_query(query):
+    """
+    Compile a query string (see the module docstring).
+
+    Args:
+        query: The query text
+
+    Returns:
+        Query: The compiled query (cached, so the same object is returned for
+        the same text)
+
+    Raises:
+        ValueError: If the query is not valid
+    """
+    return Query(query, _Parser(query).parse_path())
+
+
+class Query:
+    """A compiled query.
+
+    Attributes:
+        text: The query as written
+        tag: Tag name of the elements the query returns ("*" for any)
+        hint: How to narrow the candidates through an editor index:
+              ("attr", name, value), ("text", string), or None
+    """
+
+    def __init__(self, text, steps):
+        self.text = text
+        self._steps = steps
+        axis, self.tag, predicates = steps[-1]
+        self.hint = _index_hint(predicates)
+
+    def __repr__(self):
+        return f"Query({self.text!r})"
+
+    def matches(self, elem, text_of):
+        """
+        Check whether an element is selected by the query.
+
+        Args:
+            elem: Element to test
+            text_of: Function returning an element's text (for "." in predicates)
+
+        Returns:
+            bool: True if the element, its predicates and its ancestors match
+        """
+        return _match_step(self._steps, len(self._steps) - 1, elem, text_of)
+
+
+def _match_step(steps, k, elem, text_of):
+    """Match elem against step k, then its ancestors against the steps before it."""
+    axis, tag, predicates = steps[k]
+    if tag != "*" and elem.tagName != tag:
+        return False
+    if not all(predicate(elem, text_of) for predicate in predicates):
+        return False
+    parent = elem.parentNode
+    if k == 0:
+        # "/" anchors the first step at the root element
+        return axis == "//" or parent.nodeType == parent.DOCUMENT_NODE
+    if axis == "/":
+        return parent.nodeType == parent.ELEMENT_NODE and _match_step(
+            steps, k - 1, parent, text_of
+        )
+    while parent.nodeType == parent.ELEMENT_NODE:
+        if _match_step(steps, k - 1, parent, text_of):
+            return True
+        parent = parent.parentNode
+    return False
+
+
+def _index_hint(predicates):
+    """Pick an index lookup implied by a step's top-level predicates."""
+    text_hint = None
+    for predicate in predicates:
+        for term in getattr(predicate, "terms", [predicate]):
+            kind = getattr(term, "hint", None)
+            if kind and kind[0] == "attr":
+                return kind
+            if kind and text_hint is None:
+                text_hint = kind
+    return text_hint
+
+
+class _Parser:
+    """Recursive-descent parser producing steps of (axis, tag, predicates)."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN_PATTERN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid query {self.text!r} at position {position}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind), match.start(kind)))
+            position = match.end()
+        self.index = 0
+
+    # ---- Token helpers
+
+    def peek(self, value=None):
+        if self.index >= len(self.tokens):
+            return None
+        token = self.tokens[self.index]
+        if value is not None and token[1] != value:
+            return None
+        return token
+
+    def take(self, value=None):
+        token = self.peek(value)
+        if token is None:
+            self.fail(f"expected {value!r}" if value else "unexpected end")
+        self.index += 1
+        return token
+
+    def fail(self, message):
+        if self.index < len(self.tokens):
+            where = f"at position {self.tokens[self.index][2]}"
+        else:
+            where = "at end"
+        raise ValueError(f"Invalid query {self.text!r} {where}: {message}")
+
+    # ---- Grammar
+
+    def parse_path(self):
+        """path := ["/" | "//"] step (("/" | "//") step)*"""
+        axis = "//"
+        if self.peek("/") or self.peek("//"):
+            axis = self.take()[1]
+        steps = [self.parse_step(axis)]
+        while self.peek("/") or self.peek("//"):
+            axis = self.take()[1]
+            steps.append(self.parse_step(axis))
+        if self.index != len(self.tokens):
+            self.fail("unexpected token")
+        return steps
+
+    def parse_step(self, axis):
+        """step := (name | "*") ("[" expr "]")*"""
+        token = self.peek()
+        if token is None or (token[0] != "name" and token[1] != "*"):
+            self.fail("expected an element name")
+        self.index += 1
+        predicates = []
+        while self.peek("["):
+            self.take("[")
+            predicates.append(self.parse_or())
+            self.take("]")
+        return (axis, token[1], predicates)
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek("or"):
+            self.take()
+            terms.append(self.parse_and())
+        if len(terms) == 1:
+            return terms[0]
+        return _Predicate(lambda elem, text_of: any(t(elem, text_of) for t in terms))
+
+    def parse_and(self):
+        terms = [self.parse_unary()]
+        while self.peek("and"):
+            self.take()
+            terms.append(self.parse_unary())
+        if len(terms) == 1:
+            return terms[0]
+        predicate = _Predicate(
+            lambda elem, text_of: all(t(elem, text_of) for t in terms)
+        )
+        predicate.terms = terms  # Conjuncts may each provide an index hint
+        return predicate
+
+    def parse_unary(self):
+        token = self.peek()
+        if token is None:
+            self.fail("expected a condition")
+        following = self.tokens[self.index + 1][1] if self.index + 1 < len(self.tokens) else None
+        if token[1] == "(":
+            self.take()
+            predicate = self.parse_or()
+            self.take(")")
+            return predicate
+        if token[1] == "not" and following == "(":
+            self.index += 2
+            inner = self.parse_or()
+            self.take(")")
+            return _Predicate(lambda elem, text_of: not inner(elem, text_of))
+        if token[1] in _FUNCTIONS and following == "(":
+            self.index += 2
+            values, source = self.parse_operand()
+            self.take(",")
+            literal = self.parse_string()
+            self.take(")")
+            function = _FUNCTIONS[token[1]]
+            predicate = _Predicate(
+                lambda elem, text_of: any(
+                    function(value, literal) for value in values(elem, text_of)
+                )
+            )
+            if token[1] == "contains" and source == "." and literal:
+                predicate.hint = ("text", literal)
+            return predicate
+
+        values, source = self.parse_operand()
+        if self.peek("=") or self.peek("!="):
+            negate = self.take()[1] == "!="
+            literal = self.parse_string()
+            predicate = _Predicate(
+                lambda elem, text_of: any(
+                    (value == literal) != negate for value in values(elem, text_of)
+                )
+            )
+            if source and source[0] == "@" and not negate:
+                predicate.hint = ("attr", source[1:], literal)
+            return predicate
+        return _Predicate(
+            lambda elem, text_of: any(True for _ in values(elem, text_of))
+        )
+
+    def parse_operand(self):
+        """
+        operand := "." | "@" name | relative path ["/@" name]
+
+        Returns:
+            tuple: (function yielding the operand's values for an element,
+            "." or "@name" for operands that can use an index, else None)
+        """
+        if self.peek("."):
+            self.take()
+            return (lambda elem, text_of: [text_of(elem)]), "."
+        if self.peek("@"):
+            self.take()
+            name = self.take_name()
+            return _attribute_values(name), "@" + name
+
+        # Relative path of child (/) or descendant (//) steps
+        steps = [("/", self.take_name())]
+        attribute = None
+        while self.peek("/") or self.peek("//"):
+            axis = self.take()[1]
+            if self.peek("@"):
+                self.take()
+                attribute = self.take_name()
+                break
+            steps.append((axis, self.take_name()))
+        return _path_values(steps, attribute), None
+
+    def take_name(self):
+        token = self.peek()
+        if token is None or (token[0] != "name" and token[1] != "*"):
+            self.fail("expected a name")
+        self.index += 1
+        return token[1]
+
+    def parse_string(self):
+        token = self.peek()
+        if token is None or token[0] != "string":
+            self.fail("expected a quoted string")
+        self.index += 1
+        return html.unescape(token[1][1:-1])
+
+
+class _Predicate:
+    """Callable condition on an element, with an optional index hint."""
+
+    hint = None
+
+    def __init__(self, function):
+        self._function = function
+
+    def __call__(self, elem, text_of):
+        return self._function(elem, text_of)
+
+
+def _attribute_values(name):
+    """Operand yielding an element's attribute value, if it has the attribute."""
+
+    def values(elem, text_of):
+        if elem.hasAttribute(name):
+            yield elem.getAttribute(name)
+
+    return values
+
+
+def _path_values(steps, attribute):
+    """Operand yielding the elements (or attribute values) at a relative path."""
+
+    def values(elem, text_of):
+        nodes = [elem]
+        for axis, tag in steps:
+            selected = []
+            for node in nodes:
+                if axis == "//":
+                    selected.extend(node.getElementsByTagName(tag))
+                else:
+                    selected.extend(
+                        child
+                        for child in node.childNodes
+                        if child.nodeType == child.ELEMENT_NODE
+                        and (tag == "*" or child.tagName == tag)
+                    )
+            nodes = selected
+        if attribute is None:
+            return nodes
+        return [node.getAttribute(attribute) for node in nodes if node.hasAttribute(attribute)]
+
+    return values
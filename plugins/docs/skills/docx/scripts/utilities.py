@@ -19,6 +19,9 @@ Example usage:
     # Find node by attributes
     elem = editor.get_node(tag="w:r", attrs={"w:id": "target"})
 
+    # Query with an XPath-like path (see query.py)
+    headings = editor.find_all('//w:p[w:pPr/w:pStyle/@w:val="Heading1"]')
+
     # Combine filters
     elem = editor.get_node(tag="w:p", line_number=range(1, 50), contains="text")
 
@@ -28,14 +31,78 @@ Example usage:
 
     # Save changes
     editor.save()
+
+    # Read one element of a large part without parsing the whole file
+    elem = read_node("document.xml", tag="w:p", line_number=519)
 """
 
+import bisect
+import codecs
+import collections
+import contextlib
+import functools
 import html
+import os
+import re
+import sys
 from pathlib import Path
 from typing import Optional, Union
+from xml.parsers.expat import ExpatError
 
 import defusedxml.minidom
 import defusedxml.sax
+from defusedxml.expatbuilder import DefusedExpatBuilderNS
+from xml.dom import minidom
+from xml.dom.xmlbuilder import Options
+from ooxml.scripts.pack import write_xml
+from ooxml.scripts.unpack import (
+    index_path,
+    load_index,
+    read_fragment,
+    write_index,
+)
+
+from .query import compile_query
+
+# How element positions are found when there is no sidecar index: "scan"
+# locates start tags with a regular expression and checks them against the
+# parsed tree (falling back to "sax" if they disagree); "sax" runs a Python
+# callback for every element while parsing
+ENGINES = ("scan", "sax")
+DEFAULT_ENGINE = os.environ.get("OOXML_XML_ENGINE", "scan")
+
+# Recently parsed fragments are kept (up to this many, if not too long) and
+# cloned when the same XML is inserted again
+_FRAGMENT_CACHE_SIZE = 256
+_FRAGMENT_CACHE_MAX_LENGTH = 2048
+
+# Key the editor keeps in minidom's ID cache of its DOM. minidom clears that
+# cache whenever the children or attributes of an attached node change, so the
+# key disappears on any change made directly on the DOM (see _sync_indexes)
+_SYNCED = object()
+
+# Python versions whose minidom internals the change detection above (and
+# _IndexedText) has been checked against; on other versions the lookup
+# indexes are rebuilt for every lookup instead
+DOM_TRACKING_VERSIONS = ((3, 8), (3, 13))
+
+# Markup that can contain a raw "<", and element start tags (group 1 = tag)
+_MARKUP_PATTERN = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>"
+    rb"|<!DOCTYPE[^\[>]*(?:\[.*?\])?\s*>|<([^\s/>!?]+)",
+    re.DOTALL,
+)
+
+
+def _edit_method(method):
+    """Decorate an XMLEditor method that changes the DOM (see XMLEditor._edit)."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._edit():
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class XMLEditor:
@@ -44,34 +111,122 @@ class XMLEditor:
 
     This class parses XML files and tracks the original line and column position
     of each element. This enables finding nodes by their line number in the original
-    file, which is useful when working with Read tool output.
+    file, which is useful when working with Read tool output. When unpack.py left
+    a valid sidecar index next to the file, positions are taken from it and the
+    file is parsed with the faster non-SAX builder.
 
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        modified: True if the DOM may differ from the file, which
+                  Document.save() then writes: once it has been edited through
+                  this editor and not saved since, or (as changes made directly
+                  on them cannot be seen) once `dom` or nodes found by get_node,
+                  find_text, find_all or find_one have been handed out
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, engine: Optional[str] = None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
-            xml_path: Path to XML file to edit (str or Path)
+            xml_path: Path to XML file to edit (str, Path, or a lazily extracted
+                      PackageWorkspace part such as `workspace / "word/document.xml"`)
+            engine: "scan" or "sax" (default: DEFAULT_ENGINE, which is taken
+                    from the OOXML_XML_ENGINE environment variable)
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the engine is unknown
         """
         self.xml_path = Path(xml_path)
         if not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
+        self.engine = engine or DEFAULT_ENGINE
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {self.engine} (expected {ENGINES})")
 
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        content = self.xml_path.read_bytes()
+        header = content[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        self._dom = None
+        index = load_index(self.xml_path, content)
+        if index is not None or self.engine == "scan":
+            # Positions come from elsewhere, so the faster non-SAX builder is used
+            self._dom = _parse_without_positions(content)
+            elements = self._dom.getElementsByTagName("*")
+            if index is not None:
+                positioned = _apply_positions(elements, index)
+            else:
+                positioned = _apply_scanned_positions(elements, content)
+            if not positioned:
+                self._dom = None
+        if self._dom is None:
+            parser = _create_line_tracking_parser()
+            self._dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+
+        self._modified = False
+        # Whether the DOM or nodes from it were handed out (see modified)
+        self._exposed = False
+
+        # Lookup indexes for get_node, built on first use (see _candidates)
+        self._reset_indexes()
+        # Whether an _edit() block is running
+        self._editing = False
+        self._mark_synced()
+
+        # Edits queued by batch(), or None outside a batch
+        self._batch = None
+
+        # Prior children and attributes of the nodes changed since checkpoint()
+        # (see _record), or None when no checkpoint is active
+        self._journal = None
+        self._checkpoint_modified = False
+
+        # Parsed fragment templates (LRU) and the xmlns text they were parsed with
+        self._fragment_cache = collections.OrderedDict()
+        self._namespace_cache = None
+
+    @property
+    def dom(self):
+        """The parsed DOM tree.
+
+        Handing it out flags the editor as modified, since the caller may
+        change it directly; read through read_only() to avoid that.
+        """
+        self._exposed = True
+        return self._dom
+
+    @property
+    def modified(self):
+        """Whether the DOM may have changed since it was loaded or saved."""
+        return self._modified or self._exposed
+
+    @modified.setter
+    def modified(self, value):
+        self._modified = value
+
+    @contextlib.contextmanager
+    def read_only(self):
+        """
+        Read the DOM without flagging the editor as modified.
+
+        Yields the DOM; taking it, or nodes from get_node() and find_*(),
+        inside the block leaves modified as it was. Direct changes to those
+        nodes are then only saved if the editor is modified otherwise, so
+        change them through the editing methods, or after taking them again
+        outside the block.
+
+        Example:
+            with editor.read_only() as dom:
+                count = len(dom.getElementsByTagName("w:p"))
+        """
+        exposed = self._exposed
+        try:
+            yield self._dom
+        finally:
+            self._exposed = exposed
 
     def get_node(
         self,
@@ -109,8 +264,165 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
+        candidates = self._candidates(tag, attrs, line_number, contains)
+        matches = self._filter_nodes(candidates, attrs, line_number, contains)
+
+        if not matches:
+            # Build descriptive error message
+            filters = []
+            if line_number is not None:
+                line_str = (
+                    f"lines {line_number.start}-{line_number.stop - 1}"
+                    if isinstance(line_number, range)
+                    else f"line {line_number}"
+                )
+                filters.append(f"at {line_str}")
+            if attrs is not None:
+                filters.append(f"with attributes {attrs}")
+            if contains is not None:
+                filters.append(f"containing '{contains}'")
+
+            filter_desc = " ".join(filters) if filters else ""
+            base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
+
+            # Add helpful hint based on filters used
+            if contains:
+                hint = "Text may be split across elements or use different wording."
+            elif line_number:
+                hint = "Line numbers may have changed if document was modified."
+            elif attrs:
+                hint = "Verify attribute values are correct."
+            else:
+                hint = "Try adding filters (attrs, line_number, or contains)."
+
+            raise ValueError(f"{base_msg}. {hint}")
+        if len(matches) > 1:
+            raise ValueError(
+                f"Multiple nodes found: <{tag}>. "
+                f"Add more filters (attrs, line_number, or contains) to narrow the search."
+            )
+        self._exposed = True
+        return matches[0]
+
+    def find_text(self, tag: str, patterns):
+        """
+        Locate many text anchors in one pass over the document.
+
+        Text is matched the same way as get_node(contains=...), so anchors may
+        span several runs. Instead of one tree walk per anchor, the document's
+        text is scanned once for all patterns.
+
+        Args:
+            tag: The XML tag name of the elements to return (e.g., "w:p", "w:r")
+            patterns: Iterable of text strings (entity notation is supported)
+
+        Returns:
+            dict[str, list[Element]]: For each pattern, the elements whose text
+            contains it, in document order (empty if there is no match)
+
+        Example:
+            hits = editor.find_text("w:p", ["Term of Agreement", "Governing Law"])
+            para = hits["Governing Law"][0]
+        """
+        patterns = list(dict.fromkeys(patterns))
+        normalized = [html.unescape(pattern) for pattern in patterns]
+        self._sync_indexes()
+        results = self._text_lookup(tag, normalized)
+        self._exposed = True
+        return dict(zip(patterns, results))
+
+    def find_all(self, query: str):
+        """
+        Find every element matching an XPath-like query.
+
+        The query is compiled once and cached (see query.py for the syntax).
+        Candidates come from the same indexes as get_node: an attribute
+        equality or contains(., "text") predicate on the last step narrows the
+        search, otherwise all elements with the tag are checked.
+
+        Args:
+            query: Query such as '//w:p[contains(., "Term")]' or
+                   '//w:tbl//w:p[w:pPr/w:pStyle/@w:val="Heading1"]'
+
+        Returns:
+            list[Element]: The matching elements, in document order
+
+        Raises:
+            ValueError: If the query is not valid
+
+        Example:
+            for ins in editor.find_all('//w:ins[@w:author="Jane Doe"]'):
+                editor.revert_insertion(ins)
+        """
+        compiled = compile_query(query)
+        tag = compiled.tag
+        hint = compiled.hint
+        self._sync_indexes()
+        # Tag and attribute indexes lose document order once edits are indexed;
+        # full scans and text lookups are always in order
+        unordered = False
+        if tag == "*":
+            candidates = self._dom.getElementsByTagName("*")
+        elif hint and hint[0] == "text":
+            candidates = self._text_lookup(tag, [hint[1]])[0]
+        else:
+            if hint:
+                candidates = list(self._attr_lookup(tag, hint[1], hint[2]))
+            else:
+                candidates = list(self._tag_lookup(tag))
+            unordered = not self._index_in_order
+
+        text_of = self._get_element_text
+        matches = [
+            elem
+            for elem in candidates
+            if compiled.matches(elem, text_of) and self._is_attached(elem)
+        ]
+        if unordered and len(matches) > 1:
+            if self._document_order is None or any(
+                elem not in self._document_order for elem in matches
+            ):
+                self._document_order = {
+                    elem: i
+                    for i, elem in enumerate(self._dom.getElementsByTagName("*"))
+                }
+            matches.sort(key=self._document_order.__getitem__)
+        self._exposed = True
+        return matches
+
+    def find_one(self, query: str):
+        """
+        Find the single element matching an XPath-like query.
+
+        Args:
+            query: Query in the syntax of find_all()
+
+        Returns:
+            defusedxml.minidom.Element: The matching element
+
+        Raises:
+            ValueError: If the query is invalid, or no or several elements match
+
+        Example:
+            para = editor.find_one('//w:p[contains(., "Governing Law")]')
+        """
+        matches = self.find_all(query)
+        if not matches:
+            raise ValueError(f"Node not found: {query}")
+        if len(matches) > 1:
+            raise ValueError(
+                f"Multiple nodes found ({len(matches)}): {query}. "
+                f"Add predicates to narrow the search."
+            )
+        return matches[0]
+
+    def _filter_nodes(self, elements, attrs, line_number, contains):
+        """Return the attached elements that pass all get_node filters."""
         matches = []
-        for elem in self.dom.getElementsByTagName(tag):
+        for elem in elements:
+            if not self._is_attached(elem):
+                continue
+
             # Check line_number filter
             if line_number is not None:
                 parse_pos = getattr(elem, "parse_position", (None,))
@@ -143,42 +455,219 @@ class XMLEditor:
 
             # If all applicable filters passed, this is a match
             matches.append(elem)
+        return matches
 
-        if not matches:
-            # Build descriptive error message
-            filters = []
-            if line_number is not None:
-                line_str = (
-                    f"lines {line_number.start}-{line_number.stop - 1}"
-                    if isinstance(line_number, range)
-                    else f"line {line_number}"
-                )
-                filters.append(f"at {line_str}")
-            if attrs is not None:
-                filters.append(f"with attributes {attrs}")
-            if contains is not None:
-                filters.append(f"containing '{contains}'")
+    def _candidates(self, tag, attrs, line_number, contains=None):
+        """
+        Narrow a get_node query down using the lazily built indexes.
 
-            filter_desc = " ".join(filters) if filters else ""
-            base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
+        Every element that matches is in the result, but the result may also
+        contain elements that have since been removed or whose attributes
+        changed, so it must be re-checked with _filter_nodes().
+        """
+        self._sync_indexes()
+        if attrs:
+            attr_name, attr_value = next(iter(attrs.items()))
+            return list(self._attr_lookup(tag, attr_name, attr_value))
+        if isinstance(line_number, int) or (
+            isinstance(line_number, range) and line_number.step == 1
+        ):
+            lines, elements = self._line_lookup(tag)
+            if isinstance(line_number, int):
+                line_number = range(line_number, line_number + 1)
+            start = bisect.bisect_left(lines, line_number.start)
+            stop = bisect.bisect_left(lines, line_number.stop)
+            return elements[start:stop]
+        if contains:
+            return self._text_lookup(tag, [html.unescape(contains)])[0]
+        return list(self._tag_lookup(tag))
+
+    def _tag_lookup(self, tag):
+        """Indexed elements with the given tag, as an ordered set (dict keys)."""
+        if self._tag_index is None:
+            self._tag_index = {}
+            for elem in self._dom.getElementsByTagName("*"):
+                self._tag_index.setdefault(elem.tagName, {})[elem] = None
+            self._pending.clear()
+            self._index_in_order = True
+        if self._pending:
+            self._index_in_order = False
+        while self._pending:
+            node = self._pending.pop()
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for elem in [node] + node.getElementsByTagName("*"):
+                self._tag_index.setdefault(elem.tagName, {})[elem] = None
+                self._index_attributes(elem)
+        return self._tag_index.get(tag, {})
+
+    def _index_attributes(self, elem):
+        """Add an element under its current values to the attribute indexes."""
+        for (tag_name, attr_name), values in self._attr_index.items():
+            if tag_name == elem.tagName:
+                values.setdefault(elem.getAttribute(attr_name), {})[elem] = None
+
+    def _attr_lookup(self, tag, attr_name, attr_value):
+        """Indexed elements with the given tag whose attribute had this value."""
+        elements = self._tag_lookup(tag)
+        key = (tag, attr_name)
+        if key not in self._attr_index:
+            values = {}
+            for elem in elements:
+                values.setdefault(elem.getAttribute(attr_name), {})[elem] = None
+            self._attr_index[key] = values
+        return self._attr_index[key].get(attr_value, {})
+
+    def _line_lookup(self, tag):
+        """Sorted start lines of the parsed elements with a tag, and the elements.
+
+        Only elements from the original file have positions, so this index
+        never needs updating; removed elements are filtered out by callers.
+        """
+        if tag not in self._line_index:
+            positioned = sorted(
+                (
+                    (elem.parse_position[0], elem)
+                    for elem in self._tag_lookup(tag)
+                    if getattr(elem, "parse_position", None)
+                ),
+                key=lambda item: item[0],
+            )
+            self._line_index[tag] = (
+                [line for line, _ in positioned],
+                [elem for _, elem in positioned],
+            )
+        return self._line_index[tag]
 
-            # Add helpful hint based on filters used
-            if contains:
-                hint = "Text may be split across elements or use different wording."
-            elif line_number:
-                hint = "Line numbers may have changed if document was modified."
-            elif attrs:
-                hint = "Verify attribute values are correct."
-            else:
-                hint = "Try adding filters (attrs, line_number, or contains)."
+    def _text_lookup(self, tag, patterns):
+        """
+        Find the elements with a tag whose text contains each pattern.
 
-            raise ValueError(f"{base_msg}. {hint}")
-        if len(matches) > 1:
-            raise ValueError(
-                f"Multiple nodes found: <{tag}>. "
-                f"Add more filters (attrs, line_number, or contains) to narrow the search."
-            )
-        return matches[0]
+        Occurrences are located in the text stream (with str.find for a single
+        pattern, or one Aho-Corasick pass for several) and mapped to the
+        enclosing elements through their spans.
+
+        Returns:
+            list[list[Element]]: Candidate elements for each pattern
+        """
+        if self._text_index is None:
+            self._text_index = _build_text_index(self._dom)
+        stream, spans = self._text_index
+        starts, ends, elements, parents = spans.get(tag, ((), (), (), ()))
+
+        found = [set() for _ in patterns]  # List indexes of elements per pattern
+        if len(patterns) == 1 and patterns[0]:
+            text = patterns[0]
+            position = stream.find(text)
+            occurrences = []
+            while position != -1:
+                occurrences.append((position, 0))
+                position = stream.find(text, position + 1)
+        else:
+            occurrences = _find_patterns(stream, patterns)
+
+        for position, which in occurrences:
+            end = position + len(patterns[which])
+            # Elements that contain the occurrence are the last element starting
+            # at or before it and its ancestors with the same tag
+            i = bisect.bisect_right(starts, position) - 1
+            while i >= 0:
+                if ends[i] >= end:
+                    found[which].add(i)
+                i = parents[i]
+
+        for which, pattern in enumerate(patterns):
+            if not pattern:  # Every element contains the empty string
+                found[which] = range(len(elements))
+        return [[elements[i] for i in sorted(indexes)] for indexes in found]
+
+    def _mark_changed(self, nodes):
+        """Record nodes inserted into the DOM (or re-parented) so indexes cover them.
+
+        Also flags the editor as modified.
+        """
+        self._modified = True
+        self._text_index = None
+        self._document_order = None
+        if self._tag_index is not None:
+            self._pending.extend(nodes)
+
+    def _mark_attributes_changed(self, elements):
+        """Record elements whose attributes were changed so lookups see the new values.
+
+        Also flags the editor as modified.
+        """
+        self._modified = True
+        if self._tag_index is not None:
+            for elem in elements:
+                self._index_attributes(elem)
+
+    def _reset_indexes(self):
+        """Discard the lookup indexes; they are rebuilt on the next lookup."""
+        self._tag_index = None
+        self._attr_index = {}
+        self._line_index = {}
+        self._pending = []
+        self._text_index = None
+        # Whether _tag_index is still in document order (nodes indexed from
+        # _pending are appended), and element positions for sorting when not
+        self._index_in_order = True
+        self._document_order = None
+
+    def _sync_indexes(self):
+        """
+        Discard the lookup indexes if the DOM was changed outside this editor.
+
+        Editing methods keep the indexes up to date and then put _SYNCED back
+        into minidom's ID cache, so a missing key means a direct change to
+        the DOM's structure or attributes since, or to the data of an indexed
+        text node (see _IndexedText). If the DOM has no ID cache, or this
+        Python's minidom is not one dom_tracking_supported() accepts, the
+        indexes are rebuilt for every lookup.
+        """
+        cache = getattr(self._dom, "_id_cache", None)
+        if not _DOM_TRACKING or not isinstance(cache, dict) or _SYNCED not in cache:
+            self._reset_indexes()
+            self._mark_synced()
+
+    @contextlib.contextmanager
+    def _edit(self):
+        """
+        Make changes to the DOM that keep the lookup indexes up to date.
+
+        Changes made inside the block must be recorded with _mark_changed()
+        or _mark_attributes_changed() (nodes in _pending may also be changed
+        until the next lookup), so that only changes made outside _edit()
+        blocks make the indexes be rebuilt. If the block raises, the indexes
+        are discarded.
+        """
+        if self._editing:
+            yield
+            return
+        self._sync_indexes()
+        self._editing = True
+        try:
+            yield
+        except BaseException:
+            self._reset_indexes()
+            raise
+        finally:
+            self._editing = False
+        self._mark_synced()
+
+    def _mark_synced(self):
+        """Record that the indexes reflect the DOM (see _sync_indexes)."""
+        cache = getattr(self._dom, "_id_cache", None)
+        if _DOM_TRACKING and isinstance(cache, dict):
+            cache[_SYNCED] = None
+
+    def _is_attached(self, node):
+        """Check whether a node is still part of this editor's document."""
+        while node is not None:
+            if node is self._dom:
+                return True
+            node = node.parentNode
+        return False
 
     def _get_element_text(self, elem):
         """
@@ -203,6 +692,7 @@ class XMLEditor:
                 text_parts.append(self._get_element_text(node))
         return "".join(text_parts)
 
+    @_edit_method
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
@@ -217,13 +707,13 @@ class XMLEditor:
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
+        if self._batch is not None:
+            return self._queue_edit("replace_node", elem, new_content)
         nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
+        self._apply_edit("replace_node", elem, nodes)
         return nodes
 
+    @_edit_method
     def insert_after(self, elem, xml_content):
         """
         Insert XML content after a DOM element.
@@ -238,16 +728,13 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
+        if self._batch is not None:
+            return self._queue_edit("insert_after", elem, xml_content)
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+        self._apply_edit("insert_after", elem, nodes)
         return nodes
 
+    @_edit_method
     def insert_before(self, elem, xml_content):
         """
         Insert XML content before a DOM element.
@@ -262,12 +749,13 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
+        if self._batch is not None:
+            return self._queue_edit("insert_before", elem, xml_content)
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
+        self._apply_edit("insert_before", elem, nodes)
         return nodes
 
+    @_edit_method
     def append_to(self, elem, xml_content):
         """
         Append XML content as a child of a DOM element.
@@ -282,15 +770,208 @@ class XMLEditor:
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
+        if self._batch is not None:
+            return self._queue_edit("append_to", elem, xml_content)
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        self._apply_edit("append_to", elem, nodes)
         return nodes
 
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Collect edits and apply them together when the block exits.
+
+        Inside the block, replace_node(), insert_after(), insert_before() and
+        append_to() are queued. Their return values are lists that are filled
+        with the inserted nodes when the block exits. At that point all
+        fragments are parsed in a single pass and applied in order. If the block
+        raises, or a fragment or target is invalid, nothing is applied. Queries
+        made inside the block see the document as it was before the batch, and
+        other editing methods (such as suggest_deletion) still apply at once.
+
+        Nested batch() blocks join the outermost one.
+
+        Example:
+            with editor.batch():
+                for run, text in edits:
+                    new_nodes = editor.replace_node(run, text)
+            # new_nodes is filled here
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        except BaseException:
+            self._batch = None
+            raise
+        edits, self._batch = self._batch, None
+        self._commit_batch(edits)
+
+    def _queue_edit(self, kind, elem, xml_content):
+        """Queue an edit for the current batch; return the list to fill later."""
+        nodes = []
+        self._batch.append((kind, elem, xml_content, nodes))  # type: ignore
+        return nodes
+
+    @_edit_method
+    def _commit_batch(self, edits):
+        """
+        Apply queued edits in order.
+
+        Returns:
+            List[defusedxml.minidom.Node]: All inserted nodes
+
+        Raises:
+            ValueError: If an edit targets an element that is detached or was
+                replaced earlier in the batch (nothing is applied)
+        """
+        replaced = set()
+        for kind, elem, _, _ in edits:
+            if elem in replaced or (kind != "append_to" and elem.parentNode is None):
+                raise ValueError(
+                    f"Cannot {kind} <{elem.tagName}>: the element was removed "
+                    "from the document earlier in the batch"
+                )
+            if kind == "replace_node":
+                replaced.add(elem)
+
+        fragments = self._parse_fragments([xml for _, _, xml, _ in edits])
+        inserted = []
+        for (kind, elem, _, result), nodes in zip(edits, fragments):
+            self._apply_edit(kind, elem, nodes)
+            result.extend(nodes)
+            inserted.extend(nodes)
+        return inserted
+
+    def _apply_edit(self, kind, elem, nodes):
+        """Insert parsed nodes relative to elem (kind is the editing method name)."""
+        self._record(elem if kind == "append_to" else elem.parentNode)
+        if kind == "append_to":
+            for node in nodes:
+                elem.appendChild(node)
+        elif kind == "insert_after":
+            parent = elem.parentNode
+            next_sibling = elem.nextSibling
+            for node in nodes:
+                if next_sibling:
+                    parent.insertBefore(node, next_sibling)
+                else:
+                    parent.appendChild(node)
+        else:
+            parent = elem.parentNode
+            for node in nodes:
+                parent.insertBefore(node, elem)
+            if kind == "replace_node":
+                parent.removeChild(elem)
+        self._mark_changed(nodes)
+
+    @contextlib.contextmanager
+    def _unbatched(self):
+        """Apply edits immediately, even inside a batch() block."""
+        batch, self._batch = self._batch, None
+        try:
+            yield
+        finally:
+            self._batch = batch
+
+    def checkpoint(self):
+        """
+        Mark the current state of the DOM as the one rollback() returns to.
+
+        From here on, every node changed through this editor's methods has
+        its previous children and attributes recorded the first time it
+        changes. Recording costs time proportional to the edited nodes, not
+        to the document. Changes made directly on the DOM are not recorded;
+        call record(node) before making them to include them.
+
+        Example:
+            editor.checkpoint()
+            editor.suggest_deletion(run)
+            editor.rollback()  # run is back where it was, unchanged
+        """
+        self._journal = {}
+        self._checkpoint_modified = self._modified
+
+    @_edit_method
+    def rollback(self):
+        """
+        Undo the edits made through this editor since the last checkpoint().
+
+        Nodes that were removed or moved are put back (the same node objects,
+        so references taken before the checkpoint stay valid), and nodes
+        inserted since are detached. The checkpoint stays active, so edits can
+        be retried and rolled back again.
+
+        Raises:
+            ValueError: If checkpoint() was never called, or inside batch()
+        """
+        if self._journal is None:
+            raise ValueError("rollback() requires a previous checkpoint()")
+        if self._batch is not None:
+            raise ValueError("Cannot roll back inside batch()")
+
+        restored = []
+        for node, (children, attributes) in reversed(self._journal.items()):
+            restored.extend(_restore_node(node, children, attributes))
+        elements = [
+            node for node in self._journal if node.nodeType == node.ELEMENT_NODE
+        ]
+        self._journal = {}
+
+        # Re-attached nodes may have been dropped from indexes built since
+        if restored:
+            self._line_index = {}
+        self._mark_changed(restored)
+        self._mark_attributes_changed(elements)
+        self._modified = self._checkpoint_modified
+
+    def record(self, node, deep=False):
+        """
+        Record a node before changing it directly, so rollback() restores it.
+
+        Only needed for changes made on the DOM rather than through this
+        editor's methods. Does nothing without a checkpoint().
+
+        Args:
+            node: Element whose children or attributes are about to change
+            deep: If True, also record every descendant element
+
+        Example:
+            editor.checkpoint()
+            editor.record(paragraph)
+            paragraph.removeChild(paragraph.lastChild)
+            editor.rollback()  # The child is back
+        """
+        self._record(node, deep=deep)
+
+    def _record(self, node, deep=False):
+        """
+        Record a node's children and attributes before it is changed.
+
+        Only the first record of a node since checkpoint() is kept, as that
+        is the state rollback() restores. Does nothing without a checkpoint.
+
+        Args:
+            node: Element (or document) about to be changed
+            deep: If True, also record every descendant element
+        """
+        if self._journal is None:
+            return
+        for elem in [node, *node.getElementsByTagName("*")] if deep else [node]:
+            if elem not in self._journal:
+                attributes = (
+                    [(attr, attr.value) for attr in elem.attributes.values()]
+                    if elem.hasAttributes()
+                    else []
+                )
+                self._journal[elem] = (list(elem.childNodes), attributes)
+
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
+        for rel_elem in self._dom.getElementsByTagName("Relationship"):
             rel_id = rel_elem.getAttribute("Id")
             if rel_id.startswith("rId"):
                 try:
@@ -303,11 +984,18 @@ class XMLEditor:
         """
         Save the edited XML back to the file.
 
-        Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        Streams the serialized DOM tree back to the original file path,
+        preserving the original encoding (ascii or utf-8). A sidecar index, if
+        present, is rewritten to match the saved file.
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        with open(self.xml_path, "wb") as f:
+            write_xml(self._dom, f, encoding=self.encoding)
+        if index_path(self.xml_path).exists():
+            write_index(self.xml_path)
+        self._modified = False
+        if self._journal is not None:
+            # After a rollback, the file differs if edits since the checkpoint were saved
+            self._checkpoint_modified = bool(self._journal)
 
     def _parse_fragment(self, xml_content):
         """
@@ -322,25 +1010,430 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
-        # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
-        namespaces = []
-        if root_elem and root_elem.attributes:
-            for i in range(root_elem.attributes.length):
-                attr = root_elem.attributes.item(i)
-                if attr.name.startswith("xmlns"):  # type: ignore
-                    namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
-
-        ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
-        fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
-        return nodes
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, xml_contents):
+        """
+        Parse XML fragments and import them.
+
+        Fragments seen recently are cloned from a cache of parsed templates;
+        the others are parsed together in one pass.
+
+        Args:
+            xml_contents: List of strings, each containing an XML fragment
+
+        Returns:
+            List of lists of defusedxml.minidom.Node objects imported into this
+            document, one list per fragment
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+        """
+        ns_decl = self._namespace_declarations()
+        cache = self._fragment_cache
+        missing = list(dict.fromkeys(x for x in xml_contents if x not in cache))
+
+        parsed = {}
+        if missing:
+            body = "".join(f"<fragment>{xml}</fragment>" for xml in missing)
+            try:
+                wrapper = f"<root {ns_decl}>{body}</root>"
+                fragment_doc = defusedxml.minidom.parseString(wrapper)
+            except ExpatError:
+                if len(missing) == 1:
+                    raise
+                # Report the error against the fragment that caused it
+                for xml in missing:
+                    self._parse_fragments([xml])
+                raise
+
+            fragments = fragment_doc.documentElement.childNodes  # type: ignore
+            for xml, fragment in zip(missing, fragments):
+                elements = [
+                    n for n in fragment.childNodes if n.nodeType == n.ELEMENT_NODE
+                ]
+                assert elements, "Fragment must contain at least one element"
+                parsed[xml] = fragment
+                if len(xml) <= _FRAGMENT_CACHE_MAX_LENGTH:
+                    cache[xml] = fragment
+                    if len(cache) > _FRAGMENT_CACHE_SIZE:
+                        cache.popitem(last=False)
+
+        results = []
+        for xml in xml_contents:
+            fragment = parsed.get(xml)
+            if fragment is None:
+                fragment = cache[xml]
+                cache.move_to_end(xml)
+            results.append(
+                [self._dom.importNode(child, deep=True) for child in fragment.childNodes]
+            )
+        return results
+
+    def _namespace_declarations(self):
+        """
+        Return the root element's xmlns declarations as attribute text.
+
+        The result is cached until the root gains or loses attributes (e.g. a
+        namespace added by DocxXMLEditor), which also empties the fragment
+        cache since parsed templates depend on the declarations.
+        """
+        root_elem = self._dom.documentElement
+        key = (root_elem, root_elem.attributes.length if root_elem else 0)
+        if self._namespace_cache is None or self._namespace_cache[0] != key:
+            namespaces = []
+            if root_elem and root_elem.attributes:
+                for i in range(root_elem.attributes.length):
+                    attr = root_elem.attributes.item(i)
+                    if attr.name.startswith("xmlns"):  # type: ignore
+                        namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
+            self._namespace_cache = (key, " ".join(namespaces))
+            self._fragment_cache.clear()
+        return self._namespace_cache[1]
+
+
+def read_node(xml_path, tag: str, line_number: Union[int, range]):
+    """
+    Read a single element by line number without parsing the whole file.
+
+    The sidecar index written by unpack.py (built now if missing or stale) gives
+    the element's byte range, so only that fragment is read and parsed. The
+    element belongs to a standalone document: use XMLEditor to edit it.
+
+    Args:
+        xml_path: Path to a pretty-printed XML part
+        tag: The XML tag name (e.g., "w:p", "w:tbl")
+        line_number: Line number (int) or line range (range) of the element's
+                     start tag (1-indexed)
+
+    Returns:
+        defusedxml.minidom.Element: The element, with parse_position attributes
+        on it and its descendants
+
+    Raises:
+        ValueError: If node not found or multiple matches found
+
+    Example:
+        para = read_node("unpacked/word/document.xml", tag="w:p", line_number=519)
+    """
+    xml_path = Path(xml_path)
+    content = xml_path.read_bytes()
+    entries = load_index(xml_path, content) or write_index(xml_path, content)
+
+    lines = line_number if isinstance(line_number, range) else [line_number]
+    matches = [e for e in entries if e.tag == tag and e.line in lines]
+    if not matches:
+        raise ValueError(
+            f"Node not found: <{tag}> at line {line_number}. "
+            "Line numbers may have changed if document was modified."
+        )
+    if len(matches) > 1:
+        raise ValueError(
+            f"Multiple nodes found: <{tag}>. Narrow the line range to one element."
+        )
+
+    entry = matches[0]
+    fragment, declarations = read_fragment(xml_path, entry, entries)
+    wrapper = f"<root {' '.join(declarations)}>".encode() + fragment + b"</root>"
+    root = defusedxml.minidom.parseString(wrapper).documentElement
+    elem = next(
+        node
+        for node in root.childNodes  # type: ignore
+        if node.nodeType == node.ELEMENT_NODE
+    )
+    inside = [e for e in entries if entry.start <= e.start < entry.end]
+    _apply_positions([elem] + elem.getElementsByTagName("*"), inside)
+    return elem
+
+
+def _restore_node(node, children, attributes):
+    """
+    Give a node back the children and attributes recorded by XMLEditor._record().
+
+    Returns:
+        list: The children that had been detached or moved and are now back
+    """
+    if node.nodeType == node.ELEMENT_NODE:
+        current = list(node.attributes.values()) if node.hasAttributes() else []
+        if [(attr, attr.value) for attr in current] != attributes:
+            # Re-add the original Attr objects so their order is kept too
+            for attr in current:
+                node.removeAttributeNode(attr)
+            for attr, value in attributes:
+                if attr.value == value:
+                    node.setAttributeNode(attr)
+                else:
+                    # Parsed Attr objects cannot be given a new value in place
+                    node.setAttribute(attr.name, value)
+
+    current = list(node.childNodes)
+    if current == children:
+        return []
+    for child in current:
+        if child.parentNode is node:
+            child.parentNode = child.previousSibling = child.nextSibling = None
+    kept = set(current)
+    returned = [child for child in children if child not in kept]
+    for child in returned:
+        if child.parentNode is not None:
+            child.parentNode.removeChild(child)
+    for child in children:
+        child.parentNode = node
+    node.childNodes[:] = children
+    for previous, child in zip([None, *children], children):
+        child.previousSibling = previous
+        if previous is not None:
+            previous.nextSibling = child
+    if children:
+        children[-1].nextSibling = None
+    return returned
+
+
+def _build_text_index(dom):
+    """
+    Concatenate the document's text and record every element's span in it.
+
+    The text is what _get_element_text() returns for the root (whitespace-only
+    text nodes are skipped), so an element's text is stream[start:end].
+
+    Returns:
+        tuple: (stream, spans), where spans maps each tag to parallel lists of
+        start offsets, end offsets, elements (in document order) and the list
+        index of the nearest enclosing element with the same tag (-1 if none)
+    """
+    chunks = []
+    length = 0
+    spans = {}
+    open_by_tag = {}  # Tag -> list indexes of the open elements with that tag
+
+    def visit(node):
+        nonlocal length
+        for child in node.childNodes:
+            if child.nodeType == child.TEXT_NODE:
+                if _DOM_TRACKING and child.__class__ is minidom.Text:
+                    child.__class__ = _IndexedText
+                if child.data.strip():
+                    chunks.append(child.data)
+                    length += len(child.data)
+            elif child.nodeType == child.ELEMENT_NODE:
+                starts, ends, elements, parents = spans.setdefault(
+                    child.tagName, ([], [], [], [])
+                )
+                stack = open_by_tag.setdefault(child.tagName, [])
+                i = len(elements)
+                starts.append(length)
+                ends.append(None)
+                elements.append(child)
+                parents.append(stack[-1] if stack else -1)
+                stack.append(i)
+                visit(child)
+                stack.pop()
+                ends[i] = length
+
+    visit(dom)
+    return "".join(chunks), spans
+
+
+class _IndexedText(minidom.Text):
+    """
+    Text node whose data changes count as direct DOM changes.
+
+    minidom does not clear its ID cache when text data changes, so
+    _build_text_index() gives the text nodes it reads this class, which
+    removes _SYNCED from the cache when the data is set or edited.
+    """
+
+    __slots__ = ()
+
+    def _set_data(self, data):
+        _unsync(self)
+        self._data = data
+
+    data = nodeValue = property(minidom.Text._get_data, _set_data)
+
+    def appendData(self, arg):
+        _unsync(self)
+        super().appendData(arg)
+
+    def insertData(self, offset, arg):
+        _unsync(self)
+        super().insertData(offset, arg)
+
+    def deleteData(self, offset, count):
+        _unsync(self)
+        super().deleteData(offset, count)
+
+    def replaceData(self, offset, count, arg):
+        _unsync(self)
+        super().replaceData(offset, count, arg)
+
+
+def dom_tracking_supported():
+    """Return True if direct DOM changes can be detected through minidom internals.
+
+    The running Python must be in DOM_TRACKING_VERSIONS, and minidom must
+    clear a document's ID cache on changes and keep text data in a _data slot,
+    which _IndexedText relies on.
+    """
+    low, high = DOM_TRACKING_VERSIONS
+    if not low <= sys.version_info[:2] <= high:
+        return False
+    return (
+        callable(getattr(minidom, "_clear_id_cache", None))
+        and isinstance(minidom.Document()._id_cache, dict)
+        and "_data" in getattr(minidom.CharacterData, "__slots__", ())
+        and minidom.Text.__slots__ == ()
+    )
+
+
+_DOM_TRACKING = dom_tracking_supported()
+
+
+def _unsync(node):
+    """Remove _SYNCED from the ID cache of a node's document."""
+    cache = getattr(node.ownerDocument, "_id_cache", None)
+    if isinstance(cache, dict):
+        cache.pop(_SYNCED, None)
+
+
+def _find_patterns(text, patterns):
+    """
+    Find every occurrence of several patterns in one pass (Aho-Corasick).
+
+    Args:
+        text: String to search
+        patterns: List of strings; empty strings are ignored
+
+    Returns:
+        list[tuple[int, int]]: (start offset, pattern index) of each occurrence,
+        including overlapping ones
+    """
+    # Trie of the patterns: transitions, failure links and matched patterns
+    goto = [{}]
+    fail = [0]
+    output = [[]]
+    for which, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                output.append([])
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        output[state].append(which)
+
+    # Breadth-first, so failure targets are complete before they are used
+    queue = list(goto[0].values())
+    for state in queue:
+        for char, target in goto[state].items():
+            queue.append(target)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[target] = goto[fallback].get(char, 0)
+            output[target] = output[target] + output[fail[target]]
+
+    occurrences = []
+    state = 0
+    for end, char in enumerate(text, 1):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        for which in output[state]:
+            occurrences.append((end - len(patterns[which]), which))
+    return occurrences
+
+
+def _parse_without_positions(content):
+    """
+    Parse with the expat DOM builder into the same tree the SAX path builds.
+
+    The SAX path drops comments and the doctype and turns CDATA sections into
+    plain text, so the builder is configured to do the same.
+
+    Args:
+        content: XML document as bytes
+
+    Returns:
+        defusedxml.minidom.Document: The parsed document
+    """
+    options = Options()
+    options.comments = False
+    options.cdata_sections = False
+    dom = DefusedExpatBuilderNS(options).parseString(content)
+    if dom.doctype:
+        dom.removeChild(dom.doctype)
+    return dom
+
+
+def _apply_positions(elements, entries):
+    """
+    Copy index positions onto elements as parse_position attributes.
+
+    Args:
+        elements: Elements in document order
+        entries: Index entries for the same elements, in the same order
+
+    Returns:
+        bool: False if the elements do not match the entries
+    """
+    if len(elements) != len(entries):
+        return False
+    for elem, entry in zip(elements, entries):
+        if elem.tagName != entry.tag:
+            return False
+        elem.parse_position = (entry.line, entry.column)
+    return True
+
+
+def _apply_scanned_positions(elements, content):
+    """
+    Set parse_position by locating each element's start tag in the raw bytes.
+
+    Lines and columns are counted the way expat reports them (columns in
+    characters, CRLF as one line break), so the result matches the SAX parser.
+
+    Args:
+        elements: Elements parsed from the content, in document order
+        content: XML document as bytes
+
+    Returns:
+        bool: False if the start tags found do not match the elements
+    """
+    if re.search(rb"\r(?!\n)", content):
+        return False  # Bare CR line breaks are counted differently by expat
+    ascii_only = content.isascii()
+    bom = len(codecs.BOM_UTF8) if content.startswith(codecs.BOM_UTF8) else 0
+    line, line_start, chars_at, chars = 1, bom, bom, 0
+    count = 0
+    for match in _MARKUP_PATTERN.finditer(content):
+        tag = match.group(1)
+        if tag is None:
+            continue
+        offset = match.start()
+        newlines = content.count(b"\n", line_start, offset)
+        if newlines:
+            line += newlines
+            line_start = chars_at = content.rindex(b"\n", line_start, offset) + 1
+            chars = 0
+        if ascii_only:
+            column = offset - line_start
+        else:
+            try:
+                chars += len(content[chars_at:offset].decode("utf-8"))
+            except UnicodeDecodeError:
+                return False
+            chars_at = offset
+            column = chars
+
+        if count == len(elements) or elements[count].tagName != tag.decode():
+            return False
+        elements[count].parse_position = (line, column)
+        count += 1
+    return count == len(elements)
 
 
 def _create_line_tracking_parser():
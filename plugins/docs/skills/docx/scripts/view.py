@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Read-only view of a Word document for analysis passes.
+
+DocumentView streams word/document.xml (and word/comments.xml) once, straight
+from the .docx or an unpacked directory, into compact tables: one string with
+all the text, and arrays of offsets into it for paragraphs, runs, tracked
+changes and comment anchors. No DOM is built and nothing is extracted to
+disk, so memory stays close to the size of the text itself instead of the
+10-20x of a parsed DOM. Use Document to edit; use DocumentView to read many
+documents quickly.
+
+Text is what the runs show: w:t and w:delText, with w:tab as a tab and
+w:br/w:cr as a newline. Deleted text is part of the stream so deletions can be
+reported; the paragraph methods leave it out unless deleted=True. Changes
+recorded in properties (an inserted or deleted paragraph mark or table row,
+w:rPrChange, w:pPrChange, ...) are reported without text.
+
+Example usage:
+    view = DocumentView("contract.docx")
+    for text in view.iter_paragraphs():
+        ...
+    for change in view.iter_changes():
+        print(change.kind, change.author, change.text)
+    for comment in view.iter_comments():
+        print(comment.author, comment.text, "on", comment.anchor)
+    view.summary()  # Counts of paragraphs, runs, changes and comments
+"""
+
+import array
+import bisect
+import collections
+import io
+import sys
+import xml.sax.handler
+import zipfile
+from pathlib import Path
+
+import defusedxml.sax
+
+DOCUMENT_PART = "word/document.xml"
+COMMENTS_PART = "word/comments.xml"
+
+# Tracked change elements and the kind reported for each
+CHANGE_KINDS = {
+    "w:ins": "insertion",
+    "w:del": "deletion",
+    "w:moveTo": "move-to",
+    "w:moveFrom": "move-from",
+}
+# Kind reported for formatting changes (w:rPrChange, w:pPrChange, ...)
+FORMATTING = "formatting"
+_KIND_NAMES = (*CHANGE_KINDS.values(), FORMATTING)
+_KIND_CODES = {tag: code for code, tag in enumerate(CHANGE_KINDS)}
+_FORMATTING_CODE = len(CHANGE_KINDS)
+
+# Elements whose character data is run text
+_TEXT_ELEMENTS = {"w:t", "w:delText"}
+# Run content standing for a character
+_RUN_CHARACTERS = {"w:tab": "\t", "w:br": "\n", "w:cr": "\n"}
+
+Run = collections.namedtuple("Run", "paragraph text change")
+Change = collections.namedtuple("Change", "kind id author date paragraph text")
+Comment = collections.namedtuple(
+    "Comment", "id author initials date text paragraph anchor"
+)
+
+
+class DocumentView:
+    """
+    Compact, read-only tables of a document's text, changes and comments.
+
+    Paragraphs, runs, changes and comments are numbered in document order
+    (by where they start). Indexes of -1 mean "none". Paragraphs nested in
+    others (text boxes) are numbered separately, and their text is also part
+    of the enclosing paragraph.
+
+    Attributes:
+        source: The .docx file or unpacked directory that was read
+        paragraph_count: Number of w:p elements
+        run_count: Number of w:r elements
+        change_count: Number of tracked insertions, deletions, moves and
+                      formatting changes
+        comment_count: Number of comments anchored in the document
+    """
+
+    def __init__(self, source):
+        """
+        Read a document into compact tables.
+
+        Args:
+            source: Path to a .docx file or a directory written by unpack.py
+
+        Raises:
+            ValueError: If the source or its word/document.xml does not exist
+        """
+        self.source = Path(source)
+        if not self.source.exists():
+            raise ValueError(f"Source not found: {source}")
+
+        handler = _DocumentHandler()
+        with _open_part(self.source, DOCUMENT_PART) as stream:
+            if stream is None:
+                raise ValueError(f"{DOCUMENT_PART} not found in {source}")
+            _parse(stream, handler)
+        metadata = {}
+        with _open_part(self.source, COMMENTS_PART) as stream:
+            if stream is not None:
+                comments = _CommentsHandler(handler.intern)
+                _parse(stream, comments)
+                metadata = comments.comments
+
+        self._text = handler.text.getvalue()
+        self._strings = handler.strings
+        self._paragraphs = handler.paragraphs
+        self._runs = handler.runs
+        self._changes = handler.changes
+        self._comments = handler.comments
+        self._comment_metadata = metadata
+        self._deleted_starts, self._deleted_ends = handler.deleted
+
+        self.paragraph_count = len(self._paragraphs["start"])
+        self.run_count = len(self._runs["start"])
+        self.change_count = len(self._changes["start"])
+        self.comment_count = len(self._comments["start"])
+
+    def paragraph_text(self, index, deleted=False):
+        """
+        Get the text of a paragraph.
+
+        Args:
+            index: Paragraph number (0-based, document order)
+            deleted: If True, include text in tracked deletions
+
+        Returns:
+            str: The paragraph's text
+        """
+        table = self._paragraphs
+        return self._slice(table["start"][index], table["end"][index], deleted)
+
+    def paragraph_style(self, index):
+        """Get a paragraph's style ID (w:pStyle), or None if it has none."""
+        return self._string(self._paragraphs["style"][index])
+
+    def iter_paragraphs(self, deleted=False):
+        """
+        Iterate over the text of every paragraph.
+
+        Args:
+            deleted: If True, include text in tracked deletions
+
+        Yields:
+            str: Paragraph text, in document order
+        """
+        starts, ends = self._paragraphs["start"], self._paragraphs["end"]
+        for start, end in zip(starts, ends):
+            yield self._slice(start, end, deleted)
+
+    def iter_runs(self):
+        """
+        Iterate over the runs.
+
+        Yields:
+            Run: (paragraph, text, change) with the indexes of the run's
+            paragraph and of its innermost tracked change
+        """
+        table = self._runs
+        text = self._text
+        for start, end, paragraph, change in zip(
+            table["start"], table["end"], table["paragraph"], table["change"]
+        ):
+            yield Run(paragraph, text[start:end], change)
+
+    def iter_changes(self):
+        """
+        Iterate over the tracked insertions, deletions, moves and formatting changes.
+
+        Yields:
+            Change: (kind, id, author, date, paragraph, text), with kind one of
+            the values of CHANGE_KINDS or FORMATTING. Text is empty for changes
+            made in properties, such as a deleted paragraph mark.
+        """
+        table = self._changes
+        text = self._text
+        for i in range(self.change_count):
+            yield Change(
+                _KIND_NAMES[table["kind"][i]],
+                self._string(table["id"][i]),
+                self._string(table["author"][i]),
+                self._string(table["date"][i]),
+                table["paragraph"][i],
+                text[table["start"][i] : table["end"][i]],
+            )
+
+    def iter_comments(self):
+        """
+        Iterate over the comments anchored in the document.
+
+        Yields:
+            Comment: (id, author, initials, date, text, paragraph, anchor), where
+            text is the comment's own text (paragraphs joined by newlines) and
+            anchor the document text between its range start and end
+        """
+        table = self._comments
+        for i in range(self.comment_count):
+            comment_id = self._string(table["id"][i])
+            author, initials, date, text = self._comment_metadata.get(
+                comment_id, (-1, -1, -1, "")
+            )
+            yield Comment(
+                comment_id,
+                self._string(author),
+                self._string(initials),
+                self._string(date),
+                text,
+                table["paragraph"][i],
+                self._slice(table["start"][i], table["end"][i], True),
+            )
+
+    def summary(self):
+        """
+        Count the document's content.
+
+        Returns:
+            dict: Numbers of paragraphs, runs, characters (without deleted
+            text), comments and changes of each kind, plus "authors" mapping
+            each author of changes or comments to their counts
+        """
+        kinds = collections.Counter(self._changes["kind"])
+        authors = collections.defaultdict(collections.Counter)
+        for kind, author in zip(self._changes["kind"], self._changes["author"]):
+            authors[self._string(author)][_KIND_NAMES[kind]] += 1
+        for comment in self.iter_comments():
+            authors[comment.author]["comment"] += 1
+        deleted = sum(
+            end - start for start, end in zip(self._deleted_starts, self._deleted_ends)
+        )
+        return {
+            "paragraphs": self.paragraph_count,
+            "runs": self.run_count,
+            "characters": len(self._text) - deleted,
+            "comments": self.comment_count,
+            **{name: kinds[code] for code, name in enumerate(_KIND_NAMES)},
+            "authors": {author: dict(counts) for author, counts in authors.items()},
+        }
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the tables, in bytes."""
+        tables = (self._paragraphs, self._runs, self._changes, self._comments)
+        total = sys.getsizeof(self._text)
+        total += sum(sys.getsizeof(s) for s in self._strings)
+        total += sum(
+            column.itemsize * len(column)
+            for table in tables
+            for column in table.values()
+        )
+        total += 4 * (len(self._deleted_starts) + len(self._deleted_ends))
+        return total
+
+    def _string(self, index):
+        return None if index < 0 else self._strings[index]
+
+    def _slice(self, start, end, deleted):
+        """Text between two offsets, without deleted ranges unless deleted=True."""
+        if deleted:
+            return self._text[start:end]
+        starts, ends = self._deleted_starts, self._deleted_ends
+        i = bisect.bisect_right(ends, start)
+        if i == len(starts) or starts[i] >= end:
+            return self._text[start:end]
+        pieces = []
+        while i < len(starts) and starts[i] < end:
+            if starts[i] > start:
+                pieces.append(self._text[start : starts[i]])
+            start = max(start, ends[i])
+            i += 1
+        pieces.append(self._text[start:end])
+        return "".join(pieces)
+
+
+class _DocumentHandler(xml.sax.handler.ContentHandler):
+    """SAX handler filling the DocumentView tables from document.xml."""
+
+    def __init__(self):
+        super().__init__()
+        self.text = io.StringIO()
+        self.length = 0
+        self.strings = []
+        self._string_index = {}
+
+        self.paragraphs = _table("start", "end", "style")
+        self.runs = _table("start", "end", "paragraph", "change")
+        self.changes = _table("start", "end", "kind", "id", "author", "date", "paragraph")
+        self.comments = _table("start", "end", "id", "paragraph")
+        self.changes["kind"] = array.array("b")
+        self.deleted = (array.array("i"), array.array("i"))
+
+        self._open_paragraphs = []
+        self._open_runs = []
+        self._open_changes = []
+        self._open_comments = {}  # Comment ID -> row in self.comments
+        self._properties = 0  # Depth of *Pr elements (formatting, not content)
+        self._former = False  # Inside the previous properties of a *PrChange
+        self._text_element = None
+
+    def intern(self, value):
+        """Store a string once and return its index (-1 for None)."""
+        if value is None:
+            return -1
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def startElement(self, name, attrs):
+        if self._properties:
+            if name.endswith("Pr"):
+                self._properties += 1
+            if self._former:
+                return
+            if name == "w:pStyle" and self._open_paragraphs:
+                self.paragraphs["style"][self._open_paragraphs[-1]] = self.intern(
+                    attrs.get("w:val")
+                )
+            elif name in CHANGE_KINDS:
+                # Paragraph mark or table row change: no content of its own
+                self._add_change(_KIND_CODES[name], attrs)
+            elif name.endswith("PrChange"):
+                self._add_change(_FORMATTING_CODE, attrs)
+                self._former = True
+            return
+        if name.endswith("Pr"):
+            self._properties = 1
+        elif name in _TEXT_ELEMENTS:
+            self._text_element = name
+        elif name in _RUN_CHARACTERS:
+            if self._open_runs:
+                self._write(_RUN_CHARACTERS[name], deleted=False)
+        elif name == "w:r":
+            runs = self.runs
+            self._open_runs.append(len(runs["start"]))
+            _append_row(
+                runs,
+                self.length,
+                self.length,
+                self._paragraph(),
+                self._open_changes[-1] if self._open_changes else -1,
+            )
+        elif name == "w:p":
+            self._open_paragraphs.append(len(self.paragraphs["start"]))
+            _append_row(self.paragraphs, self.length, self.length, -1)
+        elif name in CHANGE_KINDS:
+            self._open_changes.append(self._add_change(_KIND_CODES[name], attrs))
+        elif name == "w:commentRangeStart":
+            comment_id = attrs.get("w:id")
+            paragraph = self._paragraph()
+            if paragraph < 0:
+                # A range may start just before the paragraph it covers
+                paragraph = len(self.paragraphs["start"])
+            self._open_comments[comment_id] = len(self.comments["start"])
+            _append_row(
+                self.comments,
+                self.length,
+                self.length,
+                self.intern(comment_id),
+                paragraph,
+            )
+        elif name == "w:commentRangeEnd":
+            row = self._open_comments.pop(attrs.get("w:id"), None)
+            if row is not None:
+                self.comments["end"][row] = self.length
+
+    def endElement(self, name):
+        if self._properties:
+            if name.endswith("Pr"):
+                self._properties -= 1
+            elif name.endswith("PrChange"):
+                self._former = False
+            return
+        if name in _TEXT_ELEMENTS:
+            self._text_element = None
+        elif name == "w:r":
+            self.runs["end"][self._open_runs.pop()] = self.length
+        elif name == "w:p":
+            self.paragraphs["end"][self._open_paragraphs.pop()] = self.length
+        elif name in CHANGE_KINDS:
+            self.changes["end"][self._open_changes.pop()] = self.length
+
+    def characters(self, content):
+        if self._text_element and not self._properties:
+            self._write(content, deleted=self._text_element == "w:delText")
+
+    def _write(self, content, deleted):
+        if deleted:
+            starts, ends = self.deleted
+            if ends and ends[-1] == self.length:
+                ends[-1] += len(content)  # Extend the previous deleted range
+            else:
+                starts.append(self.length)
+                ends.append(self.length + len(content))
+        self.text.write(content)
+        self.length += len(content)
+
+    def _add_change(self, kind, attrs):
+        """Add a change starting at the current offset and return its row."""
+        changes = self.changes
+        row = len(changes["start"])
+        _append_row(
+            changes,
+            self.length,
+            self.length,
+            kind,
+            self.intern(attrs.get("w:id")),
+            self.intern(attrs.get("w:author")),
+            self.intern(attrs.get("w:date")),
+            self._paragraph(),
+        )
+        return row
+
+    def _paragraph(self):
+        return self._open_paragraphs[-1] if self._open_paragraphs else -1
+
+
+class _CommentsHandler(xml.sax.handler.ContentHandler):
+    """SAX handler collecting comment metadata and text from comments.xml."""
+
+    def __init__(self, intern):
+        super().__init__()
+        self._intern = intern
+        self.comments = {}  # ID -> (author, initials, date, text)
+        self._current = None
+        self._paragraphs = []
+        self._in_text = False
+
+    def startElement(self, name, attrs):
+        if name == "w:comment":
+            self._current = (
+                attrs.get("w:id"),
+                self._intern(attrs.get("w:author")),
+                self._intern(attrs.get("w:initials")),
+                self._intern(attrs.get("w:date")),
+            )
+            self._paragraphs = []
+        elif self._current is None:
+            return
+        elif name == "w:p":
+            self._paragraphs.append([])
+        elif name == "w:t":
+            self._in_text = True
+        elif name in _RUN_CHARACTERS and self._paragraphs:
+            self._paragraphs[-1].append(_RUN_CHARACTERS[name])
+
+    def endElement(self, name):
+        if name == "w:t":
+            self._in_text = False
+        elif name == "w:comment" and self._current is not None:
+            comment_id, *metadata = self._current
+            text = "\n".join("".join(parts) for parts in self._paragraphs)
+            self.comments[comment_id] = (*metadata, text)
+            self._current = None
+
+    def characters(self, content):
+        if self._in_text and self._paragraphs:
+            self._paragraphs[-1].append(content)
+
+
+def _table(*columns):
+    """Columns of 32-bit integers, one array per column."""
+    return {column: array.array("i") for column in columns}
+
+
+def _append_row(table, *values):
+    for column, value in zip(table.values(), values):
+        column.append(value)
+
+
+def _open_part(source, part):
+    """Open a part of a .docx file or unpacked directory as a binary stream.
+
+    Returns a context manager yielding None if the part does not exist.
+    """
+    if source.is_dir():
+        path = source / part
+        return open(path, "rb") if path.is_file() else _Missing()
+    archive = zipfile.ZipFile(source)
+    try:
+        stream = archive.open(part)
+    except KeyError:
+        archive.close()
+        return _Missing()
+    archive.close()  # The member stream keeps its own handle on the file
+    return stream
+
+
+class _Missing:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def _parse(stream, handler):
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(handler)
+    parser.parse(stream)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Lazy workspace over a packed Office file (.docx, .pptx, .xlsx).
+
+PackageWorkspace exposes the parts of an archive through paths without
+unpacking it. XML parts are extracted the first time they are used, and are
+pretty-printed the same way unpack.py does. Binary parts (media, fonts,
+embeddings) stay inside the source archive until pack time, so temp-disk usage
+and setup time scale with what is edited rather than with the file size.
+
+The source can also be a directory written by unpack.py. Parts are then copied
+into the workspace on first use (copy-on-write), and the directory itself is
+never modified.
+
+Any file written under the workspace root takes precedence over the source's
+part of the same name, so parts can also be replaced in place (for example
+`ws.root / "word/media/image1.png"`) without going through path().
+
+Example usage:
+    ws = PackageWorkspace("contract.docx")
+
+    # Only document.xml is extracted
+    editor = XMLEditor(ws / "word/document.xml")
+    editor.save()
+
+    # Or edit through the Document library
+    doc = Document(ws)
+
+    # Write a new archive: edited parts from disk, the rest from the source
+    ws.pack("contract-edited.docx")
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+import zipfile
+from pathlib import Path
+
+from ooxml.scripts.pack import copy_raw_member, unchanged_member, write_condensed_xml
+from ooxml.scripts.unpack import (
+    INDEX_SUFFIX,
+    XML_SUFFIXES,
+    index_path,
+    pretty_print_xml,
+    write_index,
+)
+
+
+class PackageWorkspace:
+    """Unpack-on-demand view of an Office archive.
+
+    Attributes:
+        source: Path to the source archive
+        root: Directory holding the parts extracted or created so far
+    """
+
+    def __init__(self, source, root=None):
+        """
+        Open a workspace over an Office archive or unpacked directory.
+
+        Args:
+            source: Path to the .docx/.pptx/.xlsx file, or to a directory
+                    written by unpack.py
+            root: Optional directory for extracted parts. A temporary directory
+                  is created (and removed by cleanup()) if not provided. Files
+                  already in it take precedence over the source's parts.
+
+        Raises:
+            ValueError: If the source is neither a readable zip archive nor a
+                        directory
+        """
+        self.source = Path(source)
+        if self.source.is_dir():
+            # Members map to the files of the directory
+            self._zip = None
+            self._source_file = None
+            self._members = {
+                f.relative_to(self.source).as_posix(): f
+                for f in self.source.rglob("*")
+                if f.is_file() and f.suffix != INDEX_SUFFIX
+            }
+        elif zipfile.is_zipfile(self.source):
+            self._zip = zipfile.ZipFile(self.source)
+            # Raw handle on the same file for copying members without decompressing
+            self._source_file = open(self.source, "rb")
+            self._members = {
+                info.filename: info
+                for info in self._zip.infolist()
+                if not info.is_dir()
+            }
+        else:
+            raise ValueError(f"Not an Office archive or directory: {source}")
+
+        self._owns_root = root is None
+        self.root = Path(root or tempfile.mkdtemp(prefix="ooxml_ws_"))
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Parts whose on-disk copy is authoritative
+        self._materialized = set()
+
+    def __truediv__(self, name):
+        """Return a lazy path to a part, e.g. `workspace / "word/document.xml"`."""
+        return WorkspacePath(self, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
+
+    def __del__(self):
+        """Clean up temporary directory on deletion."""
+        if hasattr(self, "_zip"):
+            self.cleanup()
+
+    def names(self):
+        """List the names of all parts, including ones created in the workspace."""
+        return list(self._members) + sorted(self._new_files())
+
+    def exists(self, name):
+        """Check whether a part exists without extracting it."""
+        name = _normalize(name)
+        return name in self._members or (self.root / name).is_file()
+
+    def is_materialized(self, name):
+        """
+        Check whether the workspace root holds a part's current content.
+
+        That is the case for parts extracted or created in the workspace, and
+        for any other file written there, except the empty placeholders that
+        ensure_tree() lays out for binary parts.
+        """
+        name = _normalize(name)
+        if name in self._materialized:
+            return True
+        try:
+            status = os.stat(self.root / name)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        if not stat.S_ISREG(status.st_mode):
+            return False
+        if status.st_size == 0 and self._member_size(name):
+            return False  # Placeholder
+        self._materialized.add(name)
+        return True
+
+    def path(self, name):
+        """
+        Return the on-disk path of a part, extracting it on first use.
+
+        XML parts are pretty-printed; binary parts are copied as-is. Parts of
+        a directory source are copied together with their sidecar index. Paths
+        of parts that do not exist yet are returned unchanged so new parts can
+        be created in the workspace.
+
+        Args:
+            name: Part name relative to the package root (e.g. "word/document.xml")
+
+        Returns:
+            Path: Location of the part inside the workspace root
+        """
+        name = _normalize(name)
+        target = self.root / name
+        if name in self._members and not self.is_materialized(name):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if self._zip is None:
+                _copy_if_changed(self._members[name], target)
+                _copy_if_changed(index_path(self._members[name]), index_path(target))
+            elif name.endswith(XML_SUFFIXES):
+                content = self._zip.read(name).decode("utf-8")
+                target.write_bytes(pretty_print_xml(content))
+            else:
+                with self._zip.open(name) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            self._materialized.add(name)
+        return target
+
+    def open(self, name, mode="rb"):
+        """
+        Open a part for reading or writing.
+
+        Binary parts opened for reading are streamed from the source without
+        being extracted; everything else goes through path().
+        """
+        name = _normalize(name)
+        if (
+            mode == "rb"
+            and name in self._members
+            and not name.endswith(XML_SUFFIXES)
+            and not self.is_materialized(name)
+        ):
+            if self._zip is None:
+                return open(self._members[name], "rb")
+            return self._zip.open(name)
+        target = self.path(name)
+        if "r" not in mode:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        return open(target, mode)
+
+    def read_bytes(self, name):
+        """Read a part's bytes (pretty-printed for XML parts)."""
+        with self.open(name, "rb") as f:
+            return f.read()
+
+    def remove(self, name):
+        """Remove a part so it is left out of pack() and export()."""
+        name = _normalize(name)
+        (self.root / name).unlink(missing_ok=True)
+        self._materialized.discard(name)
+        self._members.pop(name, None)
+
+    def ensure_tree(self):
+        """
+        Lay out every part on disk for tools that walk the directory (validators).
+
+        XML parts are extracted. Binary parts get zero-byte placeholders, which
+        are never packed or exported: the source archive remains authoritative
+        until a part is requested through path() or the placeholder is
+        overwritten.
+        """
+        for name in self._members:
+            if self.is_materialized(name):
+                continue
+            if name.endswith(XML_SUFFIXES):
+                self.path(name)
+            elif not (self.root / name).exists():
+                (self.root / name).parent.mkdir(parents=True, exist_ok=True)
+                (self.root / name).touch()
+
+    def export(self, target_dir):
+        """
+        Write a fully unpacked copy of the package, as unpack.py would.
+
+        Files copied from the workspace or a directory source are skipped when
+        the target already holds them with the same size and modification
+        time, so exporting back over the source directory only writes the
+        parts that changed.
+
+        Args:
+            target_dir: Directory to write to (created if missing)
+        """
+        target_dir = Path(target_dir)
+        for name in self.names():
+            target = target_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if self.is_materialized(name):
+                copied = _copy_if_changed(self.root / name, target)
+                if copied and name.endswith(XML_SUFFIXES):
+                    # XMLEditor.save() keeps an existing sidecar index current
+                    index = index_path(self.root / name)
+                    if not _copy_if_changed(index, index_path(target)):
+                        write_index(target)
+            elif self._zip is None:
+                _copy_if_changed(self._members[name], target)
+                _copy_if_changed(index_path(self._members[name]), index_path(target))
+            elif name.endswith(XML_SUFFIXES):
+                content = self._zip.read(name).decode("utf-8")
+                pretty = pretty_print_xml(content)
+                target.write_bytes(pretty)
+                write_index(target, pretty)
+            else:
+                with self._zip.open(name) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+
+    def pack(self, output_file):
+        """
+        Write the package to a new Office file.
+
+        Extracted and new XML parts are condensed like pack.py does. Parts that
+        were never extracted, and extracted binaries that are still unchanged,
+        are copied from the source archive as compressed bytes (or read from a
+        directory source).
+
+        Args:
+            output_file: Path to the output .docx/.pptx/.xlsx file
+        """
+        output_file = Path(output_file)
+        if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
+            raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in self.names():
+                if self.is_materialized(name):
+                    path = self.root / name
+                elif self._zip is None:
+                    path = self._members[name]
+                else:
+                    copy_raw_member(
+                        self._source_file, self._members[name], zf, source_zip=self._zip
+                    )
+                    continue
+
+                if name.endswith(XML_SUFFIXES):
+                    info = zipfile.ZipInfo.from_file(path, name)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with zf.open(info, "w") as dst:
+                        write_condensed_xml(path, dst)
+                elif (
+                    self._zip is not None
+                    and name in self._members
+                    and unchanged_member(self._zip, name, path)
+                ):
+                    copy_raw_member(
+                        self._source_file, self._members[name], zf, source_zip=self._zip
+                    )
+                else:
+                    zf.write(path, name)
+
+    def cleanup(self):
+        """Close the source archive and remove a temporary workspace root."""
+        if self._zip is not None:
+            self._zip.close()
+            self._source_file.close()
+        if self._owns_root and self.root.exists():
+            shutil.rmtree(self.root)
+
+    def _member_size(self, name):
+        """Uncompressed size of a source part (0 for parts not in the source)."""
+        member = self._members.get(name)
+        if member is None:
+            return 0
+        if self._zip is None:
+            return os.path.getsize(member)
+        return member.file_size
+
+    def _new_files(self):
+        """Names of files created in the workspace that are not in the source."""
+        for f in self.root.rglob("*"):
+            name = f.relative_to(self.root).as_posix()
+            if f.is_file() and name not in self._members and f.suffix != INDEX_SUFFIX:
+                yield name
+
+
+class WorkspacePath(os.PathLike):
+    """Path-like handle to a workspace part; the part is extracted on first use.
+
+    Anything that converts it with os.fspath() or Path(), such as XMLEditor,
+    receives the extracted file's location.
+    """
+
+    def __init__(self, workspace, part):
+        self.workspace = workspace
+        self.part = _normalize(part)
+
+    def __fspath__(self):
+        return str(self.workspace.path(self.part))
+
+    def __truediv__(self, other):
+        return WorkspacePath(self.workspace, f"{self.part}/{other}")
+
+    def __repr__(self):
+        return f"WorkspacePath({self.workspace.source.name}:{self.part})"
+
+    @property
+    def name(self):
+        """Final component of the part name."""
+        return self.part.rsplit("/", 1)[-1]
+
+    def exists(self):
+        return self.workspace.exists(self.part)
+
+    def open(self, mode="rb"):
+        return self.workspace.open(self.part, mode)
+
+    def read_bytes(self):
+        return self.workspace.read_bytes(self.part)
+
+
+def _copy_if_changed(source, target):
+    """
+    Copy a file unless the target has the same size and modification time.
+
+    Copies keep the modification time, so a file copied earlier and left
+    untouched since compares equal. A missing source is ignored.
+
+    Returns:
+        bool: True if the file was copied
+    """
+    try:
+        source_stat = os.stat(source)
+        target_stat = os.stat(target)
+    except FileNotFoundError:
+        if not os.path.exists(source):
+            return False
+    else:
+        if (source_stat.st_size, source_stat.st_mtime_ns) == (
+            target_stat.st_size,
+            target_stat.st_mtime_ns,
+        ):
+            return False
+    shutil.copy2(source, target)
+    return True
+
+
+def _normalize(name):
+    """Convert a part name or relative path to a zip member name."""
+    return Path(name).as_posix().lstrip("/")
@@ -0,0 +1,31 @@
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# scripts and ooxml are imported from the skill directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.benchmark import build_document  # noqa: E402
+
+# Binary part added to the fixture documents
+IMAGE_NAME = "word/media/image1.png"
+IMAGE_BYTES = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def docx(tmp_path):
+    """A .docx with 20 numbered paragraphs, some tracked changes and an image."""
+    path = tmp_path / "source.docx"
+    build_document(path, 20, change_density=0.2)
+    with zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(IMAGE_NAME, IMAGE_BYTES)
+    return path
+
+
+@pytest.fixture
+def document_xml(docx, tmp_path):
+    """word/document.xml of the docx fixture, extracted."""
+    with zipfile.ZipFile(docx) as zf:
+        return Path(zf.extract("word/document.xml", tmp_path))
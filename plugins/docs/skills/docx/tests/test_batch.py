@@ -0,0 +1,23 @@
+from scripts.batch import apply_operations
+from scripts.document import Document
+
+
+def test_delete_skips_paragraphs_with_tracked_changes(docx):
+    doc = Document(docx)
+    editor = doc["word/document.xml"]
+    paragraphs = editor.find_text("w:p", ["the parties agree"])["the parties agree"]
+    tracked = [
+        p
+        for p in paragraphs
+        if p.getElementsByTagName("w:ins") or p.getElementsByTagName("w:del")
+    ]
+    assert tracked
+    before = [p.toxml() for p in tracked]
+
+    counts = apply_operations(doc, [{"op": "delete", "contains": "the parties agree"}])
+
+    assert counts == {
+        "skipped": len(tracked),
+        "0:delete": len(paragraphs) - len(tracked),
+    }
+    assert [p.toxml() for p in tracked] == before
@@ -0,0 +1,24 @@
+from scripts.benchmark import QUADRATIC_WARNING, format_report, run_benchmark, scaling
+from scripts.utilities import XMLEditor
+
+
+def test_linear_per_call_operation_is_flagged(monkeypatch):
+    get_node = XMLEditor.get_node
+
+    def scanning_get_node(self, tag, attrs=None, *args, **kwargs):
+        if attrs:
+            # Planted O(n) scan on every attribute lookup
+            for _ in range(3):
+                self._dom.getElementsByTagName("*")
+        return get_node(self, tag, attrs, *args, **kwargs)
+
+    monkeypatch.setattr(XMLEditor, "get_node", scanning_get_node)
+    results = run_benchmark([200, 400, 800], [0.0], call_fraction=0.1, validate=False)
+
+    assert [row["calls"] for row in results] == [20, 40, 80]
+    exponents = scaling(results)[0.0]
+    assert exponents["get_node_attrs"] > QUADRATIC_WARNING
+    flagged = [
+        line for line in format_report(results).splitlines() if "superlinear" in line
+    ]
+    assert any(line.startswith("get_node_attrs") for line in flagged)
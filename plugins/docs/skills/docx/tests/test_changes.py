@@ -0,0 +1,132 @@
+import pytest
+
+from scripts.document import DocxXMLEditor
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p>
+  <w:r><w:t xml:space="preserve">Kept </w:t></w:r>
+  <w:ins w:id="1" w:author="Ann" w:date="2024-01-01T00:00:00Z">
+    <w:r w:rsidR="00AA0001"><w:t>ann-early</w:t></w:r>
+  </w:ins>
+  <w:del w:id="2" w:author="Ann" w:date="2024-01-02T01:30:00+02:00">
+    <w:r w:rsidDel="00AA0002"><w:delText xml:space="preserve"> ann-late</w:delText></w:r>
+  </w:del>
+  <w:ins w:id="3" w:author="Bob" w:date="2024-01-01T12:00:00-05:00">
+    <w:r><w:t>bob-late</w:t></w:r>
+  </w:ins>
+  <w:del w:id="4" w:author="Bob">
+    <w:r><w:delText>bob-undated</w:delText></w:r>
+  </w:del>
+</w:p>
+</w:body>
+</w:document>
+"""
+
+
+@pytest.fixture
+def editor(tmp_path):
+    path = tmp_path / "document.xml"
+    path.write_text(DOCUMENT)
+    return DocxXMLEditor(path, rsid="00BB0000", author="Carol")
+
+
+def _text(editor, tag):
+    return [
+        t.firstChild.data for t in editor._dom.getElementsByTagName(tag) if t.firstChild
+    ]
+
+
+def _ids(changes):
+    return sorted(int(elem.getAttribute("w:id")) for elem in changes)
+
+
+def test_select_by_author(editor):
+    assert _ids(editor._select_changes("Ann", None, None)) == [1, 2]
+    assert _ids(editor._select_changes("Bob", None, None)) == [3, 4]
+    assert _ids(editor._select_changes("Nobody", None, None)) == []
+
+
+@pytest.mark.parametrize(
+    "since, until, ids",
+    [
+        # 2024-01-02T01:30+02:00 is 2024-01-01T23:30Z
+        ("2024-01-01T23:30:00Z", None, [2]),
+        ("2024-01-02T01:31:00+02:00", None, []),
+        # 2024-01-01T12:00-05:00 is 2024-01-01T17:00Z
+        ("2024-01-01T18:00:00+01:00", "2024-01-01T18:00:00+01:00", [3]),
+        (None, "2024-01-01T16:59:59Z", [1]),
+        ("2024-01-01", "2024-01-01T23:29:59Z", [1, 3]),
+    ],
+)
+def test_select_by_date_with_offsets(editor, since, until, ids):
+    # Undated changes never match a date range
+    assert _ids(editor._select_changes(None, since, until)) == ids
+
+
+def test_invalid_date(editor):
+    with pytest.raises(ValueError, match="since"):
+        editor.accept_changes(since="yesterday")
+
+
+def test_accept_by_author(editor):
+    assert editor.accept_changes(author="Ann") == {"insertions": 1, "deletions": 1}
+    assert _text(editor, "w:t") == ["Kept ", "ann-early", "bob-late"]
+    assert _text(editor, "w:delText") == ["bob-undated"]
+    assert _ids(editor._dom.getElementsByTagName("w:ins")) == [3]
+    assert _ids(editor._dom.getElementsByTagName("w:del")) == [4]
+    assert editor.modified
+
+
+def test_reject_untracked(editor):
+    counts = editor.reject_changes(until="2024-01-01T23:30:00Z", tracked=False)
+    assert counts == {"insertions": 2, "deletions": 1}
+    assert _text(editor, "w:t") == ["Kept ", " ann-late"]
+    assert _text(editor, "w:delText") == ["bob-undated"]
+    assert not editor._dom.getElementsByTagName("w:ins")
+    assert _ids(editor._dom.getElementsByTagName("w:del")) == [4]
+
+
+def test_reject_tracked(editor):
+    assert editor.reject_changes(author="Ann") == {"insertions": 1, "deletions": 1}
+
+    paragraph = editor._dom.getElementsByTagName("w:p")[0]
+    changes = [
+        node
+        for node in paragraph.childNodes
+        if node.nodeType == node.ELEMENT_NODE and node.tagName in ("w:ins", "w:del")
+    ]
+    assert [(c.tagName, c.getAttribute("w:author")) for c in changes] == [
+        ("w:ins", "Ann"),
+        ("w:del", "Ann"),
+        ("w:ins", "Carol"),  # Re-inserts the deleted text, right after it
+        ("w:ins", "Bob"),
+        ("w:del", "Bob"),
+    ]
+
+    # The insertion's runs are deleted by Carol, inside the original w:ins
+    wrapper = changes[0].getElementsByTagName("w:del")[0]
+    assert wrapper.getAttribute("w:author") == "Carol"
+    run = wrapper.getElementsByTagName("w:r")[0]
+    assert run.getAttribute("w:rsidDel") == "00AA0001"
+    assert not run.hasAttribute("w:rsidR")
+    assert wrapper.getElementsByTagName("w:delText")[0].firstChild.data == "ann-early"
+
+    # The deletion is left alone and its text inserted again
+    reinserted = changes[2]
+    assert changes[1].getElementsByTagName("w:delText")[0].firstChild.data == (
+        " ann-late"
+    )
+    run = reinserted.getElementsByTagName("w:r")[0]
+    assert run.getAttribute("w:rsidR") == "00AA0002"
+    t_elem = run.getElementsByTagName("w:t")[0]
+    assert t_elem.firstChild.data == " ann-late"
+    assert t_elem.getAttribute("xml:space") == "preserve"
+
+    new_ids = [int(wrapper.getAttribute("w:id")), int(reinserted.getAttribute("w:id"))]
+    assert len(set(new_ids)) == 2 and min(new_ids) > 4
+    for elem in (wrapper, reinserted):
+        assert elem.getAttribute("w:date") == elem.getAttribute("w16du:dateUtc")
+        assert elem.getAttribute("w:date").endswith("Z")
+    assert editor._dom.documentElement.hasAttribute("xmlns:w16du")
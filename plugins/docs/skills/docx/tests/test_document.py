@@ -0,0 +1,57 @@
+import zipfile
+
+from scripts.benchmark import build_document
+from scripts.document import Document
+
+
+def _saved_part(path, name):
+    with zipfile.ZipFile(path) as zf:
+        return zf.read(name).decode("utf-8")
+
+
+def test_direct_dom_edit_is_saved(docx, tmp_path):
+    doc = Document(docx)
+    editor = doc["word/document.xml"]
+    paragraph = editor.get_node(tag="w:p", contains="Clause 3:")
+    paragraph.parentNode.removeChild(paragraph)
+    body = editor.dom.getElementsByTagName("w:body")[0]
+    body.setAttribute("w:edited", "1")
+
+    target = tmp_path / "saved.docx"
+    doc.save(target, validate=False)
+
+    xml = _saved_part(target, "word/document.xml")
+    assert "Clause 3:" not in xml
+    assert 'w:edited="1"' in xml
+
+
+def test_direct_dom_edit_after_save_is_saved(docx, tmp_path):
+    doc = Document(docx)
+    editor = doc["word/document.xml"]
+    paragraph = editor.get_node(tag="w:p", contains="Clause 3:")
+    doc.save(tmp_path / "first.docx", validate=False)
+
+    paragraph.parentNode.removeChild(paragraph)
+    target = tmp_path / "second.docx"
+    doc.save(target, validate=False)
+
+    assert "Clause 3:" not in _saved_part(target, "word/document.xml")
+
+
+def test_baseline_survives_save_in_place(tmp_path):
+    docx = tmp_path / "plain.docx"
+    build_document(docx, 20, change_density=0.2)
+    original = docx.read_bytes()
+    doc = Document(docx)
+    editor = doc["word/document.xml"]
+    editor.suggest_deletion(editor.get_node(tag="w:p", contains="Clause 3:"))
+    doc.save(validate=False)
+
+    assert docx.read_bytes() != original
+    assert doc.original_docx != docx
+    assert doc.original_docx.read_bytes() == original
+    doc.save()  # Validates against the real baseline
+
+    baseline = doc.original_docx
+    doc.close()
+    assert not baseline.exists()
@@ -0,0 +1,87 @@
+import pytest
+
+from scripts import utilities
+from scripts.utilities import XMLEditor
+
+NAMESPACE = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCUMENTS = {
+    "plain": f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {NAMESPACE}>
+  <w:body>
+    <w:p><w:r><w:t>One</w:t></w:r><w:r><w:t/></w:r></w:p>
+  </w:body>
+</w:document>
+""",
+    "markup in comments, CDATA and PIs": f"""<?xml version="1.0"?>
+<!DOCTYPE w:document [<!ELEMENT w:document ANY>]>
+<!-- <w:p> in a comment -->
+<w:document {NAMESPACE}><?pi <w:p>?>
+  <w:body><w:p><w:r><w:t><![CDATA[<w:p>]]></w:t></w:r></w:p></w:body>
+</w:document>
+""",
+    "attributes with > and line breaks": f"""<?xml version="1.0"?>
+<w:document {NAMESPACE}>
+  <w:body><w:p w:a="x>y"
+      w:b='&lt;w:p> &gt;'><w:r/></w:p><w:p/></w:body>
+</w:document>
+""",
+    "non-ASCII text": f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {NAMESPACE}><w:body>
+  <w:p><w:r><w:t>Grüße, 東京 😀</w:t></w:r><w:r><w:t>naïve</w:t></w:r></w:p>
+</w:body></w:document>
+""",
+    "CRLF line breaks": (
+        f'<?xml version="1.0"?>\r\n<w:document {NAMESPACE}>\r\n'
+        "  <w:body>\r\n    <w:p/>\r\n  </w:body>\r\n</w:document>\r\n"
+    ),
+}
+
+
+@pytest.fixture
+def sax_parsers(monkeypatch):
+    """Count the SAX parsers created, i.e. the parses that took the SAX path."""
+    created = []
+    create_parser = utilities._create_line_tracking_parser
+
+    def spy():
+        created.append(True)
+        return create_parser()
+
+    monkeypatch.setattr(utilities, "_create_line_tracking_parser", spy)
+    return created
+
+
+def _positions(path, engine):
+    editor = XMLEditor(path, engine=engine)
+    return [
+        (elem.tagName, elem.parse_position)
+        for elem in editor._dom.getElementsByTagName("*")
+    ]
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_engines_agree(tmp_path, name, sax_parsers):
+    path = tmp_path / "document.xml"
+    path.write_bytes(DOCUMENTS[name].encode("utf-8"))
+    positions = _positions(path, "scan")
+    assert not sax_parsers  # Scanned, not a fallback
+    assert positions == _positions(path, "sax")
+    assert len(positions) > 2
+
+
+def test_engines_agree_on_document(document_xml):
+    assert _positions(document_xml, "scan") == _positions(document_xml, "sax")
+
+
+def test_scan_falls_back_to_sax(tmp_path, sax_parsers):
+    # Bare CR line breaks cannot be scanned, so the SAX parser is used instead
+    path = tmp_path / "document.xml"
+    path.write_bytes(f"<w:document {NAMESPACE}>\r<w:body/>\r</w:document>".encode())
+    assert _positions(path, "scan") == [("w:document", (1, 0)), ("w:body", (2, 0))]
+    assert sax_parsers
+
+
+def test_unknown_engine(document_xml):
+    with pytest.raises(ValueError, match="Unknown engine"):
+        XMLEditor(document_xml, engine="dom")
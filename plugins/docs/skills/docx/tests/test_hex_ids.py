@@ -0,0 +1,51 @@
+import pytest
+
+from scripts import document
+from scripts.document import Document, _HexIdRegistry
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Make _generate_hex_id() return the IDs appended to the returned list."""
+    values = []
+    monkeypatch.setattr(document, "_generate_hex_id", lambda: values.pop(0))
+    return values
+
+
+def test_allocate_skips_ids_in_use(generated):
+    registry = _HexIdRegistry(lambda: ["0000000A", "0000000B"])
+    generated.extend(["0000000A", "0000000B", "0000000C", "0000000C", "0000000D"])
+    assert registry.allocate() == "0000000C"
+    assert registry.allocate() == "0000000D"  # Allocated IDs are in use too
+
+
+def test_observed_ids_are_case_insensitive(generated):
+    registry = _HexIdRegistry()
+    registry.observe("0000abcd")
+    generated.extend(["0000ABCD", "0000ABCE"])
+    assert registry.allocate() == "0000ABCE"
+
+
+def test_seed_runs_once_on_first_use():
+    calls = []
+    registry = _HexIdRegistry(lambda: calls.append(True) or ["00000001"])
+    assert not calls
+    registry.observe("00000002")
+    registry.allocate()
+    assert calls == [True]
+
+
+def test_ids_are_unique_across_parts(docx, generated):
+    doc = Document(docx)
+    editor = doc["word/document.xml"]
+    paragraph = editor.get_node(tag="w:p", contains="Clause 3:")
+    # Every paraId of document.xml collides, then fresh IDs follow
+    existing = [f"{i:08X}" for i in range(1, 21)]
+    generated.extend(existing + ["0000F001", "0000F002"])
+    doc.add_comment(start=paragraph, end=paragraph, text="Check")
+
+    comments = doc["word/comments.xml"]
+    comment_paragraph = comments._dom.getElementsByTagName("w:p")[0]
+    assert comment_paragraph.getAttribute("w14:paraId") == "0000F001"
+    durable = doc["word/commentsIds.xml"]._dom.getElementsByTagName("w16cid:commentId")
+    assert durable[0].getAttribute("w16cid:durableId") == "0000F002"
@@ -0,0 +1,142 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from ooxml.scripts import pack
+from ooxml.scripts.pack import copy_raw_member
+from ooxml.scripts.unpack import unpack_document
+
+from conftest import IMAGE_BYTES, IMAGE_NAME
+
+
+def _copy_image(source, target, **kwargs):
+    with zipfile.ZipFile(source) as source_zip, open(source, "rb") as source_file:
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+            info = source_zip.getinfo(IMAGE_NAME)
+            copy_raw_member(source_file, info, zf, source_zip=source_zip, **kwargs)
+            zf.writestr("after.txt", "written after the copy")
+    with zipfile.ZipFile(target) as zf:
+        assert zf.testzip() is None
+        assert zf.read(IMAGE_NAME) == IMAGE_BYTES
+        assert zf.read("after.txt") == b"written after the copy"
+        return zf.getinfo(IMAGE_NAME)
+
+
+def test_raw_copy_keeps_compressed_bytes(docx, tmp_path):
+    info = _copy_image(docx, tmp_path / "out.docx")
+    with zipfile.ZipFile(docx) as source_zip:
+        assert info.compress_size == source_zip.getinfo(info.filename).compress_size
+
+
+def test_unchecked_python_version_recompresses(docx, tmp_path, monkeypatch):
+    monkeypatch.setattr(pack, "RAW_COPY_VERSIONS", ((2, 0), (2, 7)))
+    with zipfile.ZipFile(tmp_path / "probe.zip", "w") as zf:
+        assert not pack.raw_copy_supported(zf)
+    info = _copy_image(docx, tmp_path / "out.docx", deterministic=True)
+    assert info.date_time == pack.DETERMINISTIC_DATE_TIME
+
+
+def test_recompress_without_source_zip(docx, tmp_path, monkeypatch):
+    monkeypatch.setattr(pack, "RAW_COPY_VERSIONS", ((2, 0), (2, 7)))
+    target = tmp_path / "out.docx"
+    with zipfile.ZipFile(docx) as source_zip, open(docx, "rb") as source_file:
+        info = source_zip.getinfo(IMAGE_NAME)
+        with zipfile.ZipFile(target, "w") as zf:
+            copy_raw_member(source_file, info, zf)
+    with zipfile.ZipFile(target) as zf:
+        assert zf.read(IMAGE_NAME) == IMAGE_BYTES
+
+
+def _range_copy(tmp_path):
+    data = bytes(range(256)) * 4096
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+    with open(source, "rb") as src, open(tmp_path / "target.bin", "w+b") as dst:
+        dst.write(b"head")
+        pack._copy_range(src, 1000, 700000, dst)
+        dst.write(b"tail")
+    assert (tmp_path / "target.bin").read_bytes() == b"head" + data[1000:701000] + b"tail"
+
+
+def test_copy_range_sendfile(tmp_path):
+    if not hasattr(os, "sendfile"):
+        pytest.skip("os.sendfile is not available")
+    _range_copy(tmp_path)
+
+
+def test_copy_range_partial_sendfile(tmp_path, monkeypatch):
+    if not hasattr(os, "sendfile"):
+        pytest.skip("os.sendfile is not available")
+    sendfile = os.sendfile
+    calls = []
+
+    def flaky_sendfile(out_fd, in_fd, offset, count):
+        calls.append(count)
+        if len(calls) > 1:
+            raise OSError("sendfile interrupted")
+        return sendfile(out_fd, in_fd, offset, min(count, 4096))
+
+    monkeypatch.setattr(os, "sendfile", flaky_sendfile)
+    _range_copy(tmp_path)
+    assert len(calls) == 2
+
+
+def test_copy_range_mmap(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    _range_copy(tmp_path)
+
+
+def _no_mmap(*args, **kwargs):
+    raise OSError("mmap is not available")
+
+
+def test_copy_range_chunked(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    monkeypatch.setattr(pack.mmap, "mmap", _no_mmap)
+    _range_copy(tmp_path)
+
+
+def test_copy_range_truncated_source(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    monkeypatch.setattr(pack.mmap, "mmap", _no_mmap)
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"short")
+    with open(source, "rb") as src:
+        with pytest.raises(ValueError, match="ended inside a member"):
+            pack._copy_range(src, 0, 100, io.BytesIO())
+
+
+def test_deterministic_pack_ignores_mtimes(docx, tmp_path):
+    unpacked = tmp_path / "unpacked"
+    unpack_document(docx, unpacked)
+    first, second = tmp_path / "first.docx", tmp_path / "second.docx"
+    pack.pack_document(unpacked, first, deterministic=True)
+
+    for i, f in enumerate(sorted(unpacked.rglob("*"))):
+        os.utime(f, (1_700_000_000 + i, 1_700_000_000 + i * 7919))
+    pack.pack_document(unpacked, second, deterministic=True)
+
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as zf:
+        names = zf.namelist()
+        assert names[:2] == list(pack.LEADING_MEMBERS)
+        assert names[2:] == sorted(names[2:])
+        assert not any(name.endswith(".idx") for name in names)
+        assert {info.date_time for info in zf.infolist()} == {
+            pack.DETERMINISTIC_DATE_TIME
+        }
+        assert zf.read(IMAGE_NAME) == IMAGE_BYTES
+
+
+def test_deterministic_pack_with_source(docx, tmp_path):
+    unpacked = tmp_path / "unpacked"
+    unpack_document(docx, unpacked)
+    packed = tmp_path / "packed.docx"
+    pack.pack_document(unpacked, packed, deterministic=True)
+    (unpacked / IMAGE_NAME).touch()
+    copied = tmp_path / "copied.docx"
+    # The image is copied raw from the source instead of being recompressed
+    pack.pack_document(unpacked, copied, deterministic=True, source=docx)
+    assert copied.read_bytes() == packed.read_bytes()
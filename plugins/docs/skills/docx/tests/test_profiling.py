@@ -0,0 +1,19 @@
+import zipfile
+
+from scripts.profiling import profile
+from scripts.utilities import XMLEditor
+
+
+def test_context_managers_are_not_timed(docx, tmp_path):
+    with zipfile.ZipFile(docx) as zf:
+        zf.extract("word/document.xml", tmp_path)
+    editor = XMLEditor(tmp_path / "word/document.xml")
+    paragraph = editor.get_node(tag="w:p", contains="Clause 1:")
+
+    with profile() as stats:
+        with editor.batch():
+            editor.insert_after(paragraph, "<w:p/>")
+
+    assert "XMLEditor.batch" not in stats.stats
+    assert stats.stats["XMLEditor.insert_after"][0] == 1
+    assert stats.stats["XMLEditor._commit_batch"][0] == 1
@@ -0,0 +1,130 @@
+import pytest
+
+from scripts.query import compile_query
+from scripts.utilities import XMLEditor
+
+
+@pytest.fixture
+def editor(document_xml):
+    return XMLEditor(document_xml)
+
+
+def _para_ids(elements):
+    return [elem.getAttribute("w14:paraId") for elem in elements]
+
+
+@pytest.mark.parametrize(
+    "query, count",
+    [
+        ("//w:p", 20),
+        ("w:p", 20),
+        ("/w:document/w:body/w:p", 20),
+        ("/w:body/w:p", 0),
+        ("/w:p", 0),
+        ("//w:body//w:t", 44),
+        ("//w:body/w:t", 0),
+        ("//w:p/w:r", 40),
+        ("//w:p//w:r", 48),
+        ("//w:pPr/*", 20),
+        ("//*[@w14:paraId]", 20),
+        ("//w:r[w:rPr/w:b]", 20),
+        ("//w:t[@xml:space]", 24),
+        ("//w:ins[@w:author='Reviewer']", 4),
+        ("//w:p[w:ins/@w:author != 'Reviewer']", 0),
+        ("//w:p[w:ins//w:t]", 4),
+        ("//w:p[w:pPr/w:pStyle/@w:val='Heading1']", 1),
+        ("//w:p[w:ins and not(w:pPr/w:pStyle/@w:val='Heading1')]", 4),
+        ("//w:p[not(w:ins)]", 16),
+        ('//w:p[contains(., "Clause 1")]', 11),
+        ('//w:t[starts-with(., "to the terms of section 1")]', 11),
+        ('//w:delText[. = " Deleted 4."]', 1),
+        ('//w:p[contains(., "Clause&#32;3:")]', 1),
+        ('//w:p[contains(., "“nowhere")]', 0),
+    ],
+)
+def test_counts(editor, query, count):
+    assert len(editor.find_all(query)) == count
+
+
+def test_predicates_combine(editor):
+    either = editor.find_all(
+        '//w:p[@w14:paraId="00000002" or @w14:paraId="00000001"]'
+    )
+    assert _para_ids(either) == ["00000001", "00000002"]  # Document order
+    grouped = editor.find_all(
+        '//w:p[(@w14:paraId="00000005" or @w14:paraId="00000006") and w:ins]'
+    )
+    assert _para_ids(grouped) == ["00000005"]
+    chained = editor.find_all('//w:p[contains(., "Clause 1")][w:ins]')
+    assert _para_ids(chained) == ["0000000F", "00000014"]
+
+
+def test_find_one(editor):
+    paragraph = editor.find_one('//w:p[@w14:paraId="00000003"]')
+    assert editor._get_element_text(paragraph).startswith("Clause 2:")
+    with pytest.raises(ValueError, match="Node not found"):
+        editor.find_one('//w:p[@w14:paraId="FFFFFFFF"]')
+    with pytest.raises(ValueError):
+        editor.find_one("//w:ins")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "//",
+        "//w:p[",
+        "//w:p]",
+        "//w:p[@w:id=1]",
+        "//w:p[contains(., )]",
+        '//w:p[@w:id="1" and]',
+        "//w:p $",
+        "//w:p[@]",
+    ],
+)
+def test_invalid_queries(query):
+    with pytest.raises(ValueError, match="Invalid query"):
+        compile_query(query)
+
+
+def test_compiled_queries_are_cached():
+    assert compile_query("//w:p") is compile_query("//w:p")
+
+
+@pytest.mark.parametrize(
+    "query, hint",
+    [
+        ("//w:p", None),
+        ('//w:p[@w14:paraId="00000003"]', ("attr", "w14:paraId", "00000003")),
+        ('//w:p[@w14:paraId!="00000003"]', None),
+        ('//w:p[contains(., "Term")]', ("text", "Term")),
+        ('//w:p[contains(@w:rsidR, "Term")]', None),
+        ('//w:p[contains(., "Term") and @w:id="1"]', ("attr", "w:id", "1")),
+        ('//w:p[contains(., "Term") or @w:id="1"]', None),
+        ('//w:p[not(@w:id="1")]', None),
+        ('//w:tbl[@w:id="1"]//w:p', None),
+    ],
+)
+def test_hints(query, hint):
+    assert compile_query(query).hint == hint
+
+
+def test_hint_narrows_lookup(editor, monkeypatch):
+    calls = []
+    for name in ("_tag_lookup", "_attr_lookup", "_text_lookup"):
+        original = getattr(editor, name)
+
+        def spy(*args, _name=name, _original=original):
+            calls.append(_name)
+            return _original(*args)
+
+        monkeypatch.setattr(editor, name, spy)
+
+    for query, lookup in [
+        ('//w:p[@w14:paraId="00000003"]', "_attr_lookup"),
+        ('//w:p[contains(., "Clause 3:")]', "_text_lookup"),
+        ("//w:p[w:ins]", "_tag_lookup"),
+    ]:
+        calls.clear()
+        editor.find_all(query)
+        assert calls[0] == lookup, query
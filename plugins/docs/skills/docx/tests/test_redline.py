@@ -0,0 +1,138 @@
+import pytest
+
+from scripts.document import DocxXMLEditor, _redline_runs
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p>
+  <w:r w:rsidR="00AA0001"><w:t xml:space="preserve">Pay within 30 days </w:t></w:r>
+  <w:r><w:rPr><w:b/></w:rPr><w:t>of notice.</w:t></w:r>
+</w:p>
+<w:p>
+  <w:r><w:t>Name:</w:t><w:tab/><w:t>Acme</w:t><w:br/><w:t>Ltd</w:t></w:r>
+</w:p>
+<w:p>
+  <w:r><w:t>Unchanged</w:t></w:r>
+</w:p>
+<w:p>
+  <w:r><w:t>Already </w:t></w:r>
+  <w:ins w:id="1" w:author="Ann"><w:r><w:t>redlined</w:t></w:r></w:ins>
+</w:p>
+</w:body>
+</w:document>
+"""
+
+
+@pytest.fixture
+def editor(tmp_path):
+    path = tmp_path / "document.xml"
+    path.write_text(DOCUMENT)
+    return DocxXMLEditor(path, rsid="00BB0000", author="Carol")
+
+
+def _paragraphs(editor):
+    return editor._dom.getElementsByTagName("w:p")
+
+
+def _visible_text(paragraph):
+    """The text of a paragraph with its tracked changes accepted."""
+    marks = {"w:tab": "\t", "w:br": "\n"}
+    return "".join(
+        node.firstChild.data if node.tagName == "w:t" else marks[node.tagName]
+        for node in paragraph.getElementsByTagName("*")
+        if node.tagName in ("w:t", *marks)
+    )
+
+
+def _changes(paragraph):
+    """The (kind, text, bold) of each tracked change in a paragraph, in order."""
+    changes = []
+    for change in paragraph.childNodes:
+        if change.nodeType != change.ELEMENT_NODE or change.tagName == "w:r":
+            continue
+        tag = "w:delText" if change.tagName == "w:del" else "w:t"
+        text = "".join(t.firstChild.data for t in change.getElementsByTagName(tag))
+        bold = bool(change.getElementsByTagName("w:b"))
+        changes.append((change.tagName, text, bold))
+    return changes
+
+
+def test_token_level_changes(editor):
+    paragraph = _paragraphs(editor)[0]
+    editor.suggest_text_changes({paragraph: "Pay within 45 days of written notice."})
+
+    # Only the changed words are tracked, each insertion after its deletion
+    assert _changes(paragraph) == [
+        ("w:del", "30", False),
+        ("w:ins", "45", False),
+        ("w:ins", "written ", True),
+    ]
+    assert _visible_text(paragraph) == "Pay within 45 days of written notice."
+    kept = [
+        run
+        for run in paragraph.childNodes
+        if run.nodeType == run.ELEMENT_NODE and run.tagName == "w:r"
+    ]
+    # Kept text stays in copies of its run, attributes included
+    assert kept[0].getAttribute("w:rsidR") == "00AA0001"
+    assert [run.getElementsByTagName("w:t")[0].firstChild.data for run in kept] == [
+        "Pay within ",
+        " days ",
+        "of ",
+        "notice.",
+    ]
+    for change in paragraph.getElementsByTagName("w:ins"):
+        assert change.getAttribute("w:author") == "Carol"
+        run = change.getElementsByTagName("w:r")[0]
+        assert run.getAttribute("w:rsidR") == "00BB0000"
+
+
+def test_inserted_text_keeps_run_properties(editor):
+    paragraph = _paragraphs(editor)[0]
+    new_text = "Pay within 30 days of notice. Strictly."
+    editor.suggest_text_changes([(paragraph, new_text)])
+    assert _changes(paragraph) == [("w:ins", " Strictly.", True)]
+    rpr = paragraph.getElementsByTagName("w:ins")[0].getElementsByTagName("w:rPr")
+    assert rpr[0].toxml() == "<w:rPr><w:b/></w:rPr>"
+
+
+def test_tabs_and_breaks(editor):
+    paragraph = _paragraphs(editor)[1]
+    assert editor.paragraph_text(paragraph) == "Name:\tAcme\nLtd"
+    editor.suggest_text_changes({paragraph: "Name:\tAcme\tInc\nLtd"})
+
+    assert _visible_text(paragraph) == "Name:\tAcme\tInc\nLtd"
+    inserted = paragraph.getElementsByTagName("w:ins")[0]
+    run = inserted.getElementsByTagName("w:r")[0]
+    assert [child.tagName for child in run.childNodes] == ["w:tab", "w:t"]
+    assert not paragraph.getElementsByTagName("w:del")
+    assert len(paragraph.getElementsByTagName("w:br")) == 1
+
+
+def test_unchanged_text_is_left_alone(editor):
+    paragraph = _paragraphs(editor)[2]
+    before = paragraph.toxml()
+    assert _redline_runs(editor._text_runs(paragraph), "Unchanged") == []
+    editor.suggest_text_changes({paragraph: "Unchanged"})
+    assert paragraph.toxml() == before
+
+
+def test_tracked_changes_reject_the_whole_call(editor):
+    paragraphs = _paragraphs(editor)
+    before = editor._dom.toxml()
+    with pytest.raises(ValueError, match="Change 1: .* already contains tracked"):
+        editor.suggest_text_changes(
+            [(paragraphs[0], "Pay now."), (paragraphs[3], "Already done")]
+        )
+    assert editor._dom.toxml() == before
+
+
+def test_duplicate_paragraph(editor):
+    paragraph = _paragraphs(editor)[0]
+    before = editor._dom.toxml()
+    with pytest.raises(ValueError, match="Change 1: the paragraph is given twice"):
+        editor.suggest_text_changes(
+            [(paragraph, "Pay now."), (paragraph, "Pay later.")]
+        )
+    assert editor._dom.toxml() == before
@@ -0,0 +1,113 @@
+import queue
+import subprocess
+import sys
+import threading
+import types
+
+import pytest
+
+from ooxml.scripts import pack
+
+
+class FakeListener:
+    """Stands in for _SofficeListener, recording what the pool asks of it."""
+
+    instances = []
+
+    def __init__(self):
+        self.healthy = False
+        self.fail = False
+        self.calls = []
+        FakeListener.instances.append(self)
+
+    def is_healthy(self):
+        return self.healthy
+
+    def restart(self, startup_timeout):
+        self.calls.append("restart")
+        self.healthy = True
+
+    def convert(self, doc_path, filter_name, outdir, timeout):
+        self.calls.append("convert")
+        if self.fail:
+            raise subprocess.TimeoutExpired("soffice", timeout)
+        return f"{outdir}/{doc_path}"
+
+    def stop(self, remove_profile=False):
+        self.calls.append("stop (profile removed)" if remove_profile else "stop")
+        self.healthy = False
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uno", types.ModuleType("uno"))
+    monkeypatch.setattr(pack, "_SofficeListener", FakeListener)
+    FakeListener.instances = []
+    return pack.SofficePool(size=2)
+
+
+def test_requires_uno(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uno", None)
+    with pytest.raises(ImportError):
+        pack.SofficePool()
+    monkeypatch.setattr(pack, "_soffice_pool", None)
+    assert pack.get_soffice_pool() is None
+
+
+def test_pool_size_zero_disables_pool(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uno", types.ModuleType("uno"))
+    monkeypatch.setattr(pack, "_soffice_pool", None)
+    monkeypatch.setenv("SOFFICE_POOL_SIZE", "0")
+    assert pack.get_soffice_pool() is None
+
+
+def test_listeners_start_once_and_are_reused(pool):
+    for _ in range(4):
+        assert pool.convert("a.docx", "html:HTML", "out") == "out/a.docx"
+    calls = [listener.calls for listener in FakeListener.instances]
+    # Queue order alternates the listeners; each starts only on first use
+    assert calls == [["restart", "convert", "convert"]] * 2
+
+
+def test_failed_conversion_restarts_listener(pool):
+    first = FakeListener.instances[0]
+    first.healthy = True
+    first.fail = True
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.convert("a.docx", "html:HTML", "out")
+    assert first.calls == ["convert", "stop"]
+
+    first.fail = False
+    pool.convert("b.docx", "html:HTML", "out")  # The second listener
+    pool.convert("c.docx", "html:HTML", "out")
+    assert first.calls == ["convert", "stop", "restart", "convert"]
+
+    pool.close()
+    assert all(
+        listener.calls[-1] == "stop (profile removed)"
+        for listener in FakeListener.instances
+    )
+
+
+def test_callers_wait_for_a_free_listener(pool):
+    busy = [pool._idle.get(), pool._idle.get()]
+    with pytest.raises(queue.Empty):
+        pool.convert("a.docx", "html:HTML", "out", wait=0.05)
+
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(pool.convert("a.docx", "html:HTML", "out"))
+    )
+    waiter.start()
+    pool._idle.put(busy[0])
+    waiter.join(timeout=5)
+    assert results == ["out/a.docx"]
+
+
+def test_validate_document_uses_pool(pool, docx):
+    assert pack.validate_document(docx, pool=pool)
+    assert FakeListener.instances[0].calls == ["restart", "convert"]
+
+    FakeListener.instances[1].healthy = True
+    FakeListener.instances[1].fail = True
+    assert not pack.validate_document(docx, pool=pool)
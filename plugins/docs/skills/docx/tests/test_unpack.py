@@ -0,0 +1,80 @@
+import pytest
+
+from ooxml.scripts.unpack import (
+    INDEX_VERSION,
+    build_index,
+    index_path,
+    load_index,
+    read_fragment,
+    unpack_document,
+)
+from scripts.utilities import XMLEditor, read_node
+
+
+@pytest.fixture
+def part(docx, tmp_path):
+    unpack_document(docx, tmp_path / "unpacked")
+    return tmp_path / "unpacked/word/document.xml"
+
+
+def _positions(editor):
+    return [
+        (elem.tagName, elem.parse_position)
+        for elem in editor._dom.getElementsByTagName("*")
+    ]
+
+
+def test_index_round_trip(part):
+    entries = load_index(part)
+    assert entries == build_index(part.read_bytes())
+    assert entries[0].tag == "w:document" and entries[0].depth == 0
+
+    # The index gives the same positions as parsing with SAX
+    indexed = XMLEditor(part, engine="sax")
+    index_path(part).unlink()
+    assert load_index(part) is None
+    assert _positions(indexed) == _positions(XMLEditor(part, engine="sax"))
+
+
+def test_fragment_has_namespaces_in_scope(part):
+    entries = load_index(part)
+    entry = next(e for e in entries if e.tag == "w:p")
+    fragment, declarations = read_fragment(part, entry, entries)
+    assert fragment.startswith(b"<w:p ") and fragment.endswith(b"</w:p>")
+    assert any(d.startswith("xmlns:w=") for d in declarations)
+    assert any(d.startswith("xmlns:w14=") for d in declarations)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda content: content + b"\n",  # Size changes
+        lambda content: content.replace(b"Clause 1:", b"Clause 7:"),  # CRC changes
+    ],
+)
+def test_stale_index_is_ignored(part, change):
+    part.write_bytes(change(part.read_bytes()))
+    assert load_index(part) is None
+
+
+def test_other_index_version_is_ignored(part):
+    text = index_path(part).read_text()
+    index_path(part).write_text(text.replace(INDEX_VERSION, "ooxml-line-index 0"))
+    assert load_index(part) is None
+
+
+def test_save_rewrites_index(part):
+    editor = XMLEditor(part)
+    paragraph = editor.get_node(tag="w:p", contains="Clause 3:")
+    paragraph.parentNode.removeChild(paragraph)
+    editor.save()
+    assert load_index(part) == build_index(part.read_bytes())
+
+
+def test_read_node_rebuilds_stale_index(part):
+    line = XMLEditor(part).get_node(tag="w:p", contains="Clause 5:").parse_position[0]
+    part.write_bytes(part.read_bytes().replace(b"Clause 5:", b"Clause 6:"))
+    elem = read_node(part, "w:p", line)
+    assert "Clause 6:" in elem.toxml()
+    assert elem.parse_position[0] == line
+    assert load_index(part) is not None
@@ -0,0 +1,219 @@
+from xml.parsers.expat import ExpatError
+
+import pytest
+
+from scripts import utilities
+from scripts.utilities import XMLEditor
+
+
+@pytest.fixture(params=[True, False], ids=["tracked", "untracked"])
+def editor(request, document_xml, monkeypatch):
+    # Without DOM change tracking, indexes are rebuilt for every lookup
+    monkeypatch.setattr(utilities, "_DOM_TRACKING", request.param)
+    editor = XMLEditor(document_xml)
+    # Build the indexes before the direct changes
+    editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+    editor.get_node(tag="w:p", contains="Clause 1:")
+    return editor
+
+
+def test_direct_attribute_change(editor):
+    editor.get_node(tag="w:p", attrs={"w14:paraId": "00000002"}).setAttribute(
+        "w14:paraId", "00000001"
+    )
+    with pytest.raises(ValueError, match="Multiple nodes"):
+        editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+    assert len(editor.find_all('//w:p[@w14:paraId="00000001"]')) == 2
+
+
+def test_direct_text_change(editor):
+    paragraph = editor.get_node(tag="w:p", contains="Clause 2:")
+    text = paragraph.getElementsByTagName("w:t")[0].firstChild
+    text.data = text.data.replace("Clause 2:", "Clause 1:")
+    with pytest.raises(ValueError, match="Multiple nodes"):
+        editor.get_node(tag="w:p", contains="Clause 1:")
+    with pytest.raises(ValueError, match="Multiple nodes"):
+        editor.find_one('//w:p[contains(., "Clause 1:")]')
+    assert len(editor.find_text("w:p", ["Clause 1:"])["Clause 1:"]) == 2
+
+
+def test_direct_insertion(editor):
+    body = editor.dom.getElementsByTagName("w:body")[0]
+    paragraph = editor.dom.createElement("w:p")
+    paragraph.setAttribute("w14:paraId", "00000003")
+    body.appendChild(paragraph)
+    with pytest.raises(ValueError, match="Multiple nodes"):
+        editor.get_node(tag="w:p", attrs={"w14:paraId": "00000003"})
+
+
+def test_editing_methods_keep_indexes(editor):
+    paragraph = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000005"})
+    indexes = editor._tag_index
+    editor.insert_after(paragraph, '<w:p w14:paraId="00000001"><w:r/></w:p>')
+    with pytest.raises(ValueError, match="Multiple nodes"):
+        editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+    if utilities._DOM_TRACKING:  # Otherwise every lookup rebuilds them
+        assert editor._tag_index is indexes
+
+
+def test_record_direct_change_is_rolled_back(editor):
+    paragraph = editor.get_node(tag="w:p", contains="Clause 3:")
+    before = paragraph.toxml()
+    editor.checkpoint()
+    editor.record(paragraph)
+    paragraph.removeChild(paragraph.lastChild)
+    paragraph.setAttribute("w14:paraId", "000000FF")
+    editor.rollback()
+    assert paragraph.toxml() == before
+    assert editor.get_node(tag="w:p", contains="section 3.") is paragraph
+    with pytest.raises(ValueError, match="Node not found"):
+        editor.get_node(tag="w:p", attrs={"w14:paraId": "000000FF"})
+
+
+def test_batch_is_applied_on_exit(editor):
+    first = editor.get_node(tag="w:p", contains="Clause 1:")
+    second = editor.get_node(tag="w:p", contains="Clause 2:")
+    with editor.batch():
+        inserted = editor.insert_after(first, "<w:p><w:r><w:t>New</w:t></w:r></w:p>")
+        replaced = editor.replace_node(second, "<w:p><w:r><w:t>Two</w:t></w:r></w:p>")
+        # Queued edits are not visible yet
+        assert inserted == [] and second.parentNode is not None
+        assert editor.get_node(tag="w:p", contains="Clause 2:") is second
+    assert first.nextSibling is inserted[0]
+    assert second.parentNode is None
+    assert editor.get_node(tag="w:p", contains="Two") is replaced[0]
+
+
+@pytest.mark.parametrize(
+    "failure, error",
+    [
+        ("raise", RuntimeError),
+        ("invalid fragment", Exception),
+        ("replaced twice", ValueError),
+    ],
+)
+def test_failed_batch_applies_nothing(editor, failure, error):
+    first = editor.get_node(tag="w:p", contains="Clause 1:")
+    second = editor.get_node(tag="w:p", contains="Clause 2:")
+    before = editor._dom.toxml()
+    with pytest.raises(error):
+        with editor.batch():
+            editor.insert_before(first, "<w:p><w:r><w:t>New</w:t></w:r></w:p>")
+            editor.replace_node(second, "<w:p/>")
+            if failure == "raise":
+                raise RuntimeError("edit failed")
+            elif failure == "invalid fragment":
+                editor.append_to(first, "<w:r><w:t>unclosed</w:r>")
+            else:
+                editor.insert_after(second, "<w:p/>")
+    assert editor._dom.toxml() == before
+    assert editor._batch is None
+    assert editor.get_node(tag="w:p", contains="Clause 2:") is second
+    with pytest.raises(ValueError, match="Node not found"):
+        editor.get_node(tag="w:p", contains="New")
+
+
+def test_batch_is_rolled_back(editor):
+    first = editor.get_node(tag="w:p", contains="Clause 1:")
+    second = editor.get_node(tag="w:p", contains="Clause 2:")
+    before = editor._dom.toxml()
+    editor.checkpoint()
+    with editor.batch():
+        with editor.batch():  # Joins the outer batch
+            editor.replace_node(first, "<w:p><w:r><w:t>One</w:t></w:r></w:p>")
+        editor.append_to(second, "<w:r><w:t>More</w:t></w:r>")
+        with pytest.raises(ValueError, match="inside batch"):
+            editor.rollback()
+    assert editor._dom.toxml() != before
+
+    editor.rollback()
+    assert editor._dom.toxml() == before
+    assert editor.get_node(tag="w:p", contains="Clause 1:") is first
+    with pytest.raises(ValueError, match="Node not found"):
+        editor.get_node(tag="w:p", contains="One")
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count the fragment wrappers parsed from text (cache misses)."""
+    calls = []
+    parse_string = utilities.defusedxml.minidom.parseString
+
+    def spy(text, *args, **kwargs):
+        calls.append(text)
+        return parse_string(text, *args, **kwargs)
+
+    monkeypatch.setattr(utilities.defusedxml.minidom, "parseString", spy)
+    return calls
+
+
+def test_fragment_cache_returns_fresh_nodes(editor, parses):
+    xml = "<w:r><w:t>Cached</w:t></w:r>"
+    first = editor._parse_fragment(xml)
+    first[0].firstChild.firstChild.data = "Changed"
+    second = editor._parse_fragment(xml)
+    assert len(parses) == 1
+    assert second[0] is not first[0]
+    assert second[0].toxml() == xml
+    assert second[0].ownerDocument is editor._dom
+
+
+def test_fragment_cache_is_lru(editor, parses, monkeypatch):
+    monkeypatch.setattr(utilities, "_FRAGMENT_CACHE_SIZE", 2)
+    a, b, c = (f"<w:r><w:t>{name}</w:t></w:r>" for name in "abc")
+    editor._parse_fragments([a, b, a])  # One parse for both fragments
+    editor._parse_fragment(a)  # a is now the most recently used
+    editor._parse_fragment(c)  # Evicts b
+    assert list(editor._fragment_cache) == [a, c]
+    editor._parse_fragment(b)
+    assert len(parses) == 3
+
+    large = f"<w:r><w:t>{'x' * utilities._FRAGMENT_CACHE_MAX_LENGTH}</w:t></w:r>"
+    editor._parse_fragment(large)
+    assert large not in editor._fragment_cache
+
+
+def test_fragment_cache_follows_namespaces(editor):
+    editor._parse_fragment("<w:r/>")
+    assert editor._fragment_cache
+    editor._dom.documentElement.setAttribute("xmlns:x", "urn:example")
+    nodes = editor._parse_fragment("<x:tag/>")
+    assert nodes[0].namespaceURI == "urn:example"
+    assert list(editor._fragment_cache) == ["<x:tag/>"]
+
+
+def test_invalid_fragment_is_parsed_alone(editor, parses):
+    with pytest.raises(ExpatError):
+        editor._parse_fragments(["<w:r/>", "<w:r>", "<w:p/>"])
+    # The error comes from parsing the invalid fragment on its own
+    assert parses[-1].endswith("<fragment><w:r></fragment></root>")
+    assert "<w:r>" not in editor._fragment_cache
+
+
+def test_unchecked_python_version_disables_tracking(monkeypatch):
+    monkeypatch.setattr(utilities, "DOM_TRACKING_VERSIONS", ((2, 0), (2, 7)))
+    assert not utilities.dom_tracking_supported()
+
+
+def test_untracked_dom_keeps_plain_text_nodes(document_xml, monkeypatch):
+    monkeypatch.setattr(utilities, "_DOM_TRACKING", False)
+    editor = XMLEditor(document_xml)
+    paragraph = editor.get_node(tag="w:p", contains="Clause 1:")
+    text = paragraph.getElementsByTagName("w:t")[0].firstChild
+    assert type(text) is utilities.minidom.Text
+    assert utilities._SYNCED not in editor._dom._id_cache
+
+
+def test_read_only_access_keeps_editor_unmodified(document_xml):
+    editor = XMLEditor(document_xml)
+    with editor.read_only() as dom:
+        assert dom.getElementsByTagName("w:p")
+        editor.get_node(tag="w:p", contains="Clause 1:")
+        editor.find_all("//w:p")
+    assert not editor.modified
+
+    editor.dom  # noqa: B018
+    assert editor.modified
+    with editor.read_only():
+        pass
+    assert editor.modified  # Still handed out before the block
@@ -0,0 +1,54 @@
+from scripts.view import DocumentView
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p>
+  <w:pPr>
+    <w:pStyle w:val="Heading1"/>
+    <w:rPr><w:del w:id="1" w:author="Ann" w:date="2024-01-01T00:00:00Z"/></w:rPr>
+    <w:pPrChange w:id="2" w:author="Bob" w:date="2024-01-01T00:00:00Z">
+      <w:pPr><w:pStyle w:val="Normal"/></w:pPr>
+    </w:pPrChange>
+  </w:pPr>
+  <w:r><w:t>Joined </w:t></w:r>
+</w:p>
+<w:p>
+  <w:r>
+    <w:rPr>
+      <w:b/>
+      <w:rPrChange w:id="3" w:author="Bob" w:date="2024-01-01T00:00:00Z">
+        <w:rPr/>
+      </w:rPrChange>
+    </w:rPr>
+    <w:t>paragraph</w:t>
+  </w:r>
+  <w:del w:id="4" w:author="Ann" w:date="2024-01-01T00:00:00Z">
+    <w:r><w:delText> gone</w:delText></w:r>
+  </w:del>
+</w:p>
+</w:body>
+</w:document>
+"""
+
+
+def test_changes_in_properties_are_counted(tmp_path):
+    (tmp_path / "word").mkdir()
+    (tmp_path / "word/document.xml").write_text(DOCUMENT)
+    view = DocumentView(tmp_path)
+
+    changes = list(view.iter_changes())
+    assert [(c.kind, c.id, c.author, c.paragraph, c.text) for c in changes] == [
+        ("deletion", "1", "Ann", 0, ""),
+        ("formatting", "2", "Bob", 0, ""),
+        ("formatting", "3", "Bob", 1, ""),
+        ("deletion", "4", "Ann", 1, " gone"),
+    ]
+
+    summary = view.summary()
+    assert summary["deletion"] == 2
+    assert summary["formatting"] == 2
+    assert summary["authors"] == {"Ann": {"deletion": 2}, "Bob": {"formatting": 2}}
+    assert list(view.iter_paragraphs()) == ["Joined ", "paragraph"]
+    assert view.paragraph_style(0) == "Heading1"
+    assert [run.change for run in view.iter_runs()] == [-1, -1, 3]
@@ -0,0 +1,46 @@
+import zipfile
+
+import pytest
+
+from conftest import IMAGE_BYTES, IMAGE_NAME
+from scripts.document import Document
+from scripts.workspace import PackageWorkspace
+
+NEW_IMAGE = b"\x89PNG replaced image"
+
+
+@pytest.fixture(params=["docx", "directory"])
+def source(request, docx, tmp_path):
+    if request.param == "docx":
+        return docx
+    with PackageWorkspace(docx) as workspace:
+        workspace.export(tmp_path / "unpacked")
+    return tmp_path / "unpacked"
+
+
+@pytest.mark.parametrize("placeholders", [False, True])
+def test_replaced_part_is_saved(source, tmp_path, placeholders):
+    doc = Document(source)
+    if placeholders:
+        doc.workspace.ensure_tree()
+    (doc.unpacked_path / IMAGE_NAME).parent.mkdir(parents=True, exist_ok=True)
+    (doc.unpacked_path / IMAGE_NAME).write_bytes(NEW_IMAGE)
+
+    target = tmp_path / "saved.docx"
+    doc.save(target, validate=False)
+
+    with zipfile.ZipFile(target) as zf:
+        assert zf.read(IMAGE_NAME) == NEW_IMAGE
+    assert doc.workspace.read_bytes(IMAGE_NAME) == NEW_IMAGE
+
+
+def test_placeholders_are_not_saved(source, tmp_path):
+    doc = Document(source)
+    doc.workspace.ensure_tree()
+    assert (doc.unpacked_path / IMAGE_NAME).stat().st_size == 0
+
+    target = tmp_path / "saved.docx"
+    doc.save(target, validate=False)
+
+    with zipfile.ZipFile(target) as zf:
+        assert zf.read(IMAGE_NAME) == IMAGE_BYTES
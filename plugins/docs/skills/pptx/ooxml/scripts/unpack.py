@@ -1,29 +1,238 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
+
+Each pretty-printed part gets a sidecar line index (e.g. document.xml.idx)
+that maps every element to its line, column and byte range, so tools can
+locate or read a single element without parsing the whole part.
+
+Example usage:
+    python unpack.py <office_file> <output_dir>
+"""
 
 import random
+import re
 import sys
+import zlib
 import defusedxml.minidom
+import defusedxml.sax
+import xml.sax.handler
 import zipfile
+from collections import namedtuple
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+# Parts that are pretty-printed on unpack and condensed again on pack
+XML_SUFFIXES = (".xml", ".rels")
+
+# Sidecar line index written next to each pretty-printed part
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = "ooxml-line-index 1"
+
+# One element of a part: 1-based line and 0-based column of its start tag (as
+# reported by expat), byte range [start, end) of the whole element, nesting
+# depth (0 for the root) and qualified tag name
+IndexEntry = namedtuple("IndexEntry", "line column start end depth tag")
+
+
+def main():
+    assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
+    input_file, output_dir = sys.argv[1], sys.argv[2]
+
+    unpack_document(input_file, output_dir)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir):
+    """Extract an Office file and pretty-print all of its XML parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to extract into (created if missing)
+    """
+    # Extract and format
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    zipfile.ZipFile(input_file).extractall(output_path)
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
+    # Pretty print all XML files
+    xml_files = [f for suffix in XML_SUFFIXES for f in output_path.rglob(f"*{suffix}")]
+    for xml_file in xml_files:
+        content = xml_file.read_text(encoding="utf-8")
+        pretty = pretty_print_xml(content)
+        xml_file.write_bytes(pretty)
+        write_index(xml_file, pretty)
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
+
+def pretty_print_xml(content):
+    """Pretty-print an XML part the way unpack lays it out on disk.
+
+    Args:
+        content: XML document as a string
+
+    Returns:
+        bytes: ASCII-encoded XML indented with two spaces per level
+    """
     dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def index_path(xml_file):
+    """Return the sidecar index path for an XML part."""
+    xml_file = Path(xml_file)
+    return xml_file.with_name(xml_file.name + INDEX_SUFFIX)
+
+
+def build_index(content):
+    """Index every element of an XML document by position.
+
+    Args:
+        content: XML document as bytes
+
+    Returns:
+        list[IndexEntry]: One entry per element, in document order
+    """
+    entries = []
+    open_elements = []  # Positions in entries of elements not yet closed
+
+    class Handler(xml.sax.handler.ContentHandler):
+        def startElement(self, name, attrs):
+            expat = parser._parser  # type: ignore
+            open_elements.append(len(entries))
+            entries.append(
+                [
+                    expat.CurrentLineNumber,
+                    expat.CurrentColumnNumber,
+                    expat.CurrentByteIndex,
+                    None,
+                    len(open_elements) - 1,
+                    name,
+                ]
+            )
+
+        def endElement(self, name):
+            # The end tag (or the start tag of an empty element) starts at the
+            # current byte index; the element ends after its closing '>'
+            position = parser._parser.CurrentByteIndex  # type: ignore
+            entries[open_elements.pop()][3] = content.index(b">", position) + 1
+
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(Handler())
+    parser.feed(content)
+    parser.close()
+    return [IndexEntry(*entry) for entry in entries]
+
+
+def write_index(xml_file, content=None):
+    """Write the sidecar index for an XML part.
+
+    The header records the part's size and CRC-32 so that readers can detect
+    an index that no longer matches the part.
+
+    Args:
+        xml_file: Path to the XML part
+        content: The part's bytes, if already in memory
+
+    Returns:
+        list[IndexEntry]: The entries that were written
+    """
+    if content is None:
+        content = Path(xml_file).read_bytes()
+    entries = build_index(content)
+    lines = [f"# {INDEX_VERSION} {len(content)} {zlib.crc32(content):08x}"]
+    lines.extend(" ".join(map(str, entry)) for entry in entries)
+    index_path(xml_file).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return entries
+
+
+def load_index(xml_file, content=None):
+    """Load the sidecar index of an XML part if it is still valid.
+
+    Args:
+        xml_file: Path to the XML part
+        content: The part's bytes, if already in memory
+
+    Returns:
+        list[IndexEntry] or None: None if there is no index or it is stale
+    """
+    try:
+        text = index_path(xml_file).read_text(encoding="utf-8")
+    except OSError:
+        return None
+    header, _, rows = text.partition("\n")
+    if content is None:
+        content = Path(xml_file).read_bytes()
+    expected = f"# {INDEX_VERSION} {len(content)} {zlib.crc32(content):08x}"
+    if header != expected:
+        return None
+
+    entries = []
+    for row in rows.splitlines():
+        line, column, start, end, depth, tag = row.split(" ")
+        entries.append(
+            IndexEntry(int(line), int(column), int(start), int(end), int(depth), tag)
+        )
+    return entries
+
+
+def read_fragment(xml_file, entry, entries):
+    """Read one element's XML by seeking to its byte range.
+
+    Namespace declarations made on the element's ancestors are returned too,
+    so the fragment can be parsed on its own.
+
+    Args:
+        xml_file: Path to the XML part
+        entry: IndexEntry of the element to read
+        entries: All entries of the part, as returned by load_index()
+
+    Returns:
+        tuple[bytes, list[str]]: The element's XML and the xmlns declarations
+        (e.g. 'xmlns:w="..."') in scope for it
+    """
+    position = entries.index(entry)
+    ancestors = []
+    depth = entry.depth
+    for candidate in reversed(entries[:position]):
+        if candidate.depth < depth:
+            ancestors.append(candidate)
+            depth = candidate.depth
+            if depth == 0:
+                break
+
+    declarations = {}
+    with open(xml_file, "rb") as f:
+        # Outermost first so that inner declarations override outer ones
+        for ancestor in reversed(ancestors):
+            f.seek(ancestor.start)
+            start_tag = _read_start_tag(f).decode("utf-8")
+            for prefix, value in _XMLNS_PATTERN.findall(start_tag):
+                declarations[prefix] = f"xmlns{prefix}={value}"
+        f.seek(entry.start)
+        fragment = f.read(entry.end - entry.start)
+    return fragment, list(declarations.values())
+
+
+# xmlns declarations in a start tag: (":prefix" or "", quoted value)
+_XMLNS_PATTERN = re.compile(r"""\sxmlns(:[\w.-]+)?=("[^"]*"|'[^']*')""")
+
+
+def _read_start_tag(f):
+    """Read from the current position up to the end of a start tag."""
+    chunks = []
+    while True:
+        chunk = f.read(4096)
+        if not chunk:
+            break
+        end = chunk.find(b">")
+        if end != -1:
+            chunks.append(chunk[: end + 1])
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,25 @@ from pathlib import Path
 
 import lxml.etree
 
+# Compiled XSD schemas by path, shared by every validator in the process
+_SCHEMA_CACHE = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XSD schema at a path, compiling it on first use.
+
+    Compiling the OOXML schemas dominates the cost of validating small
+    documents, so processes that validate many documents keep them.
+    """
+    key = str(schema_path)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+        schema = _SCHEMA_CACHE[key] = lxml.etree.XMLSchema(xsd_doc)
+    return schema
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -311,6 +330,7 @@ class BaseSchemaValidator:
                 file_path.is_file()
                 and file_path.name != "[Content_Types].xml"
                 and not file_path.name.endswith(".rels")
+                and not file_path.name.endswith(".idx")  # unpack.py line index
             ):  # This file is not referenced by .rels
                 all_files.append(file_path.resolve())
 
@@ -847,12 +867,7 @@ class BaseSchemaValidator:
 
         try:
             # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = load_schema(schema_path)
 
             # Load and preprocess XML
             with open(xml_file, "r") as f: